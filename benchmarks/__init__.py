@@ -0,0 +1,7 @@
+"""
+Data-scale benchmarks for the item and order read paths.
+
+    DATABASE_URL=sqlite:////tmp/bench.db API_KEY=bench python -m benchmarks.seed --scale 100k --reset
+    DATABASE_URL=sqlite:////tmp/bench.db API_KEY=bench python -m benchmarks.run --output head.json
+    python -m benchmarks.compare base.json head.json
+"""
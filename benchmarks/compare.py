@@ -0,0 +1,69 @@
+"""
+Compare two benchmarks.run result files.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+
+Prints p50/p95/throughput per scenario and exits 1 when any scenario's p95
+got slower than the threshold (a fraction of the base value).
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def compare(base: Dict, head: Dict, threshold: float) -> Tuple[List[Dict], List[str]]:
+    """Rows for every scenario present in both runs, and the names that regressed."""
+    rows, regressions = [], []
+    for mode, scenarios in head["results"].items():
+        for name, stats in scenarios.items():
+            before = base["results"].get(mode, {}).get(name)
+            if before is None:
+                continue
+            change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+            rows.append({
+                "mode": mode,
+                "scenario": name,
+                "base_p50_ms": before["p50_ms"],
+                "head_p50_ms": stats["p50_ms"],
+                "base_p95_ms": before["p95_ms"],
+                "head_p95_ms": stats["p95_ms"],
+                "p95_change": change,
+                "base_rps": before["throughput_rps"],
+                "head_rps": stats["throughput_rps"],
+            })
+            if change > threshold:
+                regressions.append(f"{mode}/{name}")
+    return rows, regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p95 slowdown (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as stream:
+        base = json.load(stream)
+    with open(args.head, encoding="utf-8") as stream:
+        head = json.load(stream)
+
+    rows, regressions = compare(base, head, args.threshold)
+    print(f"{'scenario':36} {'p50 base→head ms':>22} {'p95 base→head ms':>22} {'Δp95':>8} {'rps base→head':>18}")
+    for row in rows:
+        print(
+            f"{row['mode'] + '/' + row['scenario']:36} "
+            f"{row['base_p50_ms']:>10.2f} → {row['head_p50_ms']:<9.2f} "
+            f"{row['base_p95_ms']:>10.2f} → {row['head_p95_ms']:<9.2f} "
+            f"{row['p95_change']:>+7.0%} "
+            f"{row['base_rps']:>8.1f} → {row['head_rps']:<8.1f}"
+        )
+    if regressions:
+        print(f"p95 regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Measure latency percentiles and throughput of the item and order read
+endpoints against an already seeded database (see benchmarks.seed).
+
+    python -m benchmarks.run --output head.json
+    python -m benchmarks.run --mode uvicorn --requests 500 --concurrency 8
+
+In-process mode calls the ASGI app through the TestClient; uvicorn mode
+starts a real server and goes over HTTP. Both use DATABASE_URL and API_KEY
+from the environment, like the app itself.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Sequence
+
+import httpx
+from sqlalchemy import func, select
+
+from benchmarks.seed import NAME_WORDS
+from inventoryordersapi.core.database import SessionLocal, engine
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.model.item_record import ItemRecord
+from inventoryordersapi.model.order_record import OrderRecord
+
+PERCENTILES = (50, 90, 95, 99)
+SAMPLE_SIZE = 500  # ids and customer names drawn from the database for the path builders
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_ms: List[float], wall_seconds: float, errors: int) -> Dict:
+    ordered = sorted(latencies_ms)
+    summary = {f"p{pct}_ms": round(percentile(ordered, pct), 3) for pct in PERCENTILES}
+    summary.update(
+        requests=len(ordered),
+        errors=errors,
+        mean_ms=round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        max_ms=round(ordered[-1], 3) if ordered else 0.0,
+        throughput_rps=round(len(ordered) / wall_seconds, 1) if wall_seconds else 0.0,
+    )
+    return summary
+
+
+def load_samples() -> Dict[str, List[str]]:
+    db = SessionLocal()
+    try:
+        item_ids = db.scalars(select(ItemRecord.item_id).order_by(func.random()).limit(SAMPLE_SIZE)).all()
+        orders = db.execute(
+            select(OrderRecord.order_id, OrderRecord.customer_name).order_by(func.random()).limit(SAMPLE_SIZE)
+        ).all()
+    finally:
+        db.close()
+    if not item_ids or not orders:
+        raise SystemExit("No items or orders found; run python -m benchmarks.seed first")
+    return {
+        "item_ids": list(item_ids),
+        "order_ids": [row.order_id for row in orders],
+        "customers": [row.customer_name for row in orders],
+    }
+
+
+def scenarios(samples: Dict[str, List[str]]) -> Dict[str, Callable[[random.Random], str]]:
+    """Scenario name -> function returning the path for one request."""
+
+    def price_range(rng):
+        low = rng.randrange(0, 1800, 50)
+        return f"min_price={low}&max_price={low + 200}"
+
+    def date_range(rng):
+        month = rng.randint(1, 11)
+        return f"from_date=2025-{month:02d}-01&to_date=2025-{month + 1:02d}-01"
+
+    return {
+        "items_list": lambda rng: "/items/?page_size=20",
+        "items_list_search": lambda rng: f"/items/?page_size=20&search={rng.choice(NAME_WORDS)}",
+        "items_list_price": lambda rng: f"/items/?page_size=20&{price_range(rng)}",
+        "items_list_search_price": lambda rng: f"/items/?page_size=20&search={rng.choice(NAME_WORDS)}&{price_range(rng)}",
+        "item_get": lambda rng: f"/items/{rng.choice(samples['item_ids'])}",
+        "orders_list": lambda rng: "/orders/?page_size=20",
+        "orders_list_customer": lambda rng: f"/orders/?page_size=20&customer_name={rng.choice(samples['customers'])}",
+        "orders_list_confirmed": lambda rng: "/orders/?page_size=20&status=confirmed",
+        "orders_list_unpaid": lambda rng: "/orders/?page_size=20&status=unpaid",
+        "orders_list_canceled": lambda rng: "/orders/?page_size=20&status=canceled",
+        "orders_list_dates": lambda rng: f"/orders/?page_size=20&{date_range(rng)}",
+        "order_get": lambda rng: f"/orders/{rng.choice(samples['order_ids'])}",
+    }
+
+
+def run_scenario(
+    make_client: Callable[[], httpx.Client],
+    path_for: Callable[[random.Random], str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int
+) -> Dict:
+    local = threading.local()
+    clients: List[httpx.Client] = []
+    clients_lock = threading.Lock()
+
+    def client() -> httpx.Client:
+        if not hasattr(local, "client"):
+            local.client = make_client()
+            with clients_lock:
+                clients.append(local.client)
+        return local.client
+
+    def call(n: int):
+        path = path_for(random.Random(seed * 1_000_003 + n))
+        started = time.perf_counter()
+        status = client().get(path, headers={"X-API-KEY": settings.API_KEY}).status_code
+        return (time.perf_counter() - started) * 1000, status == 200
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(call, range(-warmup, 0)))
+            started = time.perf_counter()
+            outcomes = list(pool.map(call, range(requests)))
+            wall_seconds = time.perf_counter() - started
+    finally:
+        for c in clients:
+            c.close()
+
+    return summarize([ms for ms, _ in outcomes], wall_seconds, sum(1 for _, ok in outcomes if not ok))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "inventoryordersapi.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy()
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("uvicorn did not start within 30s")
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the item and order read endpoints")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn", "both"), default="inprocess")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="Client threads")
+    parser.add_argument("--scenario", action="append", help="Only run these scenarios (repeatable)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for ids and filters")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    samples = load_samples()
+    selected = scenarios(samples)
+    if args.scenario:
+        unknown = set(args.scenario) - set(selected)
+        if unknown:
+            parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        selected = {name: selected[name] for name in args.scenario}
+
+    db = SessionLocal()
+    try:
+        table_rows = {
+            "items": db.scalar(select(func.count()).select_from(ItemRecord)),
+            "orders": db.scalar(select(func.count()).select_from(OrderRecord)),
+        }
+    finally:
+        db.close()
+
+    results: Dict[str, Dict] = {}
+    modes = ("inprocess", "uvicorn") if args.mode == "both" else (args.mode,)
+    for mode in modes:
+        server = None
+        if mode == "inprocess":
+            from fastapi.testclient import TestClient
+            from inventoryordersapi.main import app
+            make_client = lambda: TestClient(app)
+        else:
+            port = _free_port()
+            server = start_uvicorn(port)
+            make_client = lambda: httpx.Client(base_url=f"http://127.0.0.1:{port}")
+        try:
+            results[mode] = {}
+            for name, path_for in selected.items():
+                results[mode][name] = run_scenario(
+                    make_client, path_for, args.requests, args.concurrency, args.warmup, args.seed
+                )
+                print(f"{mode:9} {name:26} p50={results[mode][name]['p50_ms']:.2f}ms "
+                      f"p95={results[mode][name]['p95_ms']:.2f}ms", file=sys.stderr)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "table_rows": table_rows,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            stream.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
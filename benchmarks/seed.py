@@ -0,0 +1,171 @@
+"""
+Seed a benchmark database with N items and N orders (1-3 lines each).
+
+    python -m benchmarks.seed --scale 10k
+    python -m benchmarks.seed --scale 1m --reset
+
+Rows are generated from a fixed random seed and written with executemany
+inserts in batches, so the same scale always produces the same data. On
+PostgreSQL run the Liquibase changelog first; --reset only creates the ORM
+tables, which lack the full-text search column and the migration indexes.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import Engine, create_engine, func, insert, inspect, select
+
+from inventoryordersapi.model import Base
+from inventoryordersapi.model import item_record, item_stock_shard_record, order_record, order_item_record  # noqa: F401 (register mappers)
+from inventoryordersapi.utils.ids import uuid7
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Words item names and descriptions are built from; benchmarks.run searches for them
+NAME_WORDS = (
+    "wireless", "mouse", "keyboard", "monitor", "usb", "cable", "adapter", "laptop", "stand", "charger",
+    "headset", "webcam", "speaker", "dock", "hub", "ssd", "router", "printer", "tablet", "case"
+)
+CUSTOMER_COUNT_RATIO = 10  # one customer per 10 orders
+STATUSES = ("pending", "confirmed", "canceled")
+ORDER_DAYS = 365
+EPOCH = datetime(2025, 1, 1)
+
+
+def parse_scale(value: str) -> int:
+    value = value.lower()
+    if value in SCALES:
+        return SCALES[value]
+    return int(value)
+
+
+def _uuid(rng: random.Random, at: datetime) -> str:
+    """Time-ordered like the app's own keys, but reproducible from the seed."""
+    return str(uuid7(int(at.timestamp() * 1000), rng.getrandbits(62)))
+
+
+def customer_name(n: int) -> str:
+    return f"Customer {n:06d}"
+
+
+def _items(rng: random.Random, count: int) -> Iterator[Dict]:
+    for n in range(count):
+        words = rng.sample(NAME_WORDS, 3)
+        yield {
+            "item_id": _uuid(rng, EPOCH + timedelta(seconds=n)),
+            "item_name": f"{words[0].title()} {words[1]} {n}",
+            "item_description": " ".join(words),
+            "item_price": round(rng.uniform(1, 2000), 2),
+            "item_quantity": rng.randint(0, 1000),
+            "is_active": True,
+            "stock_shard_count": 0,
+        }
+
+
+def _batches(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(engine: Engine, count: int, seed: int = 42, batch_size: int = 10_000, reset: bool = False) -> Dict:
+    """Write count items and count orders; returns row counts and timings."""
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    if reset or not inspect(engine).has_table("item"):
+        Base.metadata.create_all(bind=engine)
+
+    item_table = item_record.ItemRecord.__table__
+    order_table = order_record.OrderRecord.__table__
+    line_table = order_item_record.OrderItemRecord.__table__
+    rng = random.Random(seed)
+    customers = max(count // CUSTOMER_COUNT_RATIO, 1)
+
+    started = time.perf_counter()
+    prices: Dict[str, float] = {}
+    with engine.begin() as conn:
+        for batch in _batches(_items(rng, count), batch_size):
+            conn.execute(insert(item_table), batch)
+            prices.update((row["item_id"], row["item_price"]) for row in batch)
+    items_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    item_ids = list(prices)
+    lines_written = 0
+    with engine.begin() as conn:
+        for offset in range(0, count, batch_size):
+            orders, lines = [], []
+            for _ in range(min(batch_size, count - offset)):
+                created_at = EPOCH + timedelta(seconds=rng.randrange(ORDER_DAYS * 86400))
+                order_id = _uuid(rng, created_at)
+                total = 0.0
+                for item_id in rng.sample(item_ids, min(rng.randint(1, 3), len(item_ids))):
+                    quantity = rng.randint(1, 5)
+                    total += prices[item_id] * quantity
+                    lines.append({
+                        "order_item_id": _uuid(rng, created_at),
+                        "order_id": order_id,
+                        "item_id": item_id,
+                        "quantity": quantity,
+                        "price": prices[item_id],
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                    })
+                orders.append({
+                    "order_id": order_id,
+                    "customer_name": customer_name(rng.randrange(customers)),
+                    "customer_email": "customer@example.com",
+                    "total_amount": round(total, 2),
+                    "status": rng.choice(STATUSES),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+            conn.execute(insert(order_table), orders)
+            conn.execute(insert(line_table), lines)
+            lines_written += len(lines)
+    orders_seconds = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        totals = {
+            "items": conn.execute(select(func.count()).select_from(item_table)).scalar(),
+            "orders": conn.execute(select(func.count()).select_from(order_table)).scalar(),
+        }
+    return {
+        "seeded_items": count,
+        "seeded_orders": count,
+        "seeded_order_lines": lines_written,
+        "items_seconds": round(items_seconds, 3),
+        "orders_seconds": round(orders_seconds, 3),
+        "table_rows": totals,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Seed items and orders for benchmarks.run")
+    parser.add_argument("--scale", default="10k", help="10k, 100k, 1m or a row count")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per executemany insert")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate the ORM tables first")
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None:
+        from inventoryordersapi.core.settings import settings
+        args.database_url = settings.DATABASE_URL
+    engine = create_engine(args.database_url)
+    summary = seed(engine, parse_scale(args.scale), args.seed, args.batch_size, args.reset)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
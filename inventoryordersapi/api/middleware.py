@@ -0,0 +1,135 @@
+import time
+from typing import Dict, Iterable, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.exception_handlers import http_exception_handler
+from starlette.routing import BaseRoute, Route
+
+from inventoryordersapi.core.metrics import (
+    http_errors_total,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+from inventoryordersapi.core.query_stats import track_queries
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.domain.common import ErrorCode
+
+STATUS_CLASSES = ("1xx", "1xx", "2xx", "3xx", "4xx", "5xx")
+UNMATCHED_ROUTE = "unmatched"
+
+# Fallback label for errors that carry no ErrorCode (validation, auth, plain HTTPException)
+_ERROR_CODE_NAMES = {code.value: code.name for code in ErrorCode if isinstance(code.value, int)}
+ERROR_CODE_STATE = "error_code"
+
+# (method, route template) -> (latency child, {status class: counter child})
+_route_children: Dict[Tuple[str, str], Tuple[object, Dict[str, object]]] = {}
+
+
+def _children_for(method: str, path: str):
+    children = _route_children.get((method, path))
+    if children is None:
+        children = (
+            http_request_duration_seconds.labels(method, path),
+            {status: http_requests_total.labels(method, path, status) for status in STATUS_CLASSES[1:]}
+        )
+        _route_children[(method, path)] = children
+    return children
+
+
+def register_routes(routes: Iterable[BaseRoute]) -> None:
+    """Create the metric children of every route up front so requests only look them up."""
+    for route in routes:
+        if isinstance(route, Route):
+            for method in route.methods or ():
+                _children_for(method, route.path)
+
+
+class ErrorCodeHTTPException(HTTPException):
+    """HTTPException for a service response, keeping its ErrorCode for http_errors_total."""
+
+    def __init__(self, status_code: int, code: ErrorCode, detail: str | None = None):
+        super().__init__(status_code=status_code, detail=detail)
+        self.code = code
+
+
+async def record_error_code(request: Request, exc: HTTPException):
+    """Exception handler: remember the ErrorCode on request.state, then answer as FastAPI does."""
+    code = getattr(exc, "code", None)
+    if code is not None:
+        setattr(request.state, ERROR_CODE_STATE, code)
+    return await http_exception_handler(request, exc)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route request counts, latency,
+    in-flight requests and error responses. Routes are labelled by their
+    path template (e.g. /orders/{order_id}), never by the raw URL; errors by
+    the ErrorCode the route raised (see ErrorCodeHTTPException), or by the
+    one matching their status.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._in_flight = http_requests_in_flight.labels()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._in_flight.dec()
+            route = scope.get("route")
+            path = route.path if route is not None else UNMATCHED_ROUTE
+            latency, by_status = _children_for(scope["method"], path)
+            latency.observe(elapsed)
+            by_status[STATUS_CLASSES[min(status_code // 100, 5)]].inc()
+            if status_code >= 400:
+                code = scope.get("state", {}).get(ERROR_CODE_STATE)
+                label = code.name if code is not None else _ERROR_CODE_NAMES.get(status_code, str(status_code))
+                http_errors_total.labels(path, label).inc()
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware collecting the query count, DB time and slowest
+    statements of each request. With QUERY_STATS_HEADERS on, they are added
+    to the response headers; streamed bodies only count the queries run
+    before the headers went out.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start" and settings.QUERY_STATS_HEADERS:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{stats.total_ms:.2f}".encode()))
+                    if stats.slowest:
+                        headers.append((b"x-db-slowest-ms", f"{max(stats.slowest)[0]:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
@@ -1,5 +1,31 @@
-from inventoryordersapi.api.routes import item_routes, order_routes
+from fastapi import APIRouter
+from inventoryordersapi.api.routes import item_routes, order_routes, internal_routes, report_routes
+from inventoryordersapi.core.settings import settings
+
+def _without_shadowed(router: APIRouter, shadowing: APIRouter) -> APIRouter:
+    """Copy of router minus the routes whose path and method shadowing already serves."""
+    served = {(route.path, method) for route in shadowing.routes for method in route.methods}
+    remaining = APIRouter()
+    remaining.routes.extend(
+        route for route in router.routes
+        if not any((route.path, method) in served for method in route.methods)
+    )
+    return remaining
 
 def include_routers(app):
+    app.include_router(internal_routes.router)
+    app.include_router(report_routes.router)
+
+    if settings.ASYNC_DB:
+        from inventoryordersapi.api.routes import async_item_routes, async_order_routes
+
+        # Remaining sync routes go first so static paths (e.g. /orders/bulk)
+        # still win over the async /{id} patterns
+        app.include_router(_without_shadowed(item_routes.router, async_item_routes.router))
+        app.include_router(_without_shadowed(order_routes.router, async_order_routes.router))
+        app.include_router(async_item_routes.router)
+        app.include_router(async_order_routes.router)
+        return
+
     app.include_router(item_routes.router)
     app.include_router(order_routes.router)
@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inventoryordersapi.services.async_item_service import AsyncItemService
+from inventoryordersapi.domain.item_req_res import (
+    CreateItemRequest,
+    CreateItemResponse,
+    GetItemResponse,
+    ListItemResponse,
+    UpdateItemRequest,
+    UpdateItemResponse
+)
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.core.database import get_async_db
+from inventoryordersapi.core.security import verify_api_key
+from inventoryordersapi.utils.etag import etag_matches, not_modified
+from inventoryordersapi.utils.json_response import model_response
+from inventoryordersapi.utils.pagination import CountStrategy, InvalidCursorError
+
+# Async twins of the core routes in item_routes, served when ASYNC_DB is on
+router = APIRouter(
+    prefix="/items",
+    tags=["Items"],
+    dependencies=[Depends(verify_api_key)]
+)
+
+@router.post("/add_item", response_model=CreateItemResponse)
+async def create_item(req: CreateItemRequest, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncItemService(db)
+    item = await service.create_item(req.item)
+
+    return CreateItemResponse(
+        item=item,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Item created successfully"
+    )
+
+@router.get("/{item_id}", response_model=GetItemResponse)
+async def get_item(
+    item_id: str,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncItemService(db)
+    item, etag = await service.get_item_if_changed(item_id, if_none_match)
+
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if item is None:
+        return not_modified(etag)
+
+    return model_response(GetItemResponse(
+        item=item,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Item fetched successfully"
+    ), headers={"ETag": etag})
+
+@router.put("/{item_id}", response_model=UpdateItemResponse)
+async def update_item(item_id: str, req: UpdateItemRequest, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncItemService(db)
+    updated_item = await service.update_item(item_id, req.item)
+
+    if not updated_item:
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    return UpdateItemResponse(
+        item=updated_item,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Item updated successfully"
+    )
+
+@router.get("/", response_model=ListItemResponse)
+async def list_items(
+    search: str | None = Query(None, description="Search term for item name/description"),
+    min_price: float | None = Query(None, description="Minimum price"),
+    max_price: float | None = Query(None, description="Maximum price"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor/prev_cursor"),
+    page: int | None = Query(None, ge=1, description="Legacy page number (OFFSET pagination, always counts)"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(False, description="Also count all matching items (same as count=exact)"),
+    count: CountStrategy | None = Query(None, description="Total count strategy: exact/estimated/cached/none"),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncItemService(db)
+    etag = await service.listing_etag(search, min_price, max_price, cursor, page, page_size, include_total, count)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        items, pagination = await service.list_items(
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count_strategy=count or (CountStrategy.exact if include_total else None)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return model_response(ListItemResponse(
+        items=items,
+        pagination=pagination,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Items listed successfully"
+    ), headers={"ETag": etag})
+
+@router.delete("/{item_id}", response_model=UpdateItemResponse)
+async def delete_item(item_id: str, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncItemService(db)
+    deleted_item = await service.delete_item(item_id)
+
+    if not deleted_item:
+        raise HTTPException(status_code=404, detail="Item not found or already deleted")
+
+    return UpdateItemResponse(
+        item=deleted_item,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Item soft-deleted successfully"
+    )
@@ -0,0 +1,123 @@
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from inventoryordersapi.api.middleware import ErrorCodeHTTPException
+from inventoryordersapi.core.security import verify_api_key
+from inventoryordersapi.services.async_order_service import AsyncOrderService
+from inventoryordersapi.domain.order_req_res import CreateOrderRequest, CreateOrderResponse
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.core.database import get_async_db
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.services.order_batcher import order_batcher
+from inventoryordersapi.services.async_idempotency_service import AsyncIdempotencyService
+from inventoryordersapi.services.idempotency_service import IDEMPOTENCY_HEADER, fingerprint
+from inventoryordersapi.utils.etag import not_modified
+from inventoryordersapi.utils.json_response import FastJSONResponse
+from inventoryordersapi.utils.pagination import CountStrategy, InvalidCursorError
+
+# Async twins of the core routes in order_routes, served when ASYNC_DB is on
+router = APIRouter(
+    prefix="/orders",
+    tags=["Orders"],
+    dependencies=[Depends(verify_api_key)]
+)
+
+@router.post("/", response_model=CreateOrderResponse)
+async def create_order(
+    request: CreateOrderRequest,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
+):
+    idempotency = AsyncIdempotencyService(db)
+
+    async def handle():
+        if settings.ORDER_BATCH_ENABLED:
+            response = await asyncio.wrap_future(order_batcher.submit(request, idempotency.held_key))
+        else:
+            response = await AsyncOrderService(db).create_order(request)
+
+        if response.error:
+            status_code = 400 if response.code == ErrorCode.BAD_REQUEST else 500
+            raise ErrorCodeHTTPException(
+                status_code=status_code,
+                code=response.code,
+                detail=response.msg
+            )
+
+        return response
+
+    return await idempotency.run("orders.create", idempotency_key, fingerprint(request), handle)
+
+
+@router.get("/{order_id}", response_model=dict)
+async def get_order(
+    order_id: str,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncOrderService(db)
+    response, order, etag = await service.get_order(order_id, if_none_match)
+
+    if response.error:
+        status_code = 404 if response.code == ErrorCode.NOT_FOUND else 500
+        raise ErrorCodeHTTPException(
+            status_code=status_code,
+            code=response.code,
+            detail=response.msg
+        )
+    if order is None:
+        return not_modified(etag)
+
+    return FastJSONResponse(order, headers={"ETag": etag})
+
+@router.get("/", response_model=dict)
+async def list_orders(
+    customer_name: str | None = Query(None, description="Filter by customer name"),
+    status: str | None = Query(None, description="Filter by order status: confirmed, unpaid (pending or canceled) or canceled"),
+    from_date: str | None = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    to_date: str | None = Query(None, description="Filter to date (YYYY-MM-DD)"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor/prev_cursor"),
+    page: int | None = Query(None, ge=1, description="Legacy page number (OFFSET pagination, always counts)"),
+    page_size: int = Query(10, ge=1, le=100, description="Orders per page"),
+    include_total: bool = Query(False, description="Also count all matching orders (same as count=exact)"),
+    count: CountStrategy | None = Query(None, description="Total count strategy: exact/estimated/cached/none"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncOrderService(db)
+    try:
+        orders, pagination = await service.list_orders(
+            customer_name=customer_name,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count_strategy=count or (CountStrategy.exact if include_total else None)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return FastJSONResponse({
+        "orders": orders,
+        "pagination": pagination.model_dump(),
+        "error": False,
+        "code": 200,
+        "msg": "Orders listed successfully"
+    })
+
+@router.post("/{order_id}/cancel")
+async def cancel_order(
+    order_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
+):
+    async def handle():
+        success = await AsyncOrderService(db).cancel_order(order_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Cannot cancel order")
+        return {"error": False, "code": 200, "msg": "Order canceled successfully"}
+
+    return await AsyncIdempotencyService(db).run(
+        "orders.cancel", idempotency_key, fingerprint({"order_id": order_id}), handle
+    )
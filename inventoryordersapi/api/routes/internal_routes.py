@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+
+from inventoryordersapi.core import database
+from inventoryordersapi.core.cache import item_cache
+from inventoryordersapi.core.pool import pool_stats
+from inventoryordersapi.core.security import verify_api_key
+from inventoryordersapi.services.order_batcher import order_batcher
+
+# Operational endpoints for sizing caches and pools; not part of the public API
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    dependencies=[Depends(verify_api_key)]
+)
+
+@router.get("/cache")
+def cache_stats():
+    return {"error": False, "code": 200, "item_cache": item_cache.stats()}
+
+@router.get("/order_batcher")
+def order_batcher_stats():
+    return {"error": False, "code": 200, "order_batcher": order_batcher.stats()}
+
+@router.get("/db_pool")
+def db_pool_stats():
+    pools = {"sync": pool_stats(database.engine)}
+    if database.async_engine is not None:
+        pools["async"] = pool_stats(database.async_engine.sync_engine)
+    return {"error": False, "code": 200, "db_pool": pools}
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import io
+import tempfile
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from inventoryordersapi.services.item_service import ItemService
@@ -8,11 +11,20 @@ from inventoryordersapi.domain.item_req_res import (
     GetItemResponse,
     ListItemResponse,
     UpdateItemRequest,
-    UpdateItemResponse
+    UpdateItemResponse,
+    ItemImportResponse,
+    ItemStockShardsRequest
 )
 from inventoryordersapi.domain.common import ErrorCode
 from inventoryordersapi.core.database import get_db
 from inventoryordersapi.core.security import verify_api_key
+from inventoryordersapi.utils.etag import etag_matches, not_modified
+from inventoryordersapi.utils.item_import import IMPORT_DECODE_ERRORS, IMPORT_FORMATS
+from inventoryordersapi.utils.json_response import model_response
+from inventoryordersapi.utils.pagination import CountStrategy, InvalidCursorError
+
+# Uploads larger than this are spooled to a temp file instead of memory
+IMPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
 
 # 🔐 API key applied to ALL routes in this router
 router = APIRouter(
@@ -33,20 +45,69 @@ def create_item(req: CreateItemRequest, db: Session = Depends(get_db)):
         msg="Item created successfully"
     )
 
+@router.post("/import", response_model=ItemImportResponse)
+async def import_items(
+    request: Request,
+    fmt: str | None = Query(None, alias="format", description="csv or jsonl (defaults from Content-Type)"),
+    batch_size: int | None = Query(None, ge=1, le=50000, description="Rows upserted per transaction"),
+    db: Session = Depends(get_db)
+):
+    content_type = request.headers.get("content-type", "")
+    if not fmt:
+        fmt = "jsonl" if "json" in content_type else "csv"
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported import format: {fmt}")
+
+    service = ItemService(db)
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_SIZE) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8", errors=IMPORT_DECODE_ERRORS, newline="")
+        return await run_in_threadpool(service.import_items, stream, fmt, batch_size)
+
+# Declared before /{item_id} so "low_stock" is not taken for an item id
+@router.get("/low_stock", response_model=ListItemResponse)
+def list_low_stock_items(
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor/prev_cursor"),
+    page_size: int = Query(50, ge=1, le=500, description="Items per page"),
+    db: Session = Depends(get_db)
+):
+    """Active items whose stock is below their low_stock_threshold, by name."""
+    service = ItemService(db)
+    try:
+        items, pagination = service.list_low_stock(page_size=page_size, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return model_response(ListItemResponse(
+        items=items,
+        pagination=pagination,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Low stock items listed successfully"
+    ))
+
 @router.get("/{item_id}", response_model=GetItemResponse)
-def get_item(item_id: str, db: Session = Depends(get_db)):
+def get_item(
+    item_id: str,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
     service = ItemService(db)
-    item = service.get_item(item_id)
+    item, etag = service.get_item_if_changed(item_id, if_none_match)
 
-    if not item:
+    if etag is None:
         raise HTTPException(status_code=404, detail="Item not found")
+    if item is None:
+        return not_modified(etag)
 
-    return GetItemResponse(
+    return model_response(GetItemResponse(
         item=item,
         error=False,
         code=ErrorCode.SUCCESS,
         msg="Item fetched successfully"
-    )
+    ), headers={"ETag": etag})
 
 @router.put("/{item_id}", response_model=UpdateItemResponse)
 def update_item(item_id: str, req: UpdateItemRequest, db: Session = Depends(get_db)):
@@ -63,31 +124,59 @@ def update_item(item_id: str, req: UpdateItemRequest, db: Session = Depends(get_
         msg="Item updated successfully"
     )
 
+@router.post("/{item_id}/shards", response_model=UpdateItemResponse)
+def set_stock_shards(item_id: str, req: ItemStockShardsRequest, db: Session = Depends(get_db)):
+    """Split a hot item's stock across shard_count counters (0 = unsharded); also rebalances."""
+    service = ItemService(db)
+    item = service.set_stock_shards(item_id, req.shard_count)
+
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    return UpdateItemResponse(
+        item=item,
+        error=False,
+        code=ErrorCode.SUCCESS,
+        msg="Item stock shards updated successfully"
+    )
+
 @router.get("/", response_model=ListItemResponse)
 def list_items(
     search: str | None = Query(None, description="Search term for item name/description"),
     min_price: float | None = Query(None, description="Minimum price"),
     max_price: float | None = Query(None, description="Maximum price"),
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor/prev_cursor"),
+    page: int | None = Query(None, ge=1, description="Legacy page number (OFFSET pagination, always counts)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(False, description="Also count all matching items (same as count=exact)"),
+    count: CountStrategy | None = Query(None, description="Total count strategy: exact/estimated/cached/none"),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db)
 ):
     service = ItemService(db)
-    items, pagination = service.list_items(
-        search=search,
-        min_price=min_price,
-        max_price=max_price,
-        page=page,
-        page_size=page_size
-    )
+    etag = service.listing_etag(search, min_price, max_price, cursor, page, page_size, include_total, count)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        items, pagination = service.list_items(
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count_strategy=count or (CountStrategy.exact if include_total else None)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return ListItemResponse(
+    return model_response(ListItemResponse(
         items=items,
         pagination=pagination,
         error=False,
         code=ErrorCode.SUCCESS,
         msg="Items listed successfully"
-    )
+    ), headers={"ETag": etag})
 
 @router.delete("/{item_id}", response_model=UpdateItemResponse)
 def delete_item(item_id: str, db: Session = Depends(get_db)):
@@ -1,14 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import Any, AsyncIterator, List, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from inventoryordersapi.api.middleware import ErrorCodeHTTPException
 from inventoryordersapi.core.security import verify_api_key
+from inventoryordersapi.core.settings import settings
 from inventoryordersapi.services.order_service import OrderService
+from inventoryordersapi.services.order_batcher import order_batcher
+from inventoryordersapi.services.idempotency_service import IDEMPOTENCY_HEADER, IdempotencyService
+from inventoryordersapi.domain.order import Order
 from inventoryordersapi.domain.order_req_res import (
     CreateOrderRequest, CreateOrderResponse, 
     GetOrderResponse, UpdateOrderRequest, 
-    UpdateOrderResponse, ListOrderResponse
+    UpdateOrderResponse, ListOrderResponse,
+    BulkOrderResult, BulkCreateOrderResponse
 )
 from inventoryordersapi.domain.common import ErrorCode
 from inventoryordersapi.core.database import get_db
+from inventoryordersapi.utils.pagination import CountStrategy, InvalidCursorError
+from inventoryordersapi.utils.order_export import EXPORT_FORMATS, EXPORT_MEDIA_TYPES
+from inventoryordersapi.utils.etag import not_modified
+from inventoryordersapi.utils.json_response import FastJSONResponse
 from fastapi import Query
 
 router = APIRouter(
@@ -18,66 +33,218 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=CreateOrderResponse)
-def create_order(request: CreateOrderRequest, db: Session = Depends(get_db)):
+def create_order(
+    request: CreateOrderRequest,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
+):
+    idempotency = IdempotencyService(db)
+
+    def handle():
+        if settings.ORDER_BATCH_ENABLED:
+            response = order_batcher.create_order(request, idempotency.held_key)
+        else:
+            response = OrderService(db).create_order(request)
+
+        if response.error:
+            status_code = 400 if response.code == ErrorCode.BAD_REQUEST else 500
+            raise ErrorCodeHTTPException(
+                status_code=status_code,
+                code=response.code,
+                detail=response.msg
+            )
+
+        return response
+
+    return idempotency.run("orders.create", idempotency_key, request, handle)
+
+
+async def _iter_bulk_entries(request: Request) -> AsyncIterator[Any]:
+    """
+    Yield raw order entries from a JSON array body or, for
+    application/x-ndjson, one line at a time as the body streams in.
+    Lines that are not valid JSON are yielded as None.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" not in content_type and "jsonl" not in content_type:
+        try:
+            entries = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of orders")
+        if not isinstance(entries, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of orders")
+        for entry in entries:
+            yield entry
+        return
+
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_ndjson_line(line)
+    if buffer.strip():
+        yield _parse_ndjson_line(buffer)
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+@router.post("/bulk", response_model=BulkCreateOrderResponse)
+async def create_orders_bulk(
+    request: Request,
+    chunk_size: int | None = Query(None, ge=1, le=5000, description="Orders committed per transaction"),
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
+):
     service = OrderService(db)
-    response = service.create_order(request)
-    
-    if response.error:
-        status_code = 400 if response.code == ErrorCode.BAD_REQUEST else 500
-        raise HTTPException(
-            status_code=status_code,
-            detail=response.msg
+    idempotency = IdempotencyService(db)
+    chunk_size = chunk_size or settings.BULK_ORDER_CHUNK_SIZE
+
+    async def handle() -> BulkCreateOrderResponse:
+        results: List[BulkOrderResult] = []
+        chunk: List[Tuple[int, Order]] = []
+        index = 0
+
+        async for entry in _iter_bulk_entries(request):
+            # A large or slowly streamed body can outlast the key's lease
+            if idempotency.lease_expiring():
+                await run_in_threadpool(idempotency.renew_lease)
+            try:
+                chunk.append((index, Order.model_validate(entry)))
+            except ValidationError as e:
+                reason = e.errors()[0]["msg"] if entry is not None else "malformed JSON"
+                results.append(BulkOrderResult(
+                    index=index,
+                    error=True,
+                    code=ErrorCode.INVALID_REQUEST,
+                    msg=f"Invalid order: {reason}"
+                ))
+            index += 1
+
+            if len(chunk) >= chunk_size:
+                results.extend(await run_in_threadpool(service.create_order_chunk, chunk))
+                chunk = []
+
+        if chunk:
+            results.extend(await run_in_threadpool(service.create_order_chunk, chunk))
+
+        results.sort(key=lambda result: result.index)
+        failed = sum(1 for result in results if result.error)
+        return BulkCreateOrderResponse(
+            created=len(results) - failed,
+            failed=failed,
+            results=results,
+            error=False,
+            code=ErrorCode.SUCCESS,
+            msg="Bulk orders processed"
         )
-    
-    return response
 
+    # The body is streamed, so a reused key is not checked against the payload
+    return await idempotency.run_async("orders.bulk", idempotency_key, None, handle)
+
+
+@router.get("/export")
+def export_orders(
+    fmt: str = Query("ndjson", alias="format", description="ndjson or csv"),
+    customer_name: str | None = Query(None, description="Filter by customer name"),
+    status: str | None = Query(None, description="Filter by order status: confirmed, unpaid (pending or canceled) or canceled"),
+    from_date: str | None = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    to_date: str | None = Query(None, description="Filter to date (YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt}")
+    service = OrderService(db)
+    try:
+        chunks = service.export_orders(
+            fmt=fmt,
+            customer_name=customer_name,
+            status=status,
+            from_date=from_date,
+            to_date=to_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="orders.{fmt}"'}
+    )
 
 @router.get("/{order_id}", response_model=dict)  # keep using dict or create a separate DTO
-def get_order(order_id: str, db: Session = Depends(get_db)):
+def get_order(
+    order_id: str,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
     service = OrderService(db)
-    response = service.get_order(order_id)
+    response, order, etag = service.get_order_view(order_id, if_none_match)
     
     if response.error:
         status_code = 404 if response.code == ErrorCode.NOT_FOUND else 500
-        raise HTTPException(
+        raise ErrorCodeHTTPException(
             status_code=status_code,
+            code=response.code,
             detail=response.msg
         )
+    if order is None:
+        return not_modified(etag)
 
-    return service.format_order_for_response(response.order)
+    return FastJSONResponse(order, headers={"ETag": etag})
 
 @router.get("/", response_model=dict)
 def list_orders(
     customer_name: str | None = Query(None, description="Filter by customer name"),
-    status: str | None = Query(None, description="Filter by order status: confirmed/unpaid/canceled"),
+    status: str | None = Query(None, description="Filter by order status: confirmed, unpaid (pending or canceled) or canceled"),
     from_date: str | None = Query(None, description="Filter from date (YYYY-MM-DD)"),
     to_date: str | None = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor/prev_cursor"),
+    page: int | None = Query(None, ge=1, description="Legacy page number (OFFSET pagination, always counts)"),
     page_size: int = Query(10, ge=1, le=100, description="Orders per page"),
+    include_total: bool = Query(False, description="Also count all matching orders (same as count=exact)"),
+    count: CountStrategy | None = Query(None, description="Total count strategy: exact/estimated/cached/none"),
     db: Session = Depends(get_db)
 ):
     service = OrderService(db)
-    orders, pagination = service.list_orders(
-        customer_name=customer_name,
-        status=status,
-        from_date=from_date,
-        to_date=to_date,
-        page=page,
-        page_size=page_size
-    )
+    try:
+        orders, pagination = service.list_orders(
+            customer_name=customer_name,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count_strategy=count or (CountStrategy.exact if include_total else None)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {
-        "orders": [service.format_order_for_response(order) for order in orders],
-        "pagination": pagination,
+    return FastJSONResponse({
+        "orders": orders,
+        "pagination": pagination.model_dump(),
         "error": False,
         "code": 200,
         "msg": "Orders listed successfully"
-    }
+    })
 
 @router.post("/{order_id}/cancel")
-def cancel_order(order_id: str, db: Session = Depends(get_db)):
-    service = OrderService(db)
-    success = service.cancel_order(order_id)
-    if not success:
-        raise HTTPException(status_code=400, detail="Cannot cancel order")
-    return {"error": False, "code": 200, "msg": "Order canceled successfully"}
+def cancel_order(
+    order_id: str,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
+):
+    def handle():
+        success = OrderService(db).cancel_order(order_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Cannot cancel order")
+        return {"error": False, "code": 200, "msg": "Order canceled successfully"}
+
+    return IdempotencyService(db).run("orders.cancel", idempotency_key, {"order_id": order_id}, handle)
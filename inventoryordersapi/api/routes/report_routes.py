@@ -0,0 +1,68 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from inventoryordersapi.core.database import get_db
+from inventoryordersapi.core.security import verify_api_key
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.domain.report import DailySalesResponse, ItemSalesResponse, StatusTotalsResponse
+from inventoryordersapi.services.report_service import ReportService
+
+# Rollup-backed sales reports; ranges are inclusive order days
+router = APIRouter(
+    prefix="/reports",
+    tags=["Reports"],
+    dependencies=[Depends(verify_api_key)]
+)
+
+# Longest range one request may aggregate
+MAX_REPORT_DAYS = 3660
+
+
+def _check_range(from_date: date, to_date: date) -> None:
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="from_date must not be after to_date")
+    if (to_date - from_date).days >= MAX_REPORT_DAYS:
+        raise HTTPException(status_code=400, detail=f"Ranges are limited to {MAX_REPORT_DAYS} days")
+
+
+@router.get("/sales/daily", response_model=DailySalesResponse)
+def daily_sales(
+    from_date: date = Query(..., description="First order day (YYYY-MM-DD)"),
+    to_date: date = Query(..., description="Last order day (YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+):
+    _check_range(from_date, to_date)
+    return DailySalesResponse(
+        days=ReportService(db).daily_sales(from_date, to_date),
+        code=ErrorCode.SUCCESS,
+        msg="Daily sales"
+    )
+
+
+@router.get("/sales/items", response_model=ItemSalesResponse)
+def item_sales(
+    from_date: date = Query(..., description="First order day (YYYY-MM-DD)"),
+    to_date: date = Query(..., description="Last order day (YYYY-MM-DD)"),
+    limit: int = Query(20, ge=1, le=500, description="Top items by revenue"),
+    db: Session = Depends(get_db)
+):
+    _check_range(from_date, to_date)
+    return ItemSalesResponse(
+        items=ReportService(db).item_sales(from_date, to_date, limit),
+        code=ErrorCode.SUCCESS,
+        msg="Sales per item"
+    )
+
+
+@router.get("/orders/status", response_model=StatusTotalsResponse)
+def status_totals(
+    from_date: date = Query(..., description="First order day (YYYY-MM-DD)"),
+    to_date: date = Query(..., description="Last order day (YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+):
+    _check_range(from_date, to_date)
+    return StatusTotalsResponse(
+        statuses=ReportService(db).status_totals(from_date, to_date),
+        code=ErrorCode.SUCCESS,
+        msg="Orders per status"
+    )
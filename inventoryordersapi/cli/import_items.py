@@ -0,0 +1,41 @@
+"""
+Import a CSV or JSONL item catalog straight into the database.
+
+    python -m inventoryordersapi.cli.import_items catalog.csv
+    python -m inventoryordersapi.cli.import_items catalog.jsonl --batch-size 10000
+"""
+import argparse
+import sys
+
+from inventoryordersapi.core.database import SessionLocal
+from inventoryordersapi.model import item_record, item_stock_shard_record, order_record, order_item_record  # noqa: F401 (register mappers)
+from inventoryordersapi.services.item_service import ItemService
+from inventoryordersapi.utils.item_import import IMPORT_DECODE_ERRORS, IMPORT_FORMATS
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Upsert items from a CSV or JSONL file")
+    parser.add_argument("path", help="File to import, or - for stdin")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults from the file extension")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows upserted per transaction")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+
+    db = SessionLocal()
+    try:
+        if args.path == "-":
+            sys.stdin.reconfigure(errors=IMPORT_DECODE_ERRORS)
+            summary = ItemService(db).import_items(sys.stdin, fmt, args.batch_size)
+        else:
+            with open(args.path, encoding="utf-8", errors=IMPORT_DECODE_ERRORS, newline="") as stream:
+                summary = ItemService(db).import_items(stream, fmt, args.batch_size)
+    finally:
+        db.close()
+
+    print(summary.model_dump_json(indent=2))
+    return 0 if summary.rejected == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""
+Delete expired idempotency keys. Run it periodically (e.g. from cron).
+
+    python -m inventoryordersapi.cli.purge_idempotency_keys
+"""
+import sys
+
+from inventoryordersapi.core.database import SessionLocal
+from inventoryordersapi.repo.idempotency_repo import IdempotencyRepo
+
+
+def main(argv=None) -> int:
+    db = SessionLocal()
+    try:
+        deleted = IdempotencyRepo(db).purge_expired()
+    finally:
+        db.close()
+
+    print(f"Deleted {deleted} expired idempotency keys")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Rebuild the sales rollup tables from order and order_item. Run it once after
+the sales-rollups changeset, or for a day range to repair it.
+
+    python -m inventoryordersapi.cli.rebuild_sales_rollups
+    python -m inventoryordersapi.cli.rebuild_sales_rollups --from-date 2025-01-01 --to-date 2025-01-31
+"""
+import argparse
+import sys
+from datetime import date
+
+from inventoryordersapi.core.database import SessionLocal
+from inventoryordersapi.model import item_record, item_stock_shard_record, order_record, order_item_record  # noqa: F401 (register mappers)
+from inventoryordersapi.services.report_service import ReportService
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the daily sales rollups")
+    parser.add_argument("--from-date", type=date.fromisoformat, default=None, help="First order day (YYYY-MM-DD)")
+    parser.add_argument("--to-date", type=date.fromisoformat, default=None, help="Last order day (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        summary = ReportService(db).rebuild_rollups(args.from_date, args.to_date)
+    finally:
+        db.close()
+
+    print(summary.model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .settings import settings  # relative import
+
+
+class Cache(ABC):
+    """
+    Minimal cache interface used by the repos. Backends count hits, misses
+    and evictions so the cache can be sized from /internal/cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "size": self.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class NullCache(Cache):
+    """Cache that never stores anything; every lookup is a miss."""
+
+    def get(self, key):
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return 0
+
+
+class LRUTTLCache(Cache):
+    """
+    Thread-safe in-process cache bounded by entry count (least recently used
+    entries are evicted first) and by age (entries expire after ttl_seconds).
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisCache(Cache):
+    """
+    Cache backed by any Redis-compatible client exposing get/set(ex=)/delete
+    (redis-py, fakeredis, a local stand-in...). Values are pickled; size and
+    evictions are managed by the server, so only hits and misses are counted.
+    """
+
+    def __init__(self, client: Any, ttl_seconds: float = 60.0, prefix: str = "cache:"):
+        super().__init__()
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+
+    def get(self, key):
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self._key(key), pickle.dumps(value), ex=max(1, int(self.ttl_seconds)))
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def size(self):
+        return sum(1 for _ in self.client.scan_iter(f"{self.prefix}*"))
+
+
+def build_cache(backend: str, max_size: int, ttl_seconds: float, redis_url: Optional[str] = None, prefix: str = "cache:") -> Cache:
+    if backend == "none":
+        return NullCache()
+    if backend == "redis":
+        import redis  # optional dependency, only needed for this backend
+
+        return RedisCache(redis.Redis.from_url(redis_url), ttl_seconds=ttl_seconds, prefix=prefix)
+    return LRUTTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+
+item_cache = build_cache(
+    settings.ITEM_CACHE_BACKEND,
+    max_size=settings.ITEM_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ITEM_CACHE_TTL_SECONDS,
+    redis_url=settings.ITEM_CACHE_REDIS_URL,
+    prefix="item:"
+)
+
+
+# Entries are evicted as soon as a write is issued and again once it commits,
+# so a concurrent reader cannot re-cache the pre-commit row for a full TTL.
+PENDING_ITEM_EVICTIONS = "pending_item_evictions"
+
+def evict_items(db: Session, item_ids: Iterable[str]) -> None:
+    item_ids = list(item_ids)
+    item_cache.delete_many(item_ids)
+    db.info.setdefault(PENDING_ITEM_EVICTIONS, set()).update(item_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_items(session):
+    pending = session.info.pop(PENDING_ITEM_EVICTIONS, None)
+    if pending:
+        item_cache.delete_many(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending_evictions(session, previous_transaction):
+    # A savepoint rollback (e.g. one failed order in a batch) keeps the outer transaction's evictions
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_ITEM_EVICTIONS, None)
@@ -1,11 +1,20 @@
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from .pool import engine_options, install_idle_pre_ping
+from .query_stats import install_query_stats
 from .settings import settings  # relative import
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True
+    **engine_options(settings.DATABASE_URL)
 )
+if settings.DB_POOL_PRE_PING == "idle":
+    install_idle_pre_ping(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+if settings.QUERY_STATS_ENABLED:
+    install_query_stats(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -21,3 +30,35 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart."""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)).render_as_string(
+        hide_password=False
+    )
+
+# Only built in async mode so the async drivers stay optional
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    _async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, is_async=True))
+    if settings.DB_POOL_PRE_PING == "idle":
+        install_idle_pre_ping(async_engine.sync_engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    if settings.QUERY_STATS_ENABLED:
+        install_query_stats(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        autoflush=False,
+        bind=async_engine
+    )
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,151 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .settings import settings  # relative import
+
+# Upper bounds (ms) of the checkout wait-time histogram buckets; the last bucket is open-ended
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class CheckoutStats:
+    """Checkout wait-time histogram and timeout count for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(CHECKOUT_WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in CHECKOUT_WAIT_BUCKETS_MS] + ["gt_5000ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.wait_ms_total / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.wait_ms_max,
+                "wait_histogram": dict(zip(labels, self.counts)),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, checkout_stats: CheckoutStats | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = checkout_stats or CheckoutStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_stats.timed_out()
+            raise
+        self.checkout_stats.observe((time.perf_counter() - started) * 1000)
+        return record
+
+    def recreate(self):
+        # Keep the histogram when the pool is rebuilt after a disconnect
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """TimedQueuePool for AsyncEngine."""
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    stats = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update(pool.checkout_stats.snapshot())
+    return stats
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine/create_async_engine keyword arguments from the DB_* settings."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING == "always"}
+
+    # In-memory SQLite needs its single-connection pool
+    if not (backend == "sqlite" and parsed.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    connect_args: Dict[str, Any] = {}
+    if backend == "postgresql":
+        server_settings = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if settings.DB_LOCK_TIMEOUT_MS:
+            server_settings["lock_timeout"] = str(settings.DB_LOCK_TIMEOUT_MS)
+        if server_settings and parsed.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = server_settings
+        elif server_settings:
+            connect_args["options"] = " ".join(f"-c {name}={value}" for name, value in server_settings.items())
+    elif backend == "sqlite" and settings.DB_LOCK_TIMEOUT_MS:
+        # SQLite has no statement timeout; its busy timeout is the closest thing to a lock timeout
+        connect_args["timeout"] = settings.DB_LOCK_TIMEOUT_MS / 1000
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def install_idle_pre_ping(engine: Engine, idle_seconds: float) -> None:
+    """
+    Ping a connection on checkout only if it sat idle in the pool for longer
+    than idle_seconds; busy connections skip the extra round trip. A failed
+    ping makes the pool discard the connection and hand out a fresh one.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            raise exc.DisconnectionError() from e
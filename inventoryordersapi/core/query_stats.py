@@ -0,0 +1,84 @@
+import heapq
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .settings import settings  # relative import
+
+slow_query_log = logging.getLogger("inventoryordersapi.slow_query")
+
+# How many of the slowest statements a request keeps
+SLOWEST_KEPT = 3
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    label: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest: List[Tuple[float, str]] = field(default_factory=list)  # min-heap of (ms, statement)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, (elapsed_ms, statement))
+        elif elapsed_ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (elapsed_ms, statement))
+
+    def slowest_first(self) -> List[Tuple[float, str]]:
+        return sorted(self.slowest, reverse=True)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    """
+    Collect every statement run in this context (and in threadpool calls made
+    from it, which copy the context) into one QueryStats.
+    """
+    stats = QueryStats(label=label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def install_query_stats(engine: Engine) -> None:
+    """Time every statement on engine; feed the current QueryStats and the slow-query log."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+        if settings.SLOW_QUERY_MS and elapsed_ms >= settings.SLOW_QUERY_MS:
+            slow_query_log.warning(json.dumps({
+                "event": "slow_query",
+                "duration_ms": round(elapsed_ms, 2),
+                "request": stats.label if stats is not None else None,
+                "statement": statement,
+                "executemany": executemany,
+                "rowcount": cursor.rowcount,
+            }))
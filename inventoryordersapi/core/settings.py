@@ -1,11 +1,47 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     SERVICE_PORT: int = 8000
     API_KEY: str
+    CURSOR_SECRET: Optional[str] = None  # signs pagination cursors; defaults to API_KEY
     ALLOW_ORIGINS: List[str] = ["*"]
+    METRICS_ENABLED: bool = True  # request metrics middleware + GET /metrics (Prometheus text format)
+    QUERY_STATS_ENABLED: bool = True  # per-request query count / DB time, slow-query log
+    QUERY_STATS_HEADERS: bool = False  # debug: X-DB-Query-Count, X-DB-Time-Ms, X-DB-Slowest-Ms response headers
+    SLOW_QUERY_MS: float = 200.0  # statements at least this slow are logged as JSON; 0 disables
+    DB_POOL_SIZE: int = 5  # per process (uvicorn worker)
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DB_POOL_PRE_PING: str = "idle"  # always | idle (only after DB_POOL_PRE_PING_IDLE_SECONDS in the pool) | never
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = no limit (PostgreSQL)
+    DB_LOCK_TIMEOUT_MS: int = 0  # 0 = no limit (PostgreSQL lock_timeout, SQLite busy timeout)
+    ASYNC_DB: bool = False  # serve the core item/order routes with async def + AsyncSession
+    ASYNC_DATABASE_URL: Optional[str] = None  # defaults to DATABASE_URL with an async driver
+    BULK_ORDER_CHUNK_SIZE: int = 500
+    ORDER_BATCH_ENABLED: bool = False  # group-commit concurrent POST /orders/ requests
+    ORDER_BATCH_WINDOW_MS: float = 5.0  # how long the first queued order waits for company
+    ORDER_BATCH_MAX_SIZE: int = 100
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0  # how long a stored response is replayed
+    IDEMPOTENCY_LEASE_SECONDS: float = 60.0  # an in-progress key is taken over after this
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # how long a duplicate waits for the in-flight request
+    STOCK_RESERVATION_MODE: str = "lock"  # lock (SELECT ... FOR UPDATE) | atomic (conditional UPDATE per item)
+    ORDER_EXPORT_BATCH_SIZE: int = 1000  # orders per server-side cursor fetch in /orders/export
+    ITEM_CACHE_BACKEND: str = "memory"  # memory | redis | none
+    ITEM_CACHE_MAX_SIZE: int = 10000
+    ITEM_CACHE_TTL_SECONDS: float = 60.0
+    ITEM_CACHE_REDIS_URL: Optional[str] = None
+    COUNT_CACHE_TTL_SECONDS: float = 5.0
+    COUNT_CACHE_MAX_SIZE: int = 1000
+    ITEM_SEARCH_MODE: str = "auto"  # auto | fulltext | inverted | ilike
+    ITEM_SEARCH_INDEX_TTL_SECONDS: float = 300.0
+    ITEM_SEARCH_MAX_CANDIDATES: int = 10000  # larger inverted-index match sets fall back to a scan
+    ITEM_IMPORT_BATCH_SIZE: int = 5000
+    LOW_STOCK_THRESHOLD: int = 5  # low_stock_threshold given to items created without one
+    LOW_STOCK_WEBHOOK_URL: Optional[str] = None  # POST threshold crossings caused by orders/cancels here
 
     class Config:
         env_file = ".env"
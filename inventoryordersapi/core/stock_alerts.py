@@ -0,0 +1,86 @@
+import json
+import logging
+import threading
+import urllib.request
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("inventoryordersapi.stock_alerts")
+
+PENDING_STOCK_ALERTS = "pending_stock_alerts"
+
+
+@dataclass
+class StockAlert:
+    """An item whose stock crossed its low_stock_threshold (either way) in a committed transaction."""
+    item_id: str
+    item_name: str
+    item_quantity: int
+    low_stock_threshold: int
+    low_stock: bool  # True: fell below the threshold; False: back at or above it
+
+
+StockAlertListener = Callable[[List[StockAlert]], None]
+
+_listeners: List[StockAlertListener] = []
+
+
+def add_stock_alert_listener(listener: StockAlertListener) -> None:
+    """Call listener with each committed transaction's threshold crossings."""
+    _listeners.append(listener)
+
+
+def remove_stock_alert_listener(listener: StockAlertListener) -> None:
+    _listeners.remove(listener)
+
+
+def stock_alerts_enabled() -> bool:
+    """Crossings are only looked up while someone is listening."""
+    return bool(_listeners)
+
+
+def queue_stock_alerts(session: Session, alerts: Iterable[StockAlert]) -> None:
+    """Hold alerts until the session commits; a rollback drops them."""
+    session.info.setdefault(PENDING_STOCK_ALERTS, []).extend(alerts)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed_alerts(session):
+    alerts = session.info.pop(PENDING_STOCK_ALERTS, None)
+    if not alerts:
+        return
+    for listener in list(_listeners):
+        try:
+            listener(alerts)
+        except Exception:
+            logger.exception("Stock alert listener %r failed", listener)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending_alerts(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_STOCK_ALERTS, None)
+
+
+def webhook_listener(url: str, timeout: float = 5.0) -> StockAlertListener:
+    """
+    Listener that POSTs {"alerts": [...]} as JSON to url from a background
+    thread, so a slow receiver never holds up the request that committed.
+    Failed deliveries are logged, not retried.
+    """
+
+    def post(alerts: List[StockAlert]) -> None:
+        body = json.dumps({"alerts": [asdict(alert) for alert in alerts]}).encode()
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            urllib.request.urlopen(request, timeout=timeout).close()
+        except Exception as e:
+            logger.warning("Stock alert webhook %s failed: %s", url, e)
+
+    def listener(alerts: List[StockAlert]) -> None:
+        threading.Thread(target=post, args=(alerts,), name="stock-alert-webhook", daemon=True).start()
+
+    return listener
@@ -0,0 +1,48 @@
+from collections import defaultdict
+from typing import Dict, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Per-table write generations for this process. A generation is bumped when
+# a transaction that wrote to the table commits, so anything memoized per
+# generation (e.g. cached counts) is invalidated by committed writes only.
+_generations: Dict[str, int] = defaultdict(int)
+
+PENDING_WRITTEN_TABLES = "pending_written_tables"
+
+
+def table_generation(table_name: str) -> int:
+    return _generations[table_name]
+
+
+def mark_tables_written(session: Session, table_names: Iterable[str]) -> None:
+    """Record writes the ORM cannot see (e.g. raw text() DML)."""
+    session.info.setdefault(PENDING_WRITTEN_TABLES, set()).update(table_names)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    tables = {obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)}
+    if tables:
+        mark_tables_written(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_executed_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            mark_tables_written(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    for table_name in session.info.pop(PENDING_WRITTEN_TABLES, ()):
+        _generations[table_name] += 1
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending_tables(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_WRITTEN_TABLES, None)
@@ -32,8 +32,9 @@ class ErrorCode(Enum):
 #     total_count: int = 0
 
 class Pagination(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None
+    total_is_exact: bool = True
+    page: int = 1
     page_size: int
     next_cursor: Optional[str] = None
     prev_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional
 from datetime import datetime
 from .common import TimestampMixin
@@ -12,7 +12,10 @@ class Item(BaseModel):
     item_price: float
     item_quantity: int
     is_active: Optional[bool] = True
+    low_stock_threshold: Optional[int] = Field(None, ge=0)  # None: settings.LOW_STOCK_THRESHOLD on create
     low_stock: bool
+    # ETag source set by ItemRepo (updated_at + stock); cached with the item, never serialized
+    _version: Optional[str] = PrivateAttr(default=None)
 
 # For reading an item (includes ID and timestamps)
 class ItemRead(Item, TimestampMixin):
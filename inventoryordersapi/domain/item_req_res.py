@@ -1,6 +1,6 @@
 from typing import Optional, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from .item import Item
 from .common import BaseResponse, Pagination
 
@@ -35,4 +35,27 @@ class GetItemRequest(BaseModel):
 class GetItemResponse(BaseResponse):
     error: bool = False
     msg: Optional[str] = None
-    item: Optional[Item] = None
\ No newline at end of file
+    item: Optional[Item] = None
+
+
+class ItemStockShardsRequest(BaseModel):
+    shard_count: int = Field(ge=0, le=256)  # 0 folds the stock back into the item row
+
+
+class ItemImportRow(BaseModel):
+    item_name: str = Field(min_length=1, max_length=255)
+    item_description: Optional[str] = None
+    item_price: float = Field(ge=0)
+    item_quantity: int = Field(ge=0)
+    is_active: bool = True
+    low_stock_threshold: Optional[int] = Field(None, ge=0)  # None keeps an existing item's threshold
+
+class ItemImportError(BaseModel):
+    line: int
+    msg: str
+
+class ItemImportResponse(BaseResponse):
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    errors: List[ItemImportError] = []
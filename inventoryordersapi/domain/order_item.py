@@ -15,6 +15,7 @@ class OrderItemCreate(OrderItemBase):
 class OrderItemRead(OrderItemBase, TimestampMixin):
     order_item_id: str
     price: float
+    item_name: Optional[str] = None
     created_at: Optional[datetime] = None  # Make these fields optional
     updated_at: Optional[datetime] = None
 
@@ -3,7 +3,7 @@ from typing import Optional, List
 
 from pydantic import BaseModel
 from .order import Order
-from .common import BaseResponse, Pagination
+from .common import BaseResponse, ErrorCode, Pagination
 
 class CreateOrderRequest(BaseModel):
     order: Order
@@ -33,4 +33,16 @@ class GetOrderRequest(BaseModel):
 class GetOrderResponse(BaseResponse):
     error: bool = False
     msg: Optional[str] = None
-    order: Optional[Order] = None
\ No newline at end of file
+    order: Optional[Order] = None
+
+class BulkOrderResult(BaseModel):
+    index: int
+    order_id: Optional[str] = None
+    error: bool = False
+    code: ErrorCode = ErrorCode.SUCCESS
+    msg: Optional[str] = None
+
+class BulkCreateOrderResponse(BaseResponse):
+    created: int = 0
+    failed: int = 0
+    results: List[BulkOrderResult] = []
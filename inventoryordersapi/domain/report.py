@@ -0,0 +1,42 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+from .common import BaseResponse
+
+
+class DailySales(BaseModel):
+    day: date
+    orders: int  # pending + confirmed orders placed that day
+    units: int
+    revenue: float
+
+
+class ItemSales(BaseModel):
+    item_id: str
+    item_name: Optional[str] = None  # None once the item row is gone
+    units: int
+    revenue: float
+
+
+class StatusTotals(BaseModel):
+    status: str
+    orders: int
+    amount: float
+
+
+class DailySalesResponse(BaseResponse):
+    days: List[DailySales] = []
+
+
+class ItemSalesResponse(BaseResponse):
+    items: List[ItemSales] = []
+
+
+class StatusTotalsResponse(BaseResponse):
+    statuses: List[StatusTotals] = []
+
+
+class RollupRebuildResponse(BaseResponse):
+    item_rows: int = 0
+    status_rows: int = 0
@@ -1,8 +1,13 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from inventoryordersapi.api.middleware import MetricsMiddleware, QueryStatsMiddleware, record_error_code, register_routes
 from inventoryordersapi.api.routes import include_routers
+from inventoryordersapi.core.metrics import registry
+from inventoryordersapi.core.security import verify_api_key
 from inventoryordersapi.core.settings import settings
+from inventoryordersapi.core.stock_alerts import add_stock_alert_listener, webhook_listener
 
 app = FastAPI(title="Inventory & Orders Management API", version="1.0.0")
 
@@ -14,11 +19,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.add_exception_handler(HTTPException, record_error_code)
+
 @app.get("/", tags=["Root"])
 async def hc():
     return {"error": False, "msg": "Ok", "result": {"status": "SERVING"}}
 
+if settings.LOW_STOCK_WEBHOOK_URL:
+    add_stock_alert_listener(webhook_listener(settings.LOW_STOCK_WEBHOOK_URL))
+
+if settings.METRICS_ENABLED:
+    # Same API key as /internal: the samples expose routes, volumes and error rates
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_api_key)])
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 include_routers(app)
 
 from inventoryordersapi.api.routes.item_routes import router as item_router
 app.include_router(item_router, prefix="/items", tags=["Items"])
+
+if settings.METRICS_ENABLED:
+    register_routes(app.routes)
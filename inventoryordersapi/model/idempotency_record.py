@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime
+from sqlalchemy.sql import func
+from inventoryordersapi.model import Base
+
+class IdempotencyRecord(Base):
+    """The stored outcome of a request sent with an Idempotency-Key header."""
+    __tablename__ = "idempotency_key"
+
+    scope = Column(String(64), primary_key=True)  # operation, e.g. orders.create
+    idempotency_key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=True)  # NULL = payload not checked (streamed bodies)
+    status = Column(String(16), nullable=False, default="in_progress")  # in_progress | committed | completed
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # In progress: lease of the request holding the key; completed: end of the replay window
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,18 +1,23 @@
-from sqlalchemy import Column, String, Float, Integer, Boolean, Text, DateTime
+from sqlalchemy import Column, String, Float, Integer, Boolean, Text, DateTime, Uuid, Index, and_
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from inventoryordersapi.model import Base
-import uuid
+from inventoryordersapi.utils.ids import new_id
 
 class ItemRecord(Base):
     __tablename__ = "item"
 
-    item_id = Column(String(255), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    # Native 16-byte UUID on PostgreSQL (CHAR(32) elsewhere); str in Python
+    item_id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
     item_name = Column(String(255), nullable=False)  # Added back item_name
     item_description = Column(Text, nullable=True)
     item_price = Column(Float, nullable=False)
     item_quantity = Column(Integer, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)   
+    # 0 = stock lives in item_quantity; N > 0 = stock is split across N item_stock_shard rows
+    stock_shard_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Stock below this is low; new items get settings.LOW_STOCK_THRESHOLD
+    low_stock_threshold = Column(Integer, server_default="5", nullable=False)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -21,4 +26,35 @@ class ItemRecord(Base):
         "OrderItemRecord",
         back_populates="item",
         cascade="all, delete-orphan"
-    )
\ No newline at end of file
+    )
+    stock_shards = relationship(
+        "ItemStockShardRecord",
+        back_populates="item",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+# GET /items/low_stock, in the listing sort order (item_name, item_id); see db.item-low-stock-02.
+# Unsharded items are compared in the index predicate; sharded items (few, hot) are summed per row.
+LOW_STOCK_UNSHARDED = and_(
+    ItemRecord.is_active == True,
+    ItemRecord.stock_shard_count == 0,
+    ItemRecord.item_quantity < ItemRecord.low_stock_threshold
+)
+SHARDED_ACTIVE = and_(ItemRecord.is_active == True, ItemRecord.stock_shard_count > 0)
+Index(
+    "idx_item_low_stock", ItemRecord.item_name, ItemRecord.item_id,
+    postgresql_where=LOW_STOCK_UNSHARDED, sqlite_where=LOW_STOCK_UNSHARDED
+)
+Index(
+    "idx_item_sharded", ItemRecord.item_name, ItemRecord.item_id,
+    postgresql_where=SHARDED_ACTIVE, sqlite_where=SHARDED_ACTIVE
+)
+
+# At most one active item per case-insensitive name; writes rely on it instead of checking first.
+# See db.item-active-name-02.
+ACTIVE_NAME_INDEX = "uq_item_active_name"
+Index(
+    ACTIVE_NAME_INDEX, func.lower(ItemRecord.item_name), unique=True,
+    postgresql_where=ItemRecord.is_active == True, sqlite_where=ItemRecord.is_active == True
+)
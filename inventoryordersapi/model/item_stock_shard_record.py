@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey, Uuid
+from sqlalchemy.orm import relationship
+from inventoryordersapi.model import Base
+
+class ItemStockShardRecord(Base):
+    """One sub-counter of a sharded item's stock; the item's stock is the sum of its shards."""
+    __tablename__ = "item_stock_shard"
+
+    item_id = Column(Uuid(as_uuid=False), ForeignKey("item.item_id", ondelete="CASCADE"), primary_key=True)
+    shard_no = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+
+    item = relationship("ItemRecord", back_populates="stock_shards")
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, BigInteger
+from inventoryordersapi.model import Base
+
+# Commits bump one random row, so concurrent item writes rarely queue on the same counter
+ITEM_VERSION_SHARDS = 16
+
+class ItemVersionRecord(Base):
+    """
+    One sub-counter of the item table version. Every commit that writes to
+    item or item_stock_shard adds 1 to a row, so the sum of the rows grows
+    with each such commit and versions the GET /items/ listing.
+    """
+    __tablename__ = "item_version"
+
+    shard_no = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,13 +1,13 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Float, Integer, DateTime, ForeignKey, Uuid
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from inventoryordersapi.model import Base
-import uuid
+from inventoryordersapi.utils.ids import new_id
 class OrderItemRecord(Base):
     __tablename__ = "order_item"
-    order_item_id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    order_id = Column(String(255), ForeignKey("order.order_id"), nullable=False)
-    item_id = Column(String(255), ForeignKey("item.item_id"), nullable=False)
+    order_item_id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
+    order_id = Column(Uuid(as_uuid=False), ForeignKey("order.order_id"), nullable=False)
+    item_id = Column(Uuid(as_uuid=False), ForeignKey("item.item_id"), nullable=False)
     quantity = Column(Integer, nullable=False, default=1)
     price = Column(Float, nullable=False)  # store price at time of order
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -18,5 +18,5 @@ class OrderItemRecord(Base):
 
     def __init__(self, **kwargs):
         if 'order_item_id' not in kwargs:
-            kwargs['order_item_id'] = str(uuid.uuid4())
+            kwargs['order_item_id'] = new_id()
         super().__init__(**kwargs)
\ No newline at end of file
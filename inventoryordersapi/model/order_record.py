@@ -2,9 +2,9 @@ from sqlalchemy import Column, String, Float, Boolean, DateTime
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from inventoryordersapi.model import Base
-import uuid
+from inventoryordersapi.utils.ids import new_id
 
-from sqlalchemy import Column, String, Float, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Float, Boolean, DateTime, Enum, Index, Uuid
 import enum
 
 class OrderStatus(str, enum.Enum):
@@ -15,7 +15,7 @@ class OrderStatus(str, enum.Enum):
 class OrderRecord(Base):
     __tablename__ = "order"
 
-    order_id = Column(String(255), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    order_id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
     customer_name = Column(String(255), nullable=False)
     customer_email = Column(String(255), nullable=False)
     total_amount = Column(Float, default=0, nullable=False)
@@ -28,3 +28,7 @@ class OrderRecord(Base):
         back_populates="order",
         cascade="all, delete-orphan"
     )
+
+# Listing indexes, in the keyset sort order (created_at DESC, order_id DESC); see db.order-list-indexes-02
+Index("idx_order_created_at", OrderRecord.created_at.desc(), OrderRecord.order_id.desc())
+Index("idx_order_status_created_at", OrderRecord.status, OrderRecord.created_at.desc(), OrderRecord.order_id.desc())
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Date, Float, Integer, Uuid
+from inventoryordersapi.model import Base
+
+class SalesDailyItemRecord(Base):
+    """Units and revenue of one item on one order day (canceled orders excluded)."""
+    __tablename__ = "sales_daily_item"
+
+    day = Column(Date, primary_key=True)
+    item_id = Column(Uuid(as_uuid=False), primary_key=True)  # no FK: rollups outlive deleted items
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
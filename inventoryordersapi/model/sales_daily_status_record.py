@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Date, Float, Integer, String
+from inventoryordersapi.model import Base
+
+class SalesDailyStatusRecord(Base):
+    """Order count and amount per status for orders placed on one day."""
+    __tablename__ = "sales_daily_status"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0)
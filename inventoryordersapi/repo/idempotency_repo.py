@@ -0,0 +1,153 @@
+import datetime
+
+from sqlalchemy import delete, event, update
+from sqlalchemy.orm import Session
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.model.idempotency_record import IdempotencyRecord
+
+# (scope, key) pairs whose operation writes through this session. Each commit
+# marks them committed in the same transaction, so once any of the work is
+# durable the key can no longer be released or taken over.
+GUARDED_IDEMPOTENCY_KEYS = "guarded_idempotency_keys"
+
+
+def guard_idempotency_key(session: Session, scope: str, key: str) -> None:
+    session.info.setdefault(GUARDED_IDEMPOTENCY_KEYS, set()).add((scope, key))
+
+
+def unguard_idempotency_key(session: Session, scope: str, key: str) -> None:
+    session.info.get(GUARDED_IDEMPOTENCY_KEYS, set()).discard((scope, key))
+
+
+@event.listens_for(Session, "before_commit")
+def _mark_guarded_keys_committed(session):
+    for scope, key in sorted(session.info.get(GUARDED_IDEMPOTENCY_KEYS, ())):
+        IdempotencyRepo(session).mark_committed(scope, key)
+
+
+class IdempotencyRepo:
+    """
+    Idempotency keys are written in their own short transactions (every
+    method commits) so a claim is visible to concurrent duplicates while the
+    operation it guards is still running. The exception is mark_committed,
+    which runs in the guarded operation's own transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _commit(self) -> None:
+        """Commit key bookkeeping only; it must not mark the session's guarded keys committed."""
+        guarded = self.db.info.pop(GUARDED_IDEMPOTENCY_KEYS, None)
+        try:
+            self.db.commit()
+        finally:
+            if guarded:
+                self.db.info[GUARDED_IDEMPOTENCY_KEYS] = guarded
+
+    def get(self, scope: str, key: str) -> IdempotencyRecord | None:
+        return self.db.get(IdempotencyRecord, (scope, key), populate_existing=True)
+
+    def _insert(self):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"Idempotency keys are not supported on {dialect}")
+        return insert(IdempotencyRecord)
+
+    def claim(self, scope: str, key: str, request_hash: str | None, lease_seconds: float) -> bool:
+        """
+        Insert an in-progress record for the key with one INSERT ... ON
+        CONFLICT DO NOTHING, after dropping an expired record for it.
+        Returns True if this call now holds the key.
+        """
+        now = datetime.datetime.utcnow()
+        self.db.execute(
+            delete(IdempotencyRecord).where(
+                IdempotencyRecord.scope == scope,
+                IdempotencyRecord.idempotency_key == key,
+                IdempotencyRecord.expires_at < now
+            )
+        )
+        claimed = self.db.execute(
+            self._insert()
+            .values(
+                scope=scope,
+                idempotency_key=key,
+                request_hash=request_hash,
+                status="in_progress",
+                expires_at=now + datetime.timedelta(seconds=lease_seconds)
+            )
+            .on_conflict_do_nothing(index_elements=["scope", "idempotency_key"])
+            .returning(IdempotencyRecord.scope)
+        ).first() is not None
+        self._commit()
+        return claimed
+
+    def extend_lease(self, scope: str, key: str, lease_seconds: float) -> None:
+        """Push back the lease of an in-progress key held by a long request."""
+        self.db.execute(
+            update(IdempotencyRecord)
+            .where(
+                IdempotencyRecord.scope == scope,
+                IdempotencyRecord.idempotency_key == key,
+                IdempotencyRecord.status == "in_progress"
+            )
+            .values(expires_at=datetime.datetime.utcnow() + datetime.timedelta(seconds=lease_seconds))
+        )
+        self._commit()
+
+    def mark_committed(self, scope: str, key: str) -> None:
+        """
+        Mark an in-progress key committed, in the caller's transaction (no
+        commit). A committed key is kept for the replay window even if its
+        response is never stored.
+        """
+        self.db.execute(
+            update(IdempotencyRecord)
+            .where(
+                IdempotencyRecord.scope == scope,
+                IdempotencyRecord.idempotency_key == key,
+                IdempotencyRecord.status == "in_progress"
+            )
+            .values(
+                status="committed",
+                expires_at=datetime.datetime.utcnow() + datetime.timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            )
+        )
+
+    def complete(self, scope: str, key: str, status_code: int, body: str, ttl_seconds: float) -> None:
+        record = self.get(scope, key)
+        if record is None:
+            return
+        record.status = "completed"
+        record.response_status = status_code
+        record.response_body = body
+        record.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl_seconds)
+        self._commit()
+
+    def release(self, scope: str, key: str) -> bool:
+        """
+        Drop an in-progress claim so the client can retry the request.
+        Returns False if the key was already committed (and is kept).
+        """
+        released = self.db.execute(
+            delete(IdempotencyRecord).where(
+                IdempotencyRecord.scope == scope,
+                IdempotencyRecord.idempotency_key == key,
+                IdempotencyRecord.status == "in_progress"
+            )
+        ).rowcount
+        self._commit()
+        return bool(released)
+
+    def purge_expired(self) -> int:
+        deleted = self.db.execute(
+            delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < datetime.datetime.utcnow())
+        ).rowcount
+        self._commit()
+        return deleted
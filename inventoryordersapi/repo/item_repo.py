@@ -1,108 +1,686 @@
-import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from inventoryordersapi.model.item_record import ItemRecord
+import csv
+import io
+import random
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy.orm import Query, Session, aliased
+from sqlalchemy import Integer, Row, event, select, func, update, insert, delete, bindparam, text, union_all
+from sqlalchemy.exc import IntegrityError
+from inventoryordersapi.model.item_record import ItemRecord, ACTIVE_NAME_INDEX, LOW_STOCK_UNSHARDED, SHARDED_ACTIVE
+from inventoryordersapi.model.item_stock_shard_record import ItemStockShardRecord
+from inventoryordersapi.model.item_version_record import ITEM_VERSION_SHARDS, ItemVersionRecord
 from inventoryordersapi.domain.item import Item
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.core.cache import item_cache, evict_items
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.core.stock_alerts import StockAlert, queue_stock_alerts, stock_alerts_enabled
+from inventoryordersapi.core.write_tracking import PENDING_WRITTEN_TABLES, mark_tables_written
+from inventoryordersapi.repo.item_search import item_search_index
+from inventoryordersapi.utils.ids import new_id, parse_id, parse_ids
 from inventoryordersapi.utils.pagination import paginate_query
 
+
+class StockError(ValueError):
+    """Raised when an order line cannot be reserved (unknown item or not enough stock)."""
+
+    def __init__(self, code: ErrorCode, msg: str):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+
+
+class DuplicateItemNameError(ValueError):
+    """Raised when a write would leave two active items with the same case-insensitive name."""
+
+
+def _raise_if_duplicate_name(error: IntegrityError, name: str) -> None:
+    # PostgreSQL and SQLite both name the violated index in the message
+    if ACTIVE_NAME_INDEX in str(error.orig):
+        raise DuplicateItemNameError(f"An active item named {name} already exists") from error
+
+
+# Tables whose committed writes change GET /items/ (see ItemVersionRecord)
+LISTING_TABLES = frozenset({ItemRecord.__tablename__, ItemStockShardRecord.__tablename__})
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_item_version(session):
+    # A savepoint release is folded into the outer commit, which bumps once
+    if session.in_nested_transaction():
+        return
+    session.flush()
+    if not LISTING_TABLES & session.info.get(PENDING_WRITTEN_TABLES, set()):
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    else:
+        raise NotImplementedError(f"Item versions are not supported on {dialect}")
+    statement = upsert(ItemVersionRecord).values(shard_no=random.randrange(ITEM_VERSION_SHARDS), version=1)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=["shard_no"],
+        set_={"version": ItemVersionRecord.version + 1}
+    ))
+
+
+def _shard_total():
+    """Correlated sum of an item row's shard stock (0 when unsharded)."""
+    return (
+        select(func.coalesce(func.sum(ItemStockShardRecord.quantity), 0))
+        .where(ItemStockShardRecord.item_id == ItemRecord.item_id)
+        .scalar_subquery()
+    )
+
+
 class ItemRepo:
     def __init__(self, db: Session):
         self.db = db
 
-    def _record_to_item(self, record: ItemRecord) -> Item:
+    @staticmethod
+    def _version(item_id: str, updated_at, quantity: int) -> str:
+        # Sharded orders change stock without touching updated_at, so the total is part of the version
+        return f"{item_id}/{updated_at.isoformat() if updated_at else ''}/{quantity}"
+
+    def _record_to_item(self, record: ItemRecord, quantity: int | None = None) -> Item:
         """Convert ItemRecord (SQLAlchemy) to Item (Pydantic)"""
         if not record:
             return None
-        return Item(
+        if quantity is None:
+            quantity = record.item_quantity
+        item = Item(
             item_id=str(record.item_id),
             item_name=record.item_name,
             item_description=record.item_description,
             item_price=record.item_price,
-            item_quantity=record.item_quantity,
+            item_quantity=quantity,
             is_active=record.is_active,
-            low_stock=record.item_quantity < 5
+            low_stock_threshold=record.low_stock_threshold,
+            low_stock=quantity < record.low_stock_threshold
         )
+        item._version = self._version(item.item_id, record.updated_at, quantity)
+        return item
+
+    def stock_totals(self, records: Iterable[ItemRecord]) -> Dict[str, int]:
+        """
+        Stock per item: item_quantity plus, for sharded items, the sum of
+        their shards (one grouped query, skipped when nothing is sharded).
+        """
+        records = list(records)
+        totals = {record.item_id: record.item_quantity for record in records}
+        sharded = [record.item_id for record in records if record.stock_shard_count]
+        if sharded:
+            shard_sums = self.db.execute(
+                select(ItemStockShardRecord.item_id, func.sum(ItemStockShardRecord.quantity))
+                .where(ItemStockShardRecord.item_id.in_(sharded))
+                .group_by(ItemStockShardRecord.item_id)
+            ).all()
+            for item_id, quantity in shard_sums:
+                totals[item_id] += quantity
+        return totals
+
+    def stock_levels(self, item_ids: Iterable[str]) -> Dict[str, Tuple[ItemRecord, int]]:
+        """Current (record, total stock) per item, shards included."""
+        records = self.db.query(ItemRecord).filter(ItemRecord.item_id.in_(list(item_ids))).all()
+        totals = self.stock_totals(records)
+        return {record.item_id: (record, totals[record.item_id]) for record in records}
+
+    def queue_threshold_alerts(self, deltas: Dict[str, int]) -> None:
+        """
+        After stock was moved by deltas (negative = taken) in this transaction,
+        queue a StockAlert for every item that crossed its low_stock_threshold;
+        they are delivered once the transaction commits. Costs nothing while
+        no stock alert listener is registered.
+        """
+        if not deltas or not stock_alerts_enabled():
+            return
+        alerts = []
+        for item_id, (record, quantity) in self.stock_levels(deltas).items():
+            threshold = record.low_stock_threshold
+            if (quantity - deltas[item_id] < threshold) != (quantity < threshold):
+                alerts.append(StockAlert(
+                    item_id=item_id,
+                    item_name=record.item_name,
+                    item_quantity=quantity,
+                    low_stock_threshold=threshold,
+                    low_stock=quantity < threshold
+                ))
+        queue_stock_alerts(self.db, alerts)
+
+    def low_stock_query(self) -> Tuple[Query, Any]:
+        """
+        Active items whose stock is below their low_stock_threshold, as a
+        query over (alias of) ItemRecord. It is a UNION ALL of the unsharded
+        items (idx_item_low_stock) and the sharded ones with their shards
+        summed (idx_item_sharded); filters and ORDER BY on the alias are pushed
+        into both branches, which are merged in index order. Returns the query
+        and the alias to sort and filter on.
+        """
+        low_stock = union_all(
+            select(ItemRecord).where(LOW_STOCK_UNSHARDED),
+            select(ItemRecord).where(SHARDED_ACTIVE, ItemRecord.item_quantity + _shard_total() < ItemRecord.low_stock_threshold)
+        ).subquery("low_stock_item")
+        item = aliased(ItemRecord, low_stock)
+        return self.db.query(item), item
+
+    def _records_to_items(self, records: Iterable[ItemRecord]) -> List[Item]:
+        records = list(records)
+        totals = self.stock_totals(records)
+        return [self._record_to_item(record, totals[record.item_id]) for record in records]
 
     def get(self, item_id: str) -> Item:
-        """Get item by ID without locking"""
+        """Get item by ID without locking (read-through item_cache)"""
+        item_id = parse_id(item_id)
+        if item_id is None:
+            return None
+        cached = item_cache.get(item_id)
+        if cached is not None:
+            return cached.model_copy()
+
         record = self.db.query(ItemRecord).filter(ItemRecord.item_id == item_id).first()
-        return self._record_to_item(record)
+        if not record:
+            return None
+        item = self._records_to_items([record])[0]
+        item_cache.set(item_id, item)
+        return item
+
+    def get_version(self, item_id: str) -> str | None:
+        """
+        The item's current version for ETags, without building the item: one
+        primary-key lookup of updated_at and the stock total. Never read from
+        the cache, which another process's writes do not evict. None if the
+        item does not exist.
+        """
+        item_id = parse_id(item_id)
+        if item_id is None:
+            return None
+        row = self.db.execute(
+            select(ItemRecord.updated_at, ItemRecord.item_quantity + _shard_total())
+            .where(ItemRecord.item_id == item_id)
+        ).first()
+        return self._version(item_id, row[0], row[1]) if row else None
+
+    def listing_version(self) -> int:
+        """
+        Version of the item table for listing ETags: the sum of the
+        item_version counters, which every commit that writes to item or
+        item_stock_shard increases (deletes and deactivations included).
+        """
+        return self.db.execute(select(func.coalesce(func.sum(ItemVersionRecord.version), 0))).scalar()
+
+    def get_many(self, item_ids: Iterable[str]) -> Dict[str, Item]:
+        """Get several items by ID; cache misses are fetched with one query."""
+        item_ids = set(parse_ids(item_ids))
+        items = item_cache.get_many(item_ids)
+        missing = item_ids - items.keys()
+        if missing:
+            records = self.db.query(ItemRecord).filter(ItemRecord.item_id.in_(missing)).all()
+            for item in self._records_to_items(records):
+                item_cache.set(item.item_id, item)
+                items[item.item_id] = item
+        return items
+
+    def invalidate(self, item_ids: Iterable[str]) -> None:
+        """Drop cached copies of items written in the current transaction."""
+        evict_items(self.db, item_ids)
         
     def get_for_update(self, item_id: str) -> ItemRecord:
         """Get item with row lock for update"""
+        item_id = parse_id(item_id)
+        if item_id is None:
+            return None
         return self.db.query(ItemRecord).filter(
             ItemRecord.item_id == item_id
         ).with_for_update().first()
 
+    def lock_items(self, item_ids: Iterable[str]) -> Dict[str, ItemRecord]:
+        """
+        Lock every referenced item row with one SELECT ... FOR UPDATE.
+        Rows are locked in item_id order so concurrent orders cannot deadlock.
+        Sharded items are returned unlocked: their stock is taken from the
+        shards, so orders for them must not queue on the item row.
+        """
+        ids = sorted(set(parse_ids(item_ids)))
+        if not ids:
+            return {}
+        records = self.db.query(ItemRecord).filter(
+            ItemRecord.item_id.in_(ids),
+            ItemRecord.stock_shard_count == 0
+        ).order_by(ItemRecord.item_id).with_for_update().all()
+        locked = {record.item_id: record for record in records}
+        unlocked = [item_id for item_id in ids if item_id not in locked]
+        if unlocked:
+            locked.update(
+                (record.item_id, record)
+                for record in self.db.query(ItemRecord).filter(ItemRecord.item_id.in_(unlocked))
+            )
+        return locked
+
     def list_items(self, skip: int = 0, limit: int = 100):
         query = self.db.query(ItemRecord)
         records, pagination = paginate_query(query, limit=limit, offset=skip)
-        items = [self._record_to_item(record) for record in records]
+        items = self._records_to_items(records)
         return items, pagination
 
     def create(self, item: Item) -> Item:
+        """Raises DuplicateItemNameError if an active item already has this name."""
         db_item = ItemRecord(
             item_name=item.item_name,
             item_description=item.item_description,
             item_price=item.item_price,
             item_quantity=item.item_quantity,
-            is_active=item.is_active
+            is_active=item.is_active,
+            low_stock_threshold=(
+                settings.LOW_STOCK_THRESHOLD if item.low_stock_threshold is None else item.low_stock_threshold
+            )
         )
         self.db.add(db_item)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            _raise_if_duplicate_name(e, item.item_name)
+            raise
         self.db.refresh(db_item)
-        return self._record_to_item(db_item)
+        item = self._record_to_item(db_item)
+        item_cache.set(db_item.item_id, item)
+        item_search_index.mark_dirty([db_item.item_id])
+        return item
 
     def update(self, db_item: ItemRecord, item: Item) -> Item:
+        """Raises DuplicateItemNameError if another active item has the new name."""
         for field, value in item.dict(exclude_unset=True).items():
+            if field == 'low_stock_threshold' and value is None:
+                continue  # keep the current threshold
             if field != 'item_id':  # Don't update the ID
                 setattr(db_item, field, value)
-        self.db.commit()
+        try:
+            if db_item.stock_shard_count:
+                # item_quantity is the new total; move it into the shards
+                self.db.flush()
+                self.spread_into_shards([db_item.item_id])
+            self.invalidate([db_item.item_id])
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            _raise_if_duplicate_name(e, item.item_name)
+            raise
+        item_search_index.mark_dirty([db_item.item_id])
         self.db.refresh(db_item)
-        return self._record_to_item(db_item)
+        return self._records_to_items([db_item])[0]
 
     def delete(self, db_item: ItemRecord) -> bool:
+        self.invalidate([db_item.item_id])
         self.db.delete(db_item)
         self.db.commit()
+        item_search_index.mark_dirty([db_item.item_id])
         return True
     
-    def decrease_item_quantity(self, item_id: str, quantity: int) -> None:
+    def decrease_item_quantity(self, item_id: str, quantity: int) -> Row:
         """
-        Decrease item quantity with row lock to prevent race conditions.
-        Assumes this is called within an existing transaction.
+        Take stock with one conditional UPDATE ... RETURNING; the row is
+        neither read nor locked beforehand. Returns the item's id, name and
+        price. Raises StockError if the item is unknown or has too little stock.
         """
-        item = self.get_for_update(item_id)
-        
-        if not item:
-            raise ValueError(f"Item with ID {item_id} not found")
-        
-        if item.item_quantity < quantity:
-            raise ValueError(
-                f"Insufficient stock for item {item.item_name}. "
-                f"Available: {item.item_quantity}, Requested: {quantity}"
+        if parse_id(item_id) is None:
+            raise StockError(ErrorCode.NOT_FOUND, f"Item with ID {item_id} not found")
+        item_table = ItemRecord.__table__
+        row = self.db.execute(
+            update(item_table)
+            .where(item_table.c.item_id == item_id, item_table.c.item_quantity >= quantity)
+            .values(item_quantity=item_table.c.item_quantity - quantity, updated_at=func.now())
+            .returning(item_table.c.item_id, item_table.c.item_name, item_table.c.item_price)
+        ).first()
+        if row is None:
+            row = self.db.execute(
+                select(
+                    item_table.c.item_id,
+                    item_table.c.item_name,
+                    item_table.c.item_price,
+                    item_table.c.stock_shard_count
+                ).where(item_table.c.item_id == item_id)
+            ).first()
+            if row is None:
+                raise StockError(ErrorCode.NOT_FOUND, f"Item with ID {item_id} not found")
+            if not row.stock_shard_count:
+                raise StockError(ErrorCode.INSUFFICIENT_STOCK, f"Insufficient stock for item {row.item_name}")
+            self.take_shard_stock(item_id, quantity, row.item_name)
+        self.invalidate([item_id])
+        return row
+
+    def reserve_quantities(self, quantities: Dict[str, int]) -> Dict[str, Row]:
+        """
+        Take stock for a basket with one conditional UPDATE per item, in
+        item_id order so concurrent baskets queue on rows in the same order.
+        Does not roll back on StockError; the caller's rollback undoes the
+        lines already taken.
+        """
+        return {
+            item_id: self.decrease_item_quantity(item_id, quantity)
+            for item_id, quantity in sorted(quantities.items())
+        }
+
+    def decrease_quantities(self, quantities: Dict[str, int], sharded_ids: Iterable[str] = ()) -> None:
+        """
+        Decrease stock for many items with a single executemany UPDATE.
+        Assumes the rows were locked with lock_items in the same transaction;
+        items in sharded_ids are taken from their shards instead.
+        """
+        sharded_ids = set(sharded_ids)
+        for item_id in sorted(sharded_ids & quantities.keys()):
+            self.take_shard_stock(item_id, quantities[item_id])
+        quantities = {item_id: quantity for item_id, quantity in quantities.items() if item_id not in sharded_ids}
+        if not quantities:
+            return
+        item_table = ItemRecord.__table__
+        self.db.execute(
+            update(item_table)
+            .where(item_table.c.item_id == bindparam("b_item_id"))
+            .values(
+                item_quantity=item_table.c.item_quantity - bindparam("b_quantity"),
+                updated_at=func.now()
+            ),
+            [
+                {"b_item_id": item_id, "b_quantity": quantity}
+                for item_id, quantity in sorted(quantities.items())
+            ]
+        )
+        self.invalidate(quantities.keys())
+
+    def increase_quantities(self, quantities: Dict[str, int]) -> None:
+        """
+        Return stock for many items with a single executemany UPDATE.
+        The increment is relative, so the rows do not need to be locked first.
+        Sharded items get their stock back on a random shard.
+        """
+        if not quantities:
+            return
+        shard_counts = dict(self.db.execute(
+            select(ItemRecord.item_id, ItemRecord.stock_shard_count).where(
+                ItemRecord.item_id.in_(list(quantities)),
+                ItemRecord.stock_shard_count > 0
             )
-        
-        item.item_quantity -= quantity
-        item.updated_at = datetime.datetime.utcnow()
-        self.db.add(item)
+        ).all())
+        if shard_counts:
+            shard_table = ItemStockShardRecord.__table__
+            self.db.execute(
+                update(shard_table)
+                .where(
+                    shard_table.c.item_id == bindparam("b_item_id"),
+                    shard_table.c.shard_no == bindparam("b_shard_no")
+                )
+                .values(quantity=shard_table.c.quantity + bindparam("b_quantity")),
+                [
+                    {"b_item_id": item_id, "b_shard_no": random.randrange(count), "b_quantity": quantities[item_id]}
+                    for item_id, count in sorted(shard_counts.items())
+                ]
+            )
+            self.invalidate(shard_counts.keys())
+
+        quantities = {item_id: quantity for item_id, quantity in quantities.items() if item_id not in shard_counts}
+        if not quantities:
+            return
+        item_table = ItemRecord.__table__
+        self.db.execute(
+            update(item_table)
+            .where(item_table.c.item_id == bindparam("b_item_id"))
+            .values(
+                item_quantity=item_table.c.item_quantity + bindparam("b_quantity"),
+                updated_at=func.now()
+            ),
+            [
+                {"b_item_id": item_id, "b_quantity": quantity}
+                for item_id, quantity in sorted(quantities.items())
+            ]
+        )
+        self.invalidate(quantities.keys())
 
-    def exists_active_name(self, name: str, exclude_id: str | None = None) -> bool:
+    def take_shard_stock(self, item_id: str, quantity: int, item_name: str | None = None) -> None:
         """
-        Check if an active item with the same name already exists.
+        Take stock from a sharded item. The fast path is one UPDATE on a random
+        shard that has enough stock and is not locked by another order
+        (SKIP LOCKED), so concurrent orders spread over the shards. If no
+        single free shard can cover the quantity, all shards are locked in
+        shard order and the quantity is taken across them.
+        Raises StockError if the shards together hold too little stock.
         """
-        query = self.db.query(ItemRecord).filter(
-            func.lower(ItemRecord.item_name) == name.lower(),
-            ItemRecord.is_active == True
+        shard_table = ItemStockShardRecord.__table__
+        candidate = (
+            select(shard_table.c.shard_no)
+            .where(shard_table.c.item_id == item_id, shard_table.c.quantity >= quantity)
+            .order_by(func.random())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
         )
+        taken = self.db.execute(
+            update(shard_table)
+            .where(
+                shard_table.c.item_id == item_id,
+                shard_table.c.shard_no == candidate,
+                shard_table.c.quantity >= quantity
+            )
+            .values(quantity=shard_table.c.quantity - quantity)
+            .returning(shard_table.c.shard_no)
+        ).first()
+        if taken is None:
+            shards = self.db.execute(
+                select(shard_table.c.shard_no, shard_table.c.quantity)
+                .where(shard_table.c.item_id == item_id)
+                .order_by(shard_table.c.shard_no)
+                .with_for_update()
+            ).all()
+            if sum(shard.quantity for shard in shards) < quantity:
+                raise StockError(
+                    ErrorCode.INSUFFICIENT_STOCK,
+                    f"Insufficient stock for item {item_name or item_id}"
+                )
+            remaining = quantity
+            takes = []
+            for shard in shards:
+                take = min(shard.quantity, remaining)
+                if take:
+                    takes.append({"b_shard_no": shard.shard_no, "b_quantity": take})
+                    remaining -= take
+                if not remaining:
+                    break
+            self.db.execute(
+                update(shard_table)
+                .where(shard_table.c.item_id == item_id, shard_table.c.shard_no == bindparam("b_shard_no"))
+                .values(quantity=shard_table.c.quantity - bindparam("b_quantity")),
+                takes
+            )
+        self.invalidate([item_id])
+
+    def _write_shards(self, item_id: str, shard_count: int, total: int) -> None:
+        """Replace an item's shards with shard_count rows splitting total as evenly as possible."""
+        shard_table = ItemStockShardRecord.__table__
+        self.db.execute(delete(shard_table).where(shard_table.c.item_id == item_id))
+        if shard_count:
+            share, extra = divmod(total, shard_count)
+            self.db.execute(insert(shard_table), [
+                {"item_id": item_id, "shard_no": shard_no, "quantity": share + (1 if shard_no < extra else 0)}
+                for shard_no in range(shard_count)
+            ])
 
-        if exclude_id:
-            query = query.filter(ItemRecord.item_id != exclude_id)
+    def spread_into_shards(self, item_ids: Iterable[str]) -> None:
+        """
+        For sharded items whose item_quantity was just set to a new total
+        (update, import), overwrite their shards with that total and zero
+        item_quantity. Unsharded items are left alone.
+        """
+        item_table = ItemRecord.__table__
+        sharded = self.db.execute(
+            select(item_table.c.item_id, item_table.c.stock_shard_count, item_table.c.item_quantity)
+            .where(item_table.c.item_id.in_(list(item_ids)), item_table.c.stock_shard_count > 0)
+            .order_by(item_table.c.item_id)
+        ).all()
+        for item_id, shard_count, total in sharded:
+            self._write_shards(item_id, shard_count, total)
+        if sharded:
+            self.db.execute(
+                update(item_table)
+                .where(item_table.c.item_id.in_([row.item_id for row in sharded]))
+                .values(item_quantity=0)
+            )
+            self.invalidate(row.item_id for row in sharded)
 
-        return self.db.query(query.exists()).scalar()
+    def reshard(self, db_item: ItemRecord, shard_count: int) -> None:
+        """
+        Split an item's whole stock evenly across shard_count shards, or fold
+        it back into item_quantity when shard_count is 0. Also rebalances an
+        already sharded item. db_item must be locked (get_for_update). Does not commit.
+        """
+        shard_table = ItemStockShardRecord.__table__
+        in_shards = self.db.execute(
+            select(shard_table.c.quantity)
+            .where(shard_table.c.item_id == db_item.item_id)
+            .order_by(shard_table.c.shard_no)
+            .with_for_update()
+        ).scalars().all()
+        total = db_item.item_quantity + sum(in_shards)
+        self._write_shards(db_item.item_id, shard_count, total)
+        db_item.item_quantity = 0 if shard_count else total
+        db_item.stock_shard_count = shard_count
+        self.invalidate([db_item.item_id])
+        self.db.flush()
+
+    def upsert_batch(self, rows: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """
+        Insert or update a batch of items keyed on case-insensitive active name.
+        Rows must have unique names within the batch. Does not commit.
+        Returns (inserted_ids, updated_ids).
+        """
+        if not rows:
+            return [], []
+        if self.db.get_bind().dialect.name == "postgresql":
+            return self._upsert_batch_copy(rows)
+        return self._upsert_batch_executemany(rows)
+
+    def _upsert_batch_copy(self, rows: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """COPY the batch into a temp staging table, then merge it into item."""
+        self.db.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS item_import_stage ("
+            " item_id UUID, item_name VARCHAR(255), item_description TEXT,"
+            " item_price FLOAT, item_quantity INT, is_active BOOLEAN, low_stock_threshold INT, existing_id UUID"
+            ") ON COMMIT DELETE ROWS"
+        ))
+        self.db.execute(text("TRUNCATE item_import_stage"))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                new_id(),
+                row["item_name"],
+                row.get("item_description"),
+                row["item_price"],
+                row["item_quantity"],
+                row.get("is_active", True),
+                row.get("low_stock_threshold")
+            ])
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY item_import_stage (item_id, item_name, item_description,"
+                " item_price, item_quantity, is_active, low_stock_threshold) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+        # Resolve matches once so the merge below joins on the primary key
+        self.db.execute(text(
+            "UPDATE item_import_stage s SET existing_id = i.item_id FROM item i"
+            " WHERE i.is_active AND lower(i.item_name) = lower(s.item_name)"
+        ))
+        updated_ids = self.db.execute(text(
+            "UPDATE item SET item_description = s.item_description, item_price = s.item_price,"
+            " item_quantity = s.item_quantity, is_active = s.is_active,"
+            " low_stock_threshold = COALESCE(s.low_stock_threshold, item.low_stock_threshold), updated_at = now()"
+            " FROM item_import_stage s WHERE item.item_id = s.existing_id"
+            " RETURNING item.item_id"
+        )).scalars().all()
+        self.invalidate(updated_ids)
+        self.spread_into_shards(updated_ids)
+        inserted_ids = self.db.execute(text(
+            "INSERT INTO item (item_id, item_name, item_description, item_price, item_quantity, is_active,"
+            " low_stock_threshold)"
+            " SELECT s.item_id, s.item_name, s.item_description, s.item_price, s.item_quantity, s.is_active,"
+            " COALESCE(s.low_stock_threshold, :default_threshold)"
+            " FROM item_import_stage s WHERE s.existing_id IS NULL"
+            " RETURNING item_id"
+        ), {"default_threshold": settings.LOW_STOCK_THRESHOLD}).scalars().all()
+        mark_tables_written(self.db, [ItemRecord.__tablename__])
+        return inserted_ids, updated_ids
+
+    def _upsert_batch_executemany(self, rows: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """Portable fallback: look up existing names once, then executemany UPDATE and INSERT."""
+        item_table = ItemRecord.__table__
+        names = [row["item_name"].lower() for row in rows]
+        existing = dict(
+            self.db.query(func.lower(ItemRecord.item_name), ItemRecord.item_id).filter(
+                func.lower(ItemRecord.item_name).in_(names),
+                ItemRecord.is_active == True
+            ).all()
+        )
+
+        updates = []
+        inserts = []
+        for row in rows:
+            item_id = existing.get(row["item_name"].lower())
+            if item_id:
+                updates.append({
+                    "b_item_id": item_id,
+                    "b_item_description": row.get("item_description"),
+                    "b_item_price": row["item_price"],
+                    "b_item_quantity": row["item_quantity"],
+                    "b_is_active": row.get("is_active", True),
+                    "b_low_stock_threshold": row.get("low_stock_threshold")
+                })
+            else:
+                inserts.append({
+                    "item_id": new_id(),
+                    "item_name": row["item_name"],
+                    "item_description": row.get("item_description"),
+                    "item_price": row["item_price"],
+                    "item_quantity": row["item_quantity"],
+                    "is_active": row.get("is_active", True),
+                    "low_stock_threshold": (
+                        settings.LOW_STOCK_THRESHOLD if row.get("low_stock_threshold") is None
+                        else row["low_stock_threshold"]
+                    )
+                })
+
+        if updates:
+            self.db.execute(
+                update(item_table)
+                .where(item_table.c.item_id == bindparam("b_item_id"))
+                .values(
+                    item_description=bindparam("b_item_description"),
+                    item_price=bindparam("b_item_price"),
+                    item_quantity=bindparam("b_item_quantity"),
+                    is_active=bindparam("b_is_active"),
+                    low_stock_threshold=func.coalesce(
+                        bindparam("b_low_stock_threshold", type_=Integer), item_table.c.low_stock_threshold
+                    ),
+                    updated_at=func.now()
+                ),
+                updates
+            )
+            self.invalidate(update["b_item_id"] for update in updates)
+            self.spread_into_shards(update["b_item_id"] for update in updates)
+        if inserts:
+            self.db.execute(insert(item_table), inserts)
+        return [row["item_id"] for row in inserts], [update["b_item_id"] for update in updates]
 
     def soft_delete(self, db_item: ItemRecord) -> Item:
         db_item.is_active = False
         self.db.add(db_item)
+        self.invalidate([db_item.item_id])
         self.db.commit()
+        item_search_index.mark_dirty([db_item.item_id])
         self.db.refresh(db_item)
         return self._record_to_item(db_item)
\ No newline at end of file
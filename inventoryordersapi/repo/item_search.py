@@ -0,0 +1,278 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import Float, case, func, literal, literal_column, or_
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import ColumnElement
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.model.item_record import ItemRecord
+
+SEARCH_MODES = ("auto", "fulltext", "inverted", "ilike")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _grams(text: str) -> Set[str]:
+    # Short grams too, so terms under three characters have postings of their own
+    return {text[i:i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+
+
+def _term_grams(term: str) -> Set[str]:
+    return _trigrams(term) if len(term) >= 3 else {term}
+
+
+def _score(term: str, name: str, description: str) -> float:
+    score = 0.0
+    if term in name:
+        score += 3.0 if name.startswith(term) else 2.0
+    if term in description:
+        score += 1.0
+    return score
+
+
+Document = Tuple[str, str, float]
+
+
+class InvertedIndex:
+    """
+    In-process trigram index over active item names, descriptions and prices,
+    used for substring search where PostgreSQL full-text/pg_trgm is
+    unavailable. A query only verifies the items sharing every gram of the
+    term, so lookups stay flat as the catalog grows. Written items are marked
+    dirty and re-read before the next search; the whole index is rebuilt
+    after ttl_seconds to pick up writes made by other processes.
+
+    Rows are read from the database outside the lock: a rebuild loads a new
+    snapshot and swaps it in, while other searches keep using the old one.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._postings: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, Document] = {}
+        # item_id -> sequence of its latest mark; re-read before the next search
+        self._dirty: Dict[str, int] = {}
+        # Marks since the last rebuild, and the mark each re-read row reflects
+        self._marked: Dict[str, int] = {}
+        self._applied: Dict[str, int] = {}
+        self._sequence = 0
+        self._built_at: Optional[float] = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def mark_dirty(self, item_ids: Iterable[str]) -> None:
+        with self._lock:
+            for item_id in item_ids:
+                self._sequence += 1
+                self._dirty[item_id] = self._marked[item_id] = self._sequence
+
+    def reset(self) -> None:
+        with self._lock:
+            self._built_at = None
+
+    @staticmethod
+    def _add(
+        postings: Dict[str, Set[str]],
+        documents: Dict[str, Document],
+        item_id: str,
+        document: Document
+    ) -> None:
+        documents[item_id] = document
+        for gram in _grams(document[0]) | _grams(document[1]):
+            postings.setdefault(gram, set()).add(item_id)
+
+    def _remove(self, item_id: str) -> None:
+        document = self._documents.pop(item_id, None)
+        if document:
+            for gram in _grams(document[0]) | _grams(document[1]):
+                postings = self._postings.get(gram)
+                if postings:
+                    postings.discard(item_id)
+
+    @staticmethod
+    def _documents_query(db: Session):
+        return db.query(
+            ItemRecord.item_id, ItemRecord.item_name, ItemRecord.item_description, ItemRecord.item_price
+        ).filter(ItemRecord.is_active == True)
+
+    @staticmethod
+    def _document(name: str, description: Optional[str], price: float) -> Document:
+        return name.lower(), (description or "").lower(), price
+
+    def _refresh(self, db: Session) -> None:
+        with self._lock:
+            expired = self._built_at is None or time.monotonic() - self._built_at > self.ttl_seconds
+            # While one search rebuilds, the others keep serving the old snapshot
+            rebuild = expired and (self._built_at is None or not self._rebuilding)
+            if rebuild:
+                self._rebuilding = True
+                started_at = self._sequence
+                dirty = {}
+            else:
+                dirty, self._dirty = self._dirty, {}
+
+        if rebuild:
+            try:
+                postings, documents = {}, {}
+                for item_id, name, description, price in self._documents_query(db).yield_per(5000):
+                    self._add(postings, documents, item_id, self._document(name, description, price))
+            except BaseException:
+                with self._lock:
+                    self._rebuilding = False
+                raise
+            with self._lock:
+                self._postings, self._documents = postings, documents
+                # Items written after the rebuild started may be stale in it
+                self._dirty = {item_id: mark for item_id, mark in self._marked.items() if mark > started_at}
+                self._marked = dict(self._dirty)
+                self._applied = {}
+                self._built_at = time.monotonic()
+                self._rebuilding = False
+        elif dirty:
+            rows = self._documents_query(db).filter(ItemRecord.item_id.in_(dirty))
+            fetched = {
+                item_id: self._document(name, description, price)
+                for item_id, name, description, price in rows
+            }
+            with self._lock:
+                for item_id, mark in dirty.items():
+                    # A search that re-read a later mark of this item got there first
+                    if self._applied.get(item_id, 0) >= mark:
+                        continue
+                    self._applied[item_id] = mark
+                    self._remove(item_id)
+                    if item_id in fetched:
+                        self._add(self._postings, self._documents, item_id, fetched[item_id])
+
+    def search(
+        self,
+        db: Session,
+        term: str,
+        limit: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> Optional[Dict[str, float]]:
+        """
+        Return {item_id: score} for the items priced within [min_price,
+        max_price] whose name or description contains term, or None when more
+        than limit items match. Name matches outrank description matches, and
+        a name starting with the term ranks highest.
+        """
+        term = term.lower()
+        self._refresh(db)
+        with self._lock:
+            if term:
+                candidates = set.intersection(*[self._postings.get(gram, set()) for gram in _term_grams(term)])
+            else:
+                candidates = set(self._documents)
+
+            scores = {}
+            for item_id in candidates:
+                name, description, price = self._documents[item_id]
+                if min_price is not None and price < min_price:
+                    continue
+                if max_price is not None and price > max_price:
+                    continue
+                score = _score(term, name, description)
+                if score:
+                    scores[item_id] = score
+                    if len(scores) > limit:
+                        return None
+        return scores
+
+
+item_search_index = InvertedIndex(ttl_seconds=settings.ITEM_SEARCH_INDEX_TTL_SECONDS)
+
+
+class ItemSearch:
+    """
+    Applies a search term to an item query using the configured engine:
+    PostgreSQL full-text + trigram indexes, the in-process inverted index,
+    or the legacy unindexed ILIKE scan.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.mode = settings.ITEM_SEARCH_MODE
+        if self.mode == "auto":
+            self.mode = "fulltext" if db.get_bind().dialect.name == "postgresql" else "inverted"
+
+    def apply(
+        self,
+        query: Query,
+        term: str,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> Tuple[Query, Optional[ColumnElement]]:
+        """
+        Filter query to items matching term. Returns the filtered query and a
+        relevance expression to order by (None in ilike mode). The price
+        bounds only narrow the inverted index lookup; callers still filter
+        the query on price.
+        """
+        if self.mode == "fulltext":
+            return self._apply_fulltext(query, term)
+        if self.mode == "inverted":
+            return self._apply_inverted(query, term, min_price, max_price)
+        return query.filter(
+            or_(
+                ItemRecord.item_name.ilike(f"%{term}%"),
+                ItemRecord.item_description.ilike(f"%{term}%")
+            )
+        ), None
+
+    def _apply_fulltext(self, query: Query, term: str) -> Tuple[Query, ColumnElement]:
+        # search_vector is a generated column (see the item-search-02 changeset)
+        search_vector = literal_column("item.search_vector")
+        ts_query = func.websearch_to_tsquery("simple", term)
+        query = query.filter(
+            or_(
+                search_vector.op("@@")(ts_query),
+                ItemRecord.item_name.ilike(f"%{term}%"),
+                ItemRecord.item_description.ilike(f"%{term}%")
+            )
+        )
+        rank = (
+            func.ts_rank_cd(search_vector, ts_query, type_=Float)
+            + func.similarity(ItemRecord.item_name, term, type_=Float)
+        )
+        return query, rank
+
+    def _apply_inverted(
+        self,
+        query: Query,
+        term: str,
+        min_price: Optional[float],
+        max_price: Optional[float]
+    ) -> Tuple[Query, ColumnElement]:
+        scores = item_search_index.search(
+            self.db, term, settings.ITEM_SEARCH_MAX_CANDIDATES, min_price=min_price, max_price=max_price
+        )
+        if scores is None:
+            # Too many matches for an IN list: scan with the same predicate
+            # and ranking, so paging, counts and filters see every match
+            return self._apply_scan(query, term)
+        if not scores:
+            return query.filter(literal(False)), literal(0.0, Float)
+        rank = case(scores, value=ItemRecord.item_id, else_=literal(0.0, Float))
+        return query.filter(ItemRecord.item_id.in_(scores.keys())), rank
+
+    def _apply_scan(self, query: Query, term: str) -> Tuple[Query, ColumnElement]:
+        term = term.lower()
+        name = func.lower(ItemRecord.item_name)
+        description = func.lower(func.coalesce(ItemRecord.item_description, ""))
+        in_name = name.contains(term, autoescape=True)
+        in_description = description.contains(term, autoescape=True)
+        rank = (
+            case(
+                (name.startswith(term, autoescape=True), 3.0),
+                (in_name, 2.0),
+                else_=0.0
+            )
+            + case((in_description, 1.0), else_=0.0)
+        )
+        return query.filter(or_(in_name, in_description)), rank
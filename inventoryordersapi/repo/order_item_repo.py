@@ -1,6 +1,11 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from inventoryordersapi.model.order_item_record import OrderItemRecord
+from inventoryordersapi.model.item_record import ItemRecord
 from inventoryordersapi.domain.order_item import OrderItemRead
+from inventoryordersapi.utils.ids import new_id
 
 class OrderItemRepo:
     def __init__(self, db: Session):
@@ -10,26 +15,15 @@ class OrderItemRepo:
         """Convert OrderItemRecord (SQLAlchemy) to OrderItemRead (Pydantic)"""
         if not record:
             return None
-        
-        from inventoryordersapi.domain.item import ItemRead
-        
+
         return OrderItemRead(
             order_item_id=str(record.order_item_id),
             item_id=str(record.item_id),
             quantity=record.quantity,
             price=record.price,
-            created_at=record.created_at if hasattr(record, 'created_at') else None,
-            updated_at=record.updated_at if hasattr(record, 'updated_at') else None,
-            item=ItemRead(
-                item_id=str(record.item.item_id),
-                item_name=record.item.item_name,
-                item_description=record.item.item_description,
-                item_price=record.item.item_price,
-                item_quantity=record.item.item_quantity,
-                is_active=record.item.is_active,
-                created_at=record.item.created_at,
-                updated_at=record.item.updated_at
-            ) if record.item else None
+            item_name=record.item.item_name if record.item else None,
+            created_at=record.created_at,
+            updated_at=record.updated_at
         )
 
     def create(self, order_item: OrderItemRecord) -> OrderItemRead:
@@ -38,6 +32,45 @@ class OrderItemRepo:
         self.db.refresh(order_item)
         return self._record_to_order_item(order_item)
 
+    def bulk_create(self, lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert order lines (of one or many orders) with one multi-row INSERT.
+        Does not commit; returns the inserted rows.
+        """
+        rows = [
+            {
+                "order_item_id": new_id(),
+                "order_id": line["order_id"],
+                "item_id": line["item_id"],
+                "quantity": line["quantity"],
+                "price": line["price"]
+            }
+            for line in lines
+        ]
+        if rows:
+            self.db.execute(insert(OrderItemRecord.__table__), rows)
+        return rows
+
+    def lines_for_orders(self, order_ids: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Plain line rows (with item names) for a batch of orders, grouped by order_id."""
+        statement = (
+            select(
+                OrderItemRecord.order_id,
+                OrderItemRecord.item_id,
+                ItemRecord.item_name,
+                OrderItemRecord.quantity,
+                OrderItemRecord.price
+            )
+            .outerjoin(ItemRecord, ItemRecord.item_id == OrderItemRecord.item_id)
+            .where(OrderItemRecord.order_id.in_(list(order_ids)))
+            .order_by(OrderItemRecord.order_id, OrderItemRecord.created_at)
+        )
+        lines = defaultdict(list)
+        for row in self.db.execute(statement).mappings():
+            line = dict(row)
+            lines[line.pop("order_id")].append(line)
+        return lines
+
     def delete(self, db_order_item: OrderItemRecord):
         self.db.delete(db_order_item)
         self.db.commit()
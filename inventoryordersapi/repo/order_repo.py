@@ -1,52 +1,54 @@
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from inventoryordersapi.model.order_record import OrderRecord
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload
+from inventoryordersapi.model.order_record import OrderRecord, OrderStatus
 from inventoryordersapi.model.order_item_record import OrderItemRecord
+from inventoryordersapi.model.item_record import ItemRecord
 from inventoryordersapi.domain.order import OrderRead
 from inventoryordersapi.domain.order_item import OrderItemRead
 from inventoryordersapi.utils.pagination import paginate_query
-from inventoryordersapi.domain.item import ItemRead
+from inventoryordersapi.repo.item_repo import ItemRepo
+from inventoryordersapi.utils.ids import parse_id
 
 class OrderRepo:
     def __init__(self, db: Session):
         self.db = db
+        self.item_repo = ItemRepo(db)
 
-    def _record_to_order_item(self, record: OrderItemRecord) -> OrderItemRead:
+    def _record_to_order_item(self, record: OrderItemRecord, item_names: Dict[str, str] | None = None) -> OrderItemRead:
         """Convert OrderItemRecord to OrderItemRead"""
         if not record:
             return None
-        
+        if item_names is None:
+            item_names = self._item_names([record])
 
-        
         return OrderItemRead(
             order_item_id=str(record.order_item_id),
             item_id=str(record.item_id),
             quantity=record.quantity,
             price=record.price,
-            created_at=record.created_at if hasattr(record, 'created_at') else None,
-            updated_at=record.updated_at if hasattr(record, 'updated_at') else None,
-            item=ItemRead(
-                item_id=str(record.item.item_id),
-                item_name=record.item.item_name,
-                item_description=record.item.item_description,
-                item_price=record.item.item_price,
-                item_quantity=record.item.item_quantity,
-                is_active=record.item.is_active,
-                created_at=record.item.created_at,
-                updated_at=record.item.updated_at
-            ) if record.item else None
+            item_name=item_names.get(record.item_id),
+            created_at=record.created_at,
+            updated_at=record.updated_at
         )
 
-    def _record_to_order_read(self, record: OrderRecord) -> OrderRead:
+    def _item_names(self, lines: List[OrderItemRecord]) -> Dict[str, str]:
+        """Resolve line item names through the item cache, one query for misses."""
+        items = self.item_repo.get_many(line.item_id for line in lines)
+        return {item_id: item.item_name for item_id, item in items.items()}
+
+    def _record_to_order_read(self, record: OrderRecord, item_names: Dict[str, str] | None = None) -> OrderRead:
         if not record:
             return None
-    
+        if item_names is None:
+            item_names = self._item_names(record.order_items)
+
         order_items = [
-            self._record_to_order_item(item)
+            self._record_to_order_item(item, item_names)
             for item in record.order_items
         ] if record.order_items else []
-    
+
         return OrderRead(
             order_id=str(record.order_id),
             customer_name=record.customer_name,
@@ -58,20 +60,110 @@ class OrderRepo:
             updated_at=record.updated_at
         )
     
+    @staticmethod
+    def _record_to_order_view(record: OrderRecord, item_names: Dict[str, str]) -> Dict[str, Any]:
+        """The API shape of an order, built straight from the rows."""
+        return {
+            "id": record.order_id,
+            "customer_name": record.customer_name,
+            "status": record.status.value if record.status else "pending",
+            "total_amount": record.total_amount,
+            "created_at": record.created_at.isoformat(),
+            "items": [
+                {
+                    "item_id": line.item_id,
+                    "name": item_names.get(line.item_id) or "Unknown",
+                    "unit_price": line.price,
+                    "quantity": line.quantity,
+                    "line_total": line.price * line.quantity
+                }
+                for line in record.order_items
+            ]
+        }
+
+    def to_order_views(self, records: List[OrderRecord]) -> List[Dict[str, Any]]:
+        """API-shaped order dicts for response bodies, skipping the OrderRead models."""
+        item_names = self._item_names([line for record in records for line in record.order_items])
+        return [self._record_to_order_view(record, item_names) for record in records]
+
+    @staticmethod
+    def _version(
+        order_id: str, updated_at: datetime, status: Any, item_ids: Iterable[str], item_names: Dict[str, str]
+    ) -> str:
+        # status guards against coarse updated_at clocks; line item names live on the item rows
+        names = sorted({f"{item_id}={item_names.get(item_id) or 'Unknown'}" for item_id in item_ids})
+        status = getattr(status, "value", status)
+        return f"{order_id}/{updated_at.isoformat() if updated_at else ''}/{status}/{','.join(names)}"
+
+    def get_view(self, order_id: str) -> Tuple[Dict[str, Any] | None, str | None]:
+        """The API-shaped order and its version (see get_version), or (None, None)."""
+        if parse_id(order_id) is None:
+            return None, None
+        record = self.query_with_items().filter(OrderRecord.order_id == order_id).first()
+        if record is None:
+            return None, None
+        # Not the per-process item cache: a rename committed by another worker
+        # must change the version, or revalidation keeps answering 304
+        item_ids = {line.item_id for line in record.order_items}
+        item_names = dict(self.db.execute(
+            select(ItemRecord.item_id, ItemRecord.item_name).where(ItemRecord.item_id.in_(item_ids))
+        ).all()) if item_ids else {}
+        version = self._version(
+            record.order_id, record.updated_at, record.status,
+            (line.item_id for line in record.order_items), item_names
+        )
+        return self._record_to_order_view(record, item_names), version
+
+    def get_version(self, order_id: str) -> str | None:
+        """
+        The order's version for ETags without loading it: one query for
+        updated_at, status and the line item ids and names. None if the order
+        does not exist.
+        """
+        if parse_id(order_id) is None:
+            return None
+        rows = self.db.execute(
+            select(OrderRecord.updated_at, OrderRecord.status, OrderItemRecord.item_id, ItemRecord.item_name)
+            .outerjoin(OrderItemRecord, OrderItemRecord.order_id == OrderRecord.order_id)
+            .outerjoin(ItemRecord, ItemRecord.item_id == OrderItemRecord.item_id)
+            .where(OrderRecord.order_id == order_id)
+        ).all()
+        if not rows:
+            return None
+        item_ids = [row.item_id for row in rows if row.item_id is not None]
+        item_names = {row.item_id: row.item_name for row in rows if row.item_name is not None}
+        return self._version(parse_id(order_id), rows[0].updated_at, rows[0].status, item_ids, item_names)
+
     def get_for_update(self, order_id: str) -> OrderRecord | None:
         """
         Fetch an OrderRecord by ID with a FOR UPDATE lock (transactional lock).
         Returns the SQLAlchemy model, not Pydantic.
         """
+        if parse_id(order_id) is None:
+            return None
         return self.db.query(OrderRecord).filter(OrderRecord.order_id == order_id).with_for_update().first()
 
 
+    def query_with_items(self):
+        """
+        Base query for order read paths. Lines are loaded for the whole result
+        in one extra SELECT ... IN query instead of lazily per order; item
+        names come from the item cache (see to_order_views).
+        """
+        return self.db.query(OrderRecord).options(selectinload(OrderRecord.order_items))
+
+    def to_order_reads(self, records: List[OrderRecord]) -> List[OrderRead]:
+        item_names = self._item_names([line for record in records for line in record.order_items])
+        return [self._record_to_order_read(record, item_names) for record in records]
+
     def get(self, order_id: str) -> OrderRead:
-        record = self.db.query(OrderRecord).filter(OrderRecord.order_id == order_id).first()
+        if parse_id(order_id) is None:
+            return None
+        record = self.query_with_items().filter(OrderRecord.order_id == order_id).first()
         return self._record_to_order_read(record)
 
     def list_orders(self, skip: int = 0, limit: int = 100):
-        query = self.db.query(OrderRecord)
+        query = self.query_with_items()
         records, pagination = paginate_query(query, limit=limit, offset=skip)
         orders = [self._record_to_order_read(record) for record in records]
         return orders, pagination
@@ -107,3 +199,21 @@ class OrderRepo:
             self.db.rollback()
             raise e
 
+    def bulk_create(self, orders: List[Dict[str, Any]]) -> None:
+        """
+        Insert many pending orders with one multi-row INSERT.
+        Each dict must carry its own order_id; does not commit.
+        """
+        if not orders:
+            return
+        rows = [
+            {
+                "order_id": order["order_id"],
+                "customer_name": order["customer_name"],
+                "customer_email": order["customer_email"],
+                "total_amount": order["total_amount"],
+                "status": OrderStatus.pending
+            }
+            for order in orders
+        ]
+        self.db.execute(insert(OrderRecord.__table__), rows)
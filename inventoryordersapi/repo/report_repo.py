@@ -0,0 +1,191 @@
+import datetime
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import Row, String, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from inventoryordersapi.model.item_record import ItemRecord
+from inventoryordersapi.model.order_item_record import OrderItemRecord
+from inventoryordersapi.model.order_record import OrderRecord
+from inventoryordersapi.model.sales_daily_item_record import SalesDailyItemRecord
+from inventoryordersapi.model.sales_daily_status_record import SalesDailyStatusRecord
+
+# Statuses whose orders count as sales
+SOLD_STATUSES = ("pending", "confirmed")
+
+
+class ReportRepo:
+    """
+    Sales rollups keyed by order day. Writes are increments applied in the
+    caller's transaction (no commit), so the rollups always match the orders
+    they were committed with. Day is the order's created_at date; new orders
+    use CURRENT_DATE, which matches created_at's server now().
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _add(self, table, key_columns: Tuple[str, ...], rows: List[Dict[str, Any]]) -> None:
+        """Add rows' values onto existing rollup rows with one INSERT ... ON CONFLICT DO UPDATE."""
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            raise NotImplementedError(f"Sales rollups are not supported on {dialect}")
+
+        # Same key order in every transaction, so concurrent orders cannot deadlock on rollup rows
+        rows = sorted(rows, key=lambda row: tuple(str(row[column]) for column in key_columns))
+        statement = upsert(table).values(rows)
+        value_columns = [column for column in rows[0] if column not in key_columns]
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: table.c[column] + statement.excluded[column] for column in value_columns}
+        )
+        self.db.execute(statement)
+
+    def add_item_sales(self, day: Any, lines: Iterable[Dict[str, Any]], sign: int = 1) -> None:
+        """Add (or with sign=-1 remove) order lines' units and revenue on day."""
+        totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        for line in lines:
+            total = totals[line["item_id"]]
+            total[0] += line["quantity"]
+            total[1] += line["quantity"] * line["price"]
+        self._add(
+            SalesDailyItemRecord.__table__,
+            ("day", "item_id"),
+            [
+                {"day": day, "item_id": item_id, "units": sign * units, "revenue": sign * revenue}
+                for item_id, (units, revenue) in totals.items()
+            ]
+        )
+
+    def add_status_counts(self, day: Any, counts: Dict[str, Tuple[int, float]]) -> None:
+        """Add (order count, amount) per status on day; negative values move orders out."""
+        self._add(
+            SalesDailyStatusRecord.__table__,
+            ("day", "status"),
+            [
+                {"day": day, "status": status, "order_count": count, "amount": amount}
+                for status, (count, amount) in counts.items()
+            ]
+        )
+
+    def record_orders_placed(self, order_count: int, amount: float, lines: List[Dict[str, Any]]) -> None:
+        """Roll up newly placed pending orders: their count, summed total_amount and all their lines."""
+        if not order_count:
+            return
+        today = func.current_date()
+        self.add_item_sales(today, lines)
+        self.add_status_counts(today, {"pending": (order_count, amount)})
+
+    def record_order_canceled(self, order: OrderRecord, previous_status: str) -> None:
+        day = order.created_at.date()
+        self.add_item_sales(
+            day,
+            ({"item_id": line.item_id, "quantity": line.quantity, "price": line.price} for line in order.order_items),
+            sign=-1
+        )
+        self.add_status_counts(day, {
+            previous_status: (-1, -order.total_amount),
+            "canceled": (1, order.total_amount)
+        })
+
+    def rebuild(self, from_date: datetime.date | None = None, to_date: datetime.date | None = None) -> Tuple[int, int]:
+        """
+        Recompute the rollups for [from_date, to_date] (all days by default)
+        from order and order_item with two INSERT ... SELECT ... GROUP BY.
+        Returns the (item, status) rollup rows written. Does not commit.
+        """
+        item_table = SalesDailyItemRecord.__table__
+        status_table = SalesDailyStatusRecord.__table__
+        order_day = func.date(OrderRecord.created_at)
+        # status may be a native enum (create_all on PostgreSQL); the rollup column is VARCHAR
+        order_status = cast(OrderRecord.status, String(20))
+
+        order_range = []
+        if from_date is not None:
+            order_range.append(OrderRecord.created_at >= datetime.datetime.combine(from_date, datetime.time.min))
+        if to_date is not None:
+            order_range.append(
+                OrderRecord.created_at < datetime.datetime.combine(to_date + datetime.timedelta(days=1), datetime.time.min)
+            )
+
+        for table in (item_table, status_table):
+            clear = delete(table)
+            if from_date is not None:
+                clear = clear.where(table.c.day >= from_date)
+            if to_date is not None:
+                clear = clear.where(table.c.day <= to_date)
+            self.db.execute(clear)
+
+        items = self.db.execute(insert(item_table).from_select(
+            ["day", "item_id", "units", "revenue"],
+            select(
+                order_day,
+                OrderItemRecord.item_id,
+                func.sum(OrderItemRecord.quantity),
+                func.sum(OrderItemRecord.quantity * OrderItemRecord.price)
+            )
+            .join(OrderRecord, OrderRecord.order_id == OrderItemRecord.order_id)
+            .where(OrderRecord.status.in_(SOLD_STATUSES), *order_range)
+            .group_by(order_day, OrderItemRecord.item_id)
+        )).rowcount
+        statuses = self.db.execute(insert(status_table).from_select(
+            ["day", "status", "order_count", "amount"],
+            select(order_day, order_status, func.count(), func.sum(OrderRecord.total_amount))
+            .where(*order_range)
+            .group_by(order_day, order_status)
+        )).rowcount
+        return items, statuses
+
+    def daily_sales(self, from_date: datetime.date, to_date: datetime.date) -> List[Dict[str, Any]]:
+        """Per day: orders and amount of sold (not canceled) orders, plus units."""
+        status_table = SalesDailyStatusRecord.__table__
+        item_table = SalesDailyItemRecord.__table__
+        days: Dict[datetime.date, Dict[str, Any]] = {}
+        for row in self.db.execute(
+            select(status_table.c.day, func.sum(status_table.c.order_count), func.sum(status_table.c.amount))
+            .where(status_table.c.day.between(from_date, to_date), status_table.c.status.in_(SOLD_STATUSES))
+            .group_by(status_table.c.day)
+        ):
+            days[row[0]] = {"day": row[0], "orders": row[1], "revenue": row[2], "units": 0}
+        for row in self.db.execute(
+            select(item_table.c.day, func.sum(item_table.c.units))
+            .where(item_table.c.day.between(from_date, to_date))
+            .group_by(item_table.c.day)
+        ):
+            days.setdefault(row[0], {"day": row[0], "orders": 0, "revenue": 0.0, "units": 0})["units"] = row[1]
+        return [days[day] for day in sorted(days)]
+
+    def item_sales(self, from_date: datetime.date, to_date: datetime.date, limit: int) -> List[Row]:
+        """Best-selling items by revenue over the range."""
+        item_table = SalesDailyItemRecord.__table__
+        units = func.sum(item_table.c.units).label("units")
+        revenue = func.sum(item_table.c.revenue).label("revenue")
+        return self.db.execute(
+            select(item_table.c.item_id, ItemRecord.item_name, units, revenue)
+            .outerjoin(ItemRecord, ItemRecord.item_id == item_table.c.item_id)
+            .where(item_table.c.day.between(from_date, to_date))
+            .group_by(item_table.c.item_id, ItemRecord.item_name)
+            .having(units != 0)
+            .order_by(revenue.desc(), item_table.c.item_id)
+            .limit(limit)
+        ).all()
+
+    def status_totals(self, from_date: datetime.date, to_date: datetime.date) -> List[Row]:
+        status_table = SalesDailyStatusRecord.__table__
+        return self.db.execute(
+            select(
+                status_table.c.status,
+                func.sum(status_table.c.order_count).label("orders"),
+                func.sum(status_table.c.amount).label("amount")
+            )
+            .where(status_table.c.day.between(from_date, to_date))
+            .group_by(status_table.c.status)
+            .order_by(status_table.c.status)
+        ).all()
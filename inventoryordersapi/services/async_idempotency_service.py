@@ -0,0 +1,31 @@
+from typing import Any, Awaitable, Callable, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from inventoryordersapi.services.idempotency_service import IdempotencyService
+
+
+class AsyncIdempotencyService:
+    """
+    Async counterpart of IdempotencyService for the AsyncSession routes. Key
+    queries run through AsyncSession.run_sync on the same session as the
+    operation, so the key is marked committed by the operation's own commit.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.service = IdempotencyService(db.sync_session)
+
+    @property
+    def held_key(self) -> Tuple[str, str] | None:
+        return self.service.held_key
+
+    async def _run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await self.db.run_sync(lambda session: fn(*args))
+
+    async def run(
+        self,
+        scope: str,
+        key: str | None,
+        request_hash: str | None,
+        handler: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        return await self.service.run_async(scope, key, request_hash, handler, offload=self._run_sync)
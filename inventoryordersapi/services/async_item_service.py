@@ -0,0 +1,37 @@
+from typing import Any, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from inventoryordersapi.domain.common import Pagination
+from inventoryordersapi.domain.item import Item
+from inventoryordersapi.services.item_service import ItemService
+
+
+class AsyncItemService:
+    """
+    Async counterpart of ItemService. Each call runs the sync service and
+    repo code through AsyncSession.run_sync, so the queries go over the async
+    driver without blocking the event loop or occupying a threadpool worker.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_item(self, item_id: str) -> Item:
+        return await self.db.run_sync(lambda session: ItemService(session).get_item(item_id))
+
+    async def get_item_if_changed(self, item_id: str, if_none_match: str | None = None) -> Tuple[Item | None, str | None]:
+        return await self.db.run_sync(lambda session: ItemService(session).get_item_if_changed(item_id, if_none_match))
+
+    async def listing_etag(self, *params: Any) -> str:
+        return await self.db.run_sync(lambda session: ItemService(session).listing_etag(*params))
+
+    async def list_items(self, **filters: Any) -> Tuple[list, Pagination]:
+        return await self.db.run_sync(lambda session: ItemService(session).list_items(**filters))
+
+    async def create_item(self, item: Item) -> Item:
+        return await self.db.run_sync(lambda session: ItemService(session).create_item(item))
+
+    async def update_item(self, item_id: str, item: Item) -> Item:
+        return await self.db.run_sync(lambda session: ItemService(session).update_item(item_id, item))
+
+    async def delete_item(self, item_id: str) -> Item:
+        return await self.db.run_sync(lambda session: ItemService(session).delete_item(item_id))
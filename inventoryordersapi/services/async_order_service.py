@@ -0,0 +1,30 @@
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from inventoryordersapi.domain.common import Pagination
+from inventoryordersapi.domain.order_req_res import CreateOrderRequest, CreateOrderResponse, GetOrderResponse
+from inventoryordersapi.services.order_service import OrderService
+
+
+class AsyncOrderService:
+    """
+    Async counterpart of OrderService, running the sync service and repo
+    code through AsyncSession.run_sync (see AsyncItemService).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_order(
+        self, order_id: str, if_none_match: str | None = None
+    ) -> Tuple[GetOrderResponse, Dict[str, Any] | None, str | None]:
+        """Return the lookup result with the formatted order and its ETag (see OrderService.get_order_view)."""
+        return await self.db.run_sync(lambda session: OrderService(session).get_order_view(order_id, if_none_match))
+
+    async def list_orders(self, **filters: Any) -> Tuple[List[Dict[str, Any]], Pagination]:
+        return await self.db.run_sync(lambda session: OrderService(session).list_orders(**filters))
+
+    async def create_order(self, request: CreateOrderRequest) -> CreateOrderResponse:
+        return await self.db.run_sync(lambda session: OrderService(session).create_order(request))
+
+    async def cancel_order(self, order_id: str) -> bool:
+        return await self.db.run_sync(lambda session: OrderService(session).cancel_order(order_id))
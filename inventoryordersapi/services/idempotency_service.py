@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, Tuple
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.repo.idempotency_repo import IdempotencyRepo, guard_idempotency_key, unguard_idempotency_key
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: Any
+
+    def to_response(self) -> JSONResponse:
+        return JSONResponse(self.body, status_code=self.status_code, headers={"Idempotent-Replayed": "true"})
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a request payload, to catch a key reused for a different request."""
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _poll_delays() -> Iterator[float]:
+    """Backoff between claim attempts; raises 409 once IDEMPOTENCY_WAIT_SECONDS have passed."""
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    delay = 0.01
+    while time.monotonic() < deadline:
+        yield delay
+        delay = min(delay * 2, 0.2)
+    raise HTTPException(
+        status_code=409,
+        detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress"
+    )
+
+
+class IdempotencyService:
+    """
+    Runs an operation at most once per (scope, Idempotency-Key). The first
+    request claims the key and stores its outcome; later requests get the
+    stored response without repeating the work, and duplicates that arrive
+    while the first is still running wait for it. Every commit the operation
+    makes on this session also marks the key committed, in that commit's
+    transaction; from then on the key is never released.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = IdempotencyRepo(db)
+        # (scope, key) while the operation runs, for work committed on another session (order batcher)
+        self.held_key: Tuple[str, str] | None = None
+        self._lease_renewed_at = 0.0
+
+    def try_claim(self, scope: str, key: str, request_hash: str | None) -> Tuple[bool, StoredResponse | None]:
+        """
+        One claim attempt: (True, None) if the caller now holds the key,
+        (False, response) for a stored response to replay, (False, None)
+        while another request still holds it.
+        """
+        if self.repo.claim(scope, key, request_hash, settings.IDEMPOTENCY_LEASE_SECONDS):
+            return True, None
+        # None: the holder released the key in between, so the next attempt claims it
+        record = self.repo.get(scope, key)
+        if record is None:
+            return False, None
+        if record.request_hash and request_hash and record.request_hash != request_hash:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+            )
+        if record.status == "completed":
+            return False, StoredResponse(record.response_status, json.loads(record.response_body))
+        return False, None
+
+    def begin(self, scope: str, key: str, request_hash: str | None) -> StoredResponse | None:
+        """
+        Claim the key. Returns None when the caller should run the operation,
+        or the stored response of an earlier request with the same key.
+        """
+        delays = _poll_delays()
+        while True:
+            claimed, stored = self.try_claim(scope, key, request_hash)
+            if claimed or stored is not None:
+                return stored
+            time.sleep(next(delays))
+
+    def hold(self, scope: str, key: str) -> None:
+        """Start the operation under a claimed key."""
+        self.held_key = (scope, key)
+        self._lease_renewed_at = time.monotonic()
+        guard_idempotency_key(self.db, scope, key)
+
+    def lease_expiring(self) -> bool:
+        """True once a third of the held key's lease has passed since it was taken or renewed."""
+        return (
+            self.held_key is not None
+            and time.monotonic() - self._lease_renewed_at >= settings.IDEMPOTENCY_LEASE_SECONDS / 3
+        )
+
+    def renew_lease(self) -> None:
+        """Keep the key from being taken over while a long request (bulk) is still running."""
+        if self.lease_expiring():
+            self.repo.extend_lease(*self.held_key, settings.IDEMPOTENCY_LEASE_SECONDS)
+            self._lease_renewed_at = time.monotonic()
+
+    def finish(self, scope: str, key: str, result: Any = None, error: Exception | None = None) -> None:
+        """
+        Store the outcome of the operation. Successes and client errors are
+        replayed. A server error releases the key so the request can be
+        retried, unless some of the work already committed: then the error
+        is stored instead, so a retry cannot apply that work twice.
+        """
+        unguard_idempotency_key(self.db, scope, key)
+        self.held_key = None
+        if isinstance(error, HTTPException) and error.status_code < 500:
+            status_code, body = error.status_code, {"detail": error.detail}
+        elif error is not None:
+            self.db.rollback()
+            if self.repo.release(scope, key):
+                return
+            status_code, body = 500, {
+                "detail": f"The request failed after part of it was applied; it is not repeated for this {IDEMPOTENCY_HEADER}"
+            }
+        else:
+            status_code, body = 200, result
+        self.repo.complete(
+            scope, key, status_code, json.dumps(jsonable_encoder(body)), settings.IDEMPOTENCY_TTL_SECONDS
+        )
+
+    def run(self, scope: str, key: str | None, payload: Any, handler: Callable[[], Any]) -> Any:
+        """Run handler once per key; without a key it simply runs."""
+        if not key:
+            return handler()
+        stored = self.begin(scope, key, fingerprint(payload))
+        if stored is not None:
+            return stored.to_response()
+        self.hold(scope, key)
+        try:
+            result = handler()
+        except Exception as e:
+            self.finish(scope, key, error=e)
+            raise
+        self.finish(scope, key, result=result)
+        return result
+
+    async def run_async(
+        self,
+        scope: str,
+        key: str | None,
+        request_hash: str | None,
+        handler: Callable[[], Awaitable[Any]],
+        offload: Callable[..., Awaitable[Any]] = run_in_threadpool
+    ) -> Any:
+        """
+        run() for async handlers. Each key query goes through offload (the
+        threadpool by default) and duplicates wait with asyncio.sleep, so a
+        waiting request holds neither a worker thread nor a connection.
+        """
+        if not key:
+            return await handler()
+        delays = _poll_delays()
+        while True:
+            claimed, stored = await offload(self.try_claim, scope, key, request_hash)
+            if claimed or stored is not None:
+                break
+            await asyncio.sleep(next(delays))
+        if stored is not None:
+            return stored.to_response()
+        self.hold(scope, key)
+        try:
+            result = await handler()
+        except Exception as e:
+            await offload(self.finish, scope, key, None, e)
+            raise
+        await offload(self.finish, scope, key, result)
+        return result
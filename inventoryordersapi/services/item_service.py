@@ -1,11 +1,25 @@
+from typing import Any, Dict, TextIO, Tuple
 from fastapi import HTTPException
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from inventoryordersapi.repo.item_repo import ItemRepo
+from inventoryordersapi.repo.item_repo import DuplicateItemNameError, ItemRepo
+from inventoryordersapi.repo.item_search import ItemSearch, item_search_index
 from inventoryordersapi.domain.item import Item
-from inventoryordersapi.utils.pagination import paginate_query
+from inventoryordersapi.domain.item_req_res import ItemImportRow, ItemImportError, ItemImportResponse
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.utils.etag import etag_matches, make_etag
+from inventoryordersapi.utils.ids import parse_id
+from inventoryordersapi.utils.item_import import iter_import_rows
+from inventoryordersapi.utils.pagination import CountStrategy, paginate_query, paginate_keyset
 from inventoryordersapi.model.item_record import ItemRecord
 
+# Only the first rejections are echoed back; the counters stay exact
+MAX_REPORTED_IMPORT_ERRORS = 100
+
+# Stable listing order; item_id breaks ties between equal names
+ITEM_SORT_COLUMNS = (ItemRecord.item_name, ItemRecord.item_id)
+
 class ItemService:
     def __init__(self, db: Session):
         self.repo = ItemRepo(db)
@@ -13,26 +27,50 @@ class ItemService:
     def get_item(self, item_id: str):
         return self.repo.get(item_id)
 
+    def get_item_if_changed(self, item_id: str, if_none_match: str | None = None) -> Tuple[Item | None, str | None]:
+        """
+        (item, etag). When if_none_match already matches the version in the
+        database the item is neither loaded nor built: (None, etag). Unknown
+        items give (None, None).
+        """
+        if if_none_match:
+            version = self.repo.get_version(item_id)
+            if version is None:
+                return None, None
+            etag = make_etag(version)
+            if etag_matches(if_none_match, etag):
+                return None, etag
+        item = self.repo.get(item_id)
+        if item is None:
+            return None, None
+        return item, make_etag(item._version)
+
+    def listing_etag(self, *params: Any) -> str:
+        """
+        ETag of an item listing page: the item table version plus the listing
+        parameters. Read it before the page, so a write committed in between
+        can only make the ETag older than the page, never newer.
+        """
+        return make_etag(self.repo.listing_version(), *params)
+
     def list_items(
         self,
         search: str | None,
         min_price: float | None,
         max_price: float | None,
-        page: int,
-        page_size: int
+        page: int | None,
+        page_size: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None
     ):
         query = self.repo.db.query(ItemRecord).filter(
             ItemRecord.is_active == True
         )
 
-        #  Search filter
+        #  Search filter; ranked matches are listed by relevance
+        search_rank = None
         if search:
-            query = query.filter(
-                or_(
-                    ItemRecord.item_name.ilike(f"%{search}%"),
-                    ItemRecord.item_description.ilike(f"%{search}%")
-                )
-            )
+            query, search_rank = ItemSearch(self.repo.db).apply(query, search, min_price, max_price)
 
         #  Price filters
         if min_price is not None:
@@ -41,38 +79,88 @@ class ItemService:
         if max_price is not None:
             query = query.filter(ItemRecord.item_price <= max_price)
 
-        #  Pagination
-        offset = (page - 1) * page_size
-        records, pagination = paginate_query(
+        sort_columns = ITEM_SORT_COLUMNS
+        descending = False
+        row_key = None
+        if search_rank is not None:
+            query = query.add_columns(search_rank.label("search_rank"))
+            sort_columns = (search_rank, ItemRecord.item_id)
+            descending = True
+            row_key = lambda row: [row.search_rank, row[0].item_id]
+
+        #  Pagination: keyset by default, OFFSET only for legacy page requests
+        if page is not None and not cursor:
+            offset = (page - 1) * page_size
+            records, pagination = paginate_query(
+                query,
+                limit=page_size,
+                offset=offset,
+                page=page,
+                page_size=page_size,
+                count_strategy=count_strategy or CountStrategy.exact,
+                sort_columns=sort_columns,
+                descending=descending,
+                row_key=row_key
+            )
+        else:
+            records, pagination = paginate_keyset(
+                query,
+                sort_columns,
+                cursor=cursor,
+                page_size=page_size,
+                descending=descending,
+                count_strategy=count_strategy or CountStrategy.none,
+                row_key=row_key
+            )
+
+        if search_rank is not None:
+            records = [row[0] for row in records]
+
+        return self._item_rows(records), pagination
+
+    def list_low_stock(self, page_size: int, cursor: str | None = None):
+        """Active items below their low_stock_threshold, by name (keyset-paginated)."""
+        query, item = self.repo.low_stock_query()
+        records, pagination = paginate_keyset(
             query,
-            limit=page_size,
-            offset=offset,
-            page=page,
+            (item.item_name, item.item_id),
+            cursor=cursor,
             page_size=page_size
         )
+        return self._item_rows(records), pagination
 
-        #  Map + low_stock
-        items = [
+    def _item_rows(self, records):
+        #  Map + low_stock; sharded items report the sum of their shards
+        totals = self.repo.stock_totals(records)
+        return [
             {
-                **record.__dict__,
-                "low_stock": record.item_quantity < 5
+                "item_id": record.item_id,
+                "item_name": record.item_name,
+                "item_description": record.item_description,
+                "item_price": record.item_price,
+                "item_quantity": totals[record.item_id],
+                "is_active": record.is_active,
+                "low_stock_threshold": record.low_stock_threshold,
+                "low_stock": totals[record.item_id] < record.low_stock_threshold
             }
             for record in records
         ]
 
-        return items, pagination
-
     def create_item(self, item: Item):
-        # Check if an active item with the same name already exists
-        if self.repo.exists_active_name(item.item_name):
+        # Name uniqueness among active items is enforced by uq_item_active_name
+        try:
+            return self.repo.create(item)
+        except DuplicateItemNameError:
             raise HTTPException(
                 status_code=400,
                 detail="An active item with this name already exists"
             )
-
-        return self.repo.create(item)
     
     def update_item(self, item_id: str, item: Item):
+        item_id = parse_id(item_id)
+        if item_id is None:
+            return None
+
         # Fetch active item record
         db_item = self.repo.db.query(ItemRecord).filter(
             ItemRecord.item_id == item_id,
@@ -82,26 +170,85 @@ class ItemService:
         if not db_item:
             return None
 
-        #  Enforce name uniqueness among active items
-        if item.item_name:
-            if self.repo.exists_active_name(
-                item.item_name,
-                exclude_id=item_id
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Another active item with this name already exists"
-                )
-
-        return self.repo.update(db_item, item)
+        #  Name uniqueness among active items is enforced by uq_item_active_name
+        try:
+            return self.repo.update(db_item, item)
+        except DuplicateItemNameError:
+            raise HTTPException(
+                status_code=400,
+                detail="Another active item with this name already exists"
+            )
 
     
 
+    def set_stock_shards(self, item_id: str, shard_count: int):
+        """Shard, rebalance or unshard an active item's stock."""
+        db_item = self.repo.get_for_update(item_id)
+        if not db_item or not db_item.is_active:
+            return None
+        self.repo.reshard(db_item, shard_count)
+        self.repo.db.commit()
+        return self.repo.get(item_id)
+
     def delete_item(self, item_id: str):
         db_item = self.repo.get_for_update(item_id)
         if not db_item or not db_item.is_active:
             return None
         return self.repo.soft_delete(db_item)
 
-
-
+    def import_items(self, stream: TextIO, fmt: str = "csv", batch_size: int | None = None) -> ItemImportResponse:
+        """
+        Stream a CSV or JSONL catalog into the item table.
+        Rows are validated one at a time and upserted in batches keyed on
+        case-insensitive active name; each batch is committed on its own so
+        memory use is bounded by batch_size, not by the file size.
+        """
+        batch_size = batch_size or settings.ITEM_IMPORT_BATCH_SIZE
+        summary = ItemImportResponse(code=ErrorCode.SUCCESS, msg="Items imported successfully")
+        batch: Dict[str, Dict[str, Any]] = {}
+        batch_lines: Dict[str, int] = {}
+
+        for line, raw, error in iter_import_rows(stream, fmt):
+            if error:
+                self._reject_import_row(summary, line, error)
+                continue
+            try:
+                row = ItemImportRow.model_validate(raw)
+            except ValidationError as e:
+                self._reject_import_row(summary, line, e.errors()[0]["msg"])
+                continue
+
+            # Last occurrence of a name within a batch wins
+            key = row.item_name.lower()
+            batch[key] = row.model_dump()
+            batch_lines[key] = line
+
+            if len(batch) >= batch_size:
+                self._flush_import_batch(summary, batch, batch_lines)
+                batch, batch_lines = {}, {}
+
+        if batch:
+            self._flush_import_batch(summary, batch, batch_lines)
+        return summary
+
+    def _flush_import_batch(
+        self,
+        summary: ItemImportResponse,
+        batch: Dict[str, Dict[str, Any]],
+        batch_lines: Dict[str, int]
+    ) -> None:
+        try:
+            inserted, updated = self.repo.upsert_batch(list(batch.values()))
+            self.repo.db.commit()
+            item_search_index.mark_dirty(inserted + updated)
+            summary.inserted += len(inserted)
+            summary.updated += len(updated)
+        except Exception as e:
+            self.repo.db.rollback()
+            for line in batch_lines.values():
+                self._reject_import_row(summary, line, f"Batch failed: {e}")
+
+    def _reject_import_row(self, summary: ItemImportResponse, line: int, reason: str) -> None:
+        summary.rejected += 1
+        if len(summary.errors) < MAX_REPORTED_IMPORT_ERRORS:
+            summary.errors.append(ItemImportError(line=line, msg=reason))
@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from inventoryordersapi.core.database import SessionLocal
+from inventoryordersapi.core.metrics import record_order_rejected, record_orders_created
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.domain.order_req_res import CreateOrderRequest, CreateOrderResponse
+from inventoryordersapi.repo.idempotency_repo import guard_idempotency_key
+from inventoryordersapi.repo.item_repo import StockError
+from inventoryordersapi.services.order_service import OrderService
+
+
+@dataclass
+class _PendingOrder:
+    request: CreateOrderRequest
+    idempotency_key: Tuple[str, str] | None = None  # (scope, key) marked committed with the batch
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class OrderBatcher:
+    """
+    Group commit for order creation. Concurrent create_order calls are
+    queued for up to window_ms (or until max_size orders are waiting) and
+    applied by one background thread in a single transaction, each order in
+    its own savepoint so a stock failure only rolls back that order. Every
+    caller's future resolves once the shared commit is done.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        window_ms: float | None = None,
+        max_size: int | None = None
+    ):
+        self.session_factory = session_factory
+        self.window_ms = settings.ORDER_BATCH_WINDOW_MS if window_ms is None else window_ms
+        self.max_size = max_size or settings.ORDER_BATCH_MAX_SIZE
+        self._queue: "queue.Queue[_PendingOrder]" = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.orders = 0
+        self.failed_batches = 0
+        self.max_batch_size = 0
+        self.queue_delay_ms_total = 0.0
+        self.queue_delay_ms_max = 0.0
+
+    def submit(self, request: CreateOrderRequest, idempotency_key: Tuple[str, str] | None = None) -> Future:
+        """
+        Queue an order; the future resolves to its CreateOrderResponse. An
+        idempotency_key is marked committed in the batch's transaction.
+        """
+        self._ensure_worker()
+        pending = _PendingOrder(request, idempotency_key)
+        self._queue.put(pending)
+        return pending.future
+
+    def create_order(self, request: CreateOrderRequest, idempotency_key: Tuple[str, str] | None = None) -> CreateOrderResponse:
+        return self.submit(request, idempotency_key).result()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="order-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_ms / 1000
+            while len(batch) < self.max_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._apply(batch)
+            except Exception as e:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+    def _apply(self, batch: List[_PendingOrder]) -> None:
+        started = time.monotonic()
+        db = self.session_factory()
+        try:
+            service = OrderService(db)
+            responses = []
+            created = units = 0
+            for pending in batch:
+                try:
+                    with db.begin_nested():
+                        order_read = service.place_order(pending.request.order)
+                    if pending.idempotency_key:
+                        guard_idempotency_key(db, *pending.idempotency_key)
+                    responses.append(CreateOrderResponse(order=order_read, msg="Order created successfully"))
+                    created += 1
+                    units += sum(line.quantity for line in order_read.order_items)
+                except StockError as e:
+                    responses.append(CreateOrderResponse(error=True, code=e.code, msg=e.msg))
+                except Exception as e:
+                    responses.append(CreateOrderResponse(error=True, code=ErrorCode.INTERNAL_ERROR, msg=str(e)))
+            db.commit()
+            record_orders_created(created, units)
+        except Exception as e:
+            db.rollback()
+            responses = [
+                CreateOrderResponse(error=True, code=ErrorCode.INTERNAL_ERROR, msg=str(e))
+                for _ in batch
+            ]
+            with self._stats_lock:
+                self.failed_batches += 1
+        finally:
+            db.close()
+
+        self._record(batch, started)
+        for response in responses:
+            if response.error:
+                record_order_rejected(response.code)
+        for pending, response in zip(batch, responses):
+            pending.future.set_result(response)
+
+    def _record(self, batch: List[_PendingOrder], started: float) -> None:
+        delays = [(started - pending.enqueued_at) * 1000 for pending in batch]
+        with self._stats_lock:
+            self.batches += 1
+            self.orders += len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            self.queue_delay_ms_total += sum(delays)
+            self.queue_delay_ms_max = max(self.queue_delay_ms_max, *delays)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "enabled": settings.ORDER_BATCH_ENABLED,
+                "window_ms": self.window_ms,
+                "max_size": self.max_size,
+                "queued": self._queue.qsize(),
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "orders": self.orders,
+                "avg_batch_size": self.orders / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "avg_queue_delay_ms": self.queue_delay_ms_total / self.orders if self.orders else 0.0,
+                "max_queue_delay_ms": self.queue_delay_ms_max,
+            }
+
+
+order_batcher = OrderBatcher()
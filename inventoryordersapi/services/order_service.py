@@ -1,22 +1,41 @@
+from typing import Any, Dict, Iterator, List, Tuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from inventoryordersapi.domain.order_item import OrderItemRead, OrderItemCreate
 from inventoryordersapi.domain.order_response import OrderItemResponse, OrderResponse
 from inventoryordersapi.repo.order_repo import OrderRepo
 from inventoryordersapi.repo.order_item_repo import OrderItemRepo
-from inventoryordersapi.repo.item_repo import ItemRepo
-from inventoryordersapi.model.order_record import OrderRecord
+from inventoryordersapi.repo.item_repo import ItemRepo, StockError
+from inventoryordersapi.repo.report_repo import ReportRepo
+from inventoryordersapi.model.order_record import OrderRecord, OrderStatus
 from inventoryordersapi.model.order_item_record import OrderItemRecord
 from inventoryordersapi.model.item_record import ItemRecord
-from inventoryordersapi.domain.order import OrderRead
+from inventoryordersapi.domain.order import Order, OrderRead
 from inventoryordersapi.domain.order_req_res import (
     CreateOrderRequest, CreateOrderResponse, 
     UpdateOrderRequest, UpdateOrderResponse,
-    GetOrderResponse, ListOrderResponse
+    GetOrderResponse, ListOrderResponse,
+    BulkOrderResult
 )
-from inventoryordersapi.domain.common import ErrorCode
-from inventoryordersapi.utils.pagination import paginate_query
+from inventoryordersapi.domain.common import ErrorCode, Pagination
+from inventoryordersapi.core.metrics import record_order_canceled, record_order_rejected, record_orders_created
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.utils.pagination import CountStrategy, paginate_query, paginate_keyset
+from inventoryordersapi.utils.order_export import csv_header, encode_orders
+from inventoryordersapi.utils.etag import etag_matches, make_etag
+from inventoryordersapi.utils.ids import new_id
 from datetime import datetime
 
+# Newest first; order_id breaks ties between orders created in the same instant
+ORDER_SORT_COLUMNS = (OrderRecord.created_at, OrderRecord.order_id)
+
+# status query value -> stored statuses; IN lists (not !=) so idx_order_status_created_at applies
+ORDER_STATUS_FILTERS = {
+    "confirmed": ("confirmed",),
+    "unpaid": ("pending", "canceled"),
+    "canceled": ("canceled",),
+}
+
 
 class OrderService:
     def __init__(self, db: Session):
@@ -24,6 +43,7 @@ class OrderService:
         self.order_repo = OrderRepo(db)
         self.order_item_repo = OrderItemRepo(db)
         self.item_repo = ItemRepo(db)
+        self.report_repo = ReportRepo(db)
 
     def get_order(self, order_id: str) -> GetOrderResponse:
         """Get order by ID"""
@@ -46,25 +66,39 @@ class OrderService:
                 msg=str(e)
             )
 
-    def list_orders(
-        self,
-        customer_name: str | None = None,
-        status: str | None = None,
-        from_date: str | None = None,
-        to_date: str | None = None,
-        page: int = 1,
-        page_size: int = 10
-    ):
-        query = self.db.query(OrderRecord)
+    def get_order_view(
+        self, order_id: str, if_none_match: str | None = None
+    ) -> Tuple[GetOrderResponse, Dict[str, Any] | None, str | None]:
+        """
+        Return the lookup result with the API-shaped order and its ETag. When
+        if_none_match already matches the current version the order is not
+        loaded and comes back as None next to a successful result.
+        """
+        try:
+            if if_none_match:
+                version = self.order_repo.get_version(order_id)
+                if version is not None and etag_matches(if_none_match, make_etag(version)):
+                    return GetOrderResponse(msg="Order not modified"), None, make_etag(version)
+            order, version = self.order_repo.get_view(order_id)
+        except Exception as e:
+            return GetOrderResponse(error=True, code=ErrorCode.INTERNAL_ERROR, msg=str(e)), None, None
+        if order is None:
+            return GetOrderResponse(
+                error=True,
+                code=ErrorCode.NOT_FOUND,
+                msg=f"Order with ID {order_id} not found"
+            ), None, None
+        return GetOrderResponse(msg="Order retrieved successfully"), order, make_etag(version)
 
+    @staticmethod
+    def _filter_orders(query, customer_name=None, status=None, from_date=None, to_date=None):
+        """Apply the listing filters to an ORM query or a select() over OrderRecord."""
         if customer_name:
             query = query.filter(OrderRecord.customer_name.ilike(f"%{customer_name}%"))
         
-        if status:
-            if status.lower() == "confirmed":
-                query = query.filter(OrderRecord.status == "confirmed")
-            elif status.lower() == "unpaid":
-                query = query.filter(OrderRecord.status != "confirmed")
+        statuses = ORDER_STATUS_FILTERS.get(status.lower()) if status else None
+        if statuses:
+            query = query.filter(OrderRecord.status.in_(statuses))
     
         if from_date:
             from_dt = datetime.fromisoformat(from_date)
@@ -74,156 +108,368 @@ class OrderService:
             to_dt = datetime.fromisoformat(to_date)
             query = query.filter(OrderRecord.created_at <= to_dt)
 
-        offset = (page - 1) * page_size
-        orders, pagination = paginate_query(query, limit=page_size, offset=offset, page=page, page_size=page_size)
+        return query
+
+    def list_orders(
+        self,
+        customer_name: str | None = None,
+        status: str | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        page: int | None = None,
+        page_size: int = 10,
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None
+    ) -> Tuple[List[Dict[str, Any]], Pagination]:
+        """One page of API-shaped order dicts (see OrderRepo.to_order_views)."""
+        query = self._filter_orders(
+            self.order_repo.query_with_items(), customer_name, status, from_date, to_date
+        )
+
+        # Keyset pagination by default, OFFSET only for legacy page requests
+        if page is not None and not cursor:
+            offset = (page - 1) * page_size
+            orders, pagination = paginate_query(
+                query,
+                limit=page_size,
+                offset=offset,
+                page=page,
+                page_size=page_size,
+                count_strategy=count_strategy or CountStrategy.exact,
+                sort_columns=ORDER_SORT_COLUMNS,
+                descending=True
+            )
+        else:
+            orders, pagination = paginate_keyset(
+                query,
+                ORDER_SORT_COLUMNS,
+                cursor=cursor,
+                page_size=page_size,
+                descending=True,
+                count_strategy=count_strategy or CountStrategy.none
+            )
     
-        # Convert OrderRecord to OrderRead
-        orders_read = []
-        for order in orders:
-                orders_read.append(OrderRead(
-                order_id=order.order_id,
-                customer_name=order.customer_name,
-                customer_email=order.customer_email,
-                total_amount=order.total_amount,
-                status=order.status,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                order_items=[OrderItemRead(
-                    order_item_id=item.order_item_id,
-                    item_id=item.item_id,
-                    quantity=item.quantity,
-                    price=item.price,
-                    created_at=item.created_at,
-                    updated_at=item.updated_at
-                ) for item in order.order_items]
-            ))
-
-        return orders_read, pagination
+        return self.order_repo.to_order_views(orders), pagination
+
+    def export_orders(
+        self,
+        fmt: str = "ndjson",
+        customer_name: str | None = None,
+        status: str | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        batch_size: int | None = None
+    ) -> Iterator[str]:
+        """
+        Stream matching orders oldest first as NDJSON or CSV chunks.
+        Orders are read through a server-side cursor (yield_per) and their
+        lines are loaded with one query per batch, so memory is bounded by
+        batch_size however many orders match. Filters are validated here,
+        before the first chunk is produced.
+        """
+        statement = self._filter_orders(
+            select(
+                OrderRecord.order_id,
+                OrderRecord.customer_name,
+                OrderRecord.customer_email,
+                OrderRecord.status,
+                OrderRecord.total_amount,
+                OrderRecord.created_at
+            ),
+            customer_name, status, from_date, to_date
+        ).order_by(OrderRecord.created_at, OrderRecord.order_id)
+        batch_size = batch_size or settings.ORDER_EXPORT_BATCH_SIZE
+
+        def chunks() -> Iterator[str]:
+            if fmt == "csv":
+                yield csv_header()
+            result = self.db.execute(statement.execution_options(yield_per=batch_size))
+            try:
+                for partition in result.partitions():
+                    lines = self.order_item_repo.lines_for_orders(row.order_id for row in partition)
+                    yield encode_orders(
+                        [
+                            {
+                                "order_id": row.order_id,
+                                "customer_name": row.customer_name,
+                                "customer_email": row.customer_email,
+                                "status": row.status.value,
+                                "total_amount": row.total_amount,
+                                "created_at": row.created_at.isoformat(),
+                                "items": lines.get(row.order_id, [])
+                            }
+                            for row in partition
+                        ],
+                        fmt
+                    )
+            finally:
+                result.close()
+
+        return chunks()
+
+    def _price_lines(
+        self,
+        order_items: List[OrderItemCreate],
+        db_items: Dict[str, ItemRecord],
+        available: Dict[str, int]
+    ) -> Tuple[List[Dict[str, Any]], float, Dict[str, int]]:
+        """
+        Check a basket against already locked items and the stock still
+        available to it. Returns the priced lines, the order total and the
+        quantity requested per item; raises StockError if a line cannot be met.
+        """
+        requested: Dict[str, int] = {}
+        for item in order_items:
+            requested[item.item_id] = requested.get(item.item_id, 0) + item.quantity
+
+        lines = []
+        total_amount = 0
+        for item in order_items:
+            db_item = db_items.get(item.item_id)
+            if not db_item:
+                raise StockError(ErrorCode.NOT_FOUND, f"Item with ID {item.item_id} not found")
+
+            if available[item.item_id] < requested[item.item_id]:
+                raise StockError(
+                    ErrorCode.INSUFFICIENT_STOCK,
+                    f"Insufficient stock for item {db_item.item_name}"
+                )
+
+            total_amount += db_item.item_price * item.quantity
+            lines.append({
+                "item_id": item.item_id,
+                "quantity": item.quantity,
+                "price": db_item.item_price
+            })
+
+        return lines, total_amount, requested
+
+    @staticmethod
+    def _sharded_ids(db_items: Dict[str, ItemRecord]) -> List[str]:
+        return [item_id for item_id, db_item in db_items.items() if db_item.stock_shard_count]
+
+    def _reserve_stock(self, order_items: List[OrderItemCreate]) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Lock all referenced items in one ordered query, check stock and price
+        the lines in memory, then apply every stock decrement in one statement.
+        Raises StockError if a line cannot be reserved.
+        """
+        if settings.STOCK_RESERVATION_MODE == "atomic":
+            return self._reserve_stock_atomic(order_items)
+
+        db_items = self.item_repo.lock_items(item.item_id for item in order_items)
+        available = self.item_repo.stock_totals(db_items.values())
+
+        lines, total_amount, requested = self._price_lines(order_items, db_items, available)
+
+        self.item_repo.decrease_quantities(requested, self._sharded_ids(db_items))
+        return lines, total_amount
+
+    def _reserve_stock_atomic(self, order_items: List[OrderItemCreate]) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Take stock with one conditional UPDATE per item instead of locking
+        and re-reading the rows. Raises StockError if a line cannot be reserved.
+        """
+        requested: Dict[str, int] = {}
+        for item in order_items:
+            requested[item.item_id] = requested.get(item.item_id, 0) + item.quantity
+
+        reserved = self.item_repo.reserve_quantities(requested)
+        # Stock was already checked by the UPDATEs, so every line fits
+        lines, total_amount, _ = self._price_lines(order_items, reserved, requested)
+        return lines, total_amount
+
+    def place_order(self, order_data: Order) -> OrderRead:
+        """
+        Reserve stock and write one order with its lines, without committing.
+        Raises StockError if a line cannot be reserved.
+        """
+        lines, total_amount = self._reserve_stock(order_data.order_items)
+
+        # Create order record
+        order_record = OrderRecord(
+            customer_name=order_data.customer_name,
+            customer_email=order_data.customer_email,
+            total_amount=total_amount,
+            status="pending"
+        )
+        self.db.add(order_record)
+        self.db.flush()  # To get the order_id
+
+        for line in lines:
+            line["order_id"] = order_record.order_id
+        order_items = self.order_item_repo.bulk_create(lines)
+        self.report_repo.record_orders_placed(1, total_amount, lines)
+        taken: Dict[str, int] = {}
+        for line in lines:
+            taken[line["item_id"]] = taken.get(line["item_id"], 0) - line["quantity"]
+        self.item_repo.queue_threshold_alerts(taken)
+
+        # Convert to Pydantic model for response
+        return OrderRead(
+            order_id=order_record.order_id,
+            customer_name=order_record.customer_name,
+            customer_email=order_record.customer_email,
+            total_amount=order_record.total_amount,
+            status=order_record.status,
+            created_at=order_record.created_at,
+            updated_at=order_record.updated_at,
+            order_items=[
+                OrderItemRead(
+                    order_item_id=item["order_item_id"],
+                    item_id=item["item_id"],
+                    quantity=item["quantity"],
+                    price=item["price"]
+                ) for item in order_items
+            ]
+        )
 
     def create_order(self, request: CreateOrderRequest) -> CreateOrderResponse:
         """Create a new order with items"""
         try:
-            order_data = request.order
-            # Start a transaction
-            with self.db.begin():
-                # Create order record
-                order_record = OrderRecord(
-                    customer_name=order_data.customer_name,
-                    customer_email=order_data.customer_email,
-                    total_amount=0,  # Will be calculated
-                    status="pending"
-                )
-                self.db.add(order_record)
-                self.db.flush()  # To get the order_id
-
-                total_amount = 0
-                order_items = []
-
-                # Process each order item
-                for item in order_data.order_items:
-                    # Get item with lock to prevent race conditions
-                    db_item = self.db.query(ItemRecord).filter(
-                        ItemRecord.item_id == item.item_id
-                    ).with_for_update().first()
-
-                    if not db_item:
-                        self.db.rollback()
-                        return CreateOrderResponse(
-                            error=True,
-                            code=ErrorCode.NOT_FOUND,
-                            msg=f"Item with ID {item.item_id} not found"
-                        )
-
-                    # Check stock
-                    if db_item.item_quantity < item.quantity:
-                        self.db.rollback()
-                        return CreateOrderResponse(
-                            error=True,
-                            code=ErrorCode.INSUFFICIENT_STOCK,
-                            msg=f"Insufficient stock for item {db_item.item_name}"
-                        )
-
-                    # Calculate item total
-                    item_total = db_item.item_price * item.quantity
-                    total_amount += item_total
-
-                    # Create order item
-                    order_item = OrderItemRecord(
-                        order_id=order_record.order_id,
-                        item_id=item.item_id,
-                        quantity=item.quantity,
-                        price=db_item.item_price
-                    )
-                    self.db.add(order_item)
-                    order_items.append(order_item)
-
-                    # Update item quantity
-                    db_item.item_quantity -= item.quantity
-                    self.db.add(db_item)
-
-                # Update order total
-                order_record.total_amount = total_amount
-                self.db.add(order_record)
-
-                # Convert to Pydantic model for response
-                order_read = OrderRead(
-                    order_id=order_record.order_id,
-                    customer_name=order_record.customer_name,
-                    customer_email=order_record.customer_email,
-                    total_amount=order_record.total_amount,
-                    status=order_record.status,
-                    created_at=order_record.created_at,
-                    updated_at=order_record.updated_at,
-                    order_items=[
-                        OrderItemRead(
-                            order_item_id=item.order_item_id,
-                            item_id=item.item_id,
-                            quantity=item.quantity,
-                            price=item.price,
-                            created_at=item.created_at,
-                            updated_at=item.updated_at
-                        ) for item in order_items
-                    ]
-                )
+            order_read = self.place_order(request.order)
+            self.db.commit()
+            record_orders_created(1, sum(line.quantity for line in order_read.order_items))
 
-                return CreateOrderResponse(
-                    order=order_read,
-                    msg="Order created successfully"
-                )
+            return CreateOrderResponse(
+                order=order_read,
+                msg="Order created successfully"
+            )
 
+        except StockError as e:
+            self.db.rollback()
+            record_order_rejected(e.code)
+            return CreateOrderResponse(
+                error=True,
+                code=e.code,
+                msg=e.msg
+            )
         except Exception as e:
             self.db.rollback()
+            record_order_rejected(ErrorCode.INTERNAL_ERROR)
             return CreateOrderResponse(
                 error=True,
                 code=ErrorCode.INTERNAL_ERROR,
                 msg=str(e)
             )
 
+    def _take_shard_stock(self, quantities: Dict[str, int], db_items: Dict[str, ItemRecord]) -> None:
+        """
+        Take one order's sharded stock in a savepoint, so a StockError
+        undoes only this order's shard updates.
+        """
+        if not quantities:
+            return
+        with self.db.begin_nested():
+            for item_id, quantity in sorted(quantities.items()):
+                self.item_repo.take_shard_stock(item_id, quantity, db_items[item_id].item_name)
+
+    def create_order_chunk(self, chunk: List[Tuple[int, Order]]) -> List[BulkOrderResult]:
+        """
+        Create a chunk of (index, order) pairs in one transaction.
+        Item rows are locked once for the whole chunk and each order is checked
+        in memory against the stock left by the orders before it, so a failing
+        order never touches the database. Orders, lines and stock decrements
+        are then written with one statement each. Sharded items are not
+        locked, so concurrent orders can drain their shards after the check;
+        their stock is taken per order in a savepoint, and an order that
+        comes up short is rejected on its own.
+        """
+        try:
+            db_items = self.item_repo.lock_items(
+                line.item_id for _, order in chunk for line in order.order_items
+            )
+            available = self.item_repo.stock_totals(db_items.values())
+            sharded_ids = set(self._sharded_ids(db_items))
+
+            results = []
+            order_rows = []
+            line_rows = []
+            reserved: Dict[str, int] = {}
+
+            for index, order in chunk:
+                try:
+                    lines, total_amount, requested = self._price_lines(
+                        order.order_items, db_items, available
+                    )
+                    self._take_shard_stock(
+                        {item_id: quantity for item_id, quantity in requested.items() if item_id in sharded_ids},
+                        db_items
+                    )
+                except StockError as e:
+                    record_order_rejected(e.code)
+                    results.append(BulkOrderResult(index=index, error=True, code=e.code, msg=e.msg))
+                    continue
+
+                for item_id, quantity in requested.items():
+                    available[item_id] -= quantity
+                    reserved[item_id] = reserved.get(item_id, 0) + quantity
+
+                order_id = new_id()
+                order_rows.append({
+                    "order_id": order_id,
+                    "customer_name": order.customer_name,
+                    "customer_email": order.customer_email,
+                    "total_amount": total_amount
+                })
+                for line in lines:
+                    line["order_id"] = order_id
+                line_rows.extend(lines)
+
+                results.append(BulkOrderResult(
+                    index=index,
+                    order_id=order_id,
+                    msg="Order created successfully"
+                ))
+
+            self.order_repo.bulk_create(order_rows)
+            self.order_item_repo.bulk_create(line_rows)
+            self.item_repo.decrease_quantities(
+                {item_id: quantity for item_id, quantity in reserved.items() if item_id not in sharded_ids}
+            )
+            self.report_repo.record_orders_placed(
+                len(order_rows), sum(row["total_amount"] for row in order_rows), line_rows
+            )
+            self.item_repo.queue_threshold_alerts({item_id: -quantity for item_id, quantity in reserved.items()})
+            self.db.commit()
+            record_orders_created(len(order_rows), sum(reserved.values()))
+            return results
+
+        except Exception as e:
+            self.db.rollback()
+            record_order_rejected(ErrorCode.INTERNAL_ERROR)
+            return [
+                BulkOrderResult(index=index, error=True, code=ErrorCode.INTERNAL_ERROR, msg=str(e))
+                for index, _ in chunk
+            ]
+
     def cancel_order(self, order_id: str) -> bool:
         """
         Cancel an order. Restores stock if needed.
             """
         try:
-            with self.db.begin():
-                order = self.order_repo.get_for_update(order_id)
-                if not order:
-                    return False  # Order not found
-                if order.status == "canceled":
-                    return False
-                if order.status == "confirmed":
-                    return False
-                # Mark order as canceled
-                order.status = "canceled"
-                self.db.add(order)
-
-                # Restore stock
-                for item in order.order_items:
-                    db_item = self.item_repo.get_for_update(item.item_id)
-                    if db_item:
-                        db_item.item_quantity += item.quantity
-                        self.db.add(db_item)
+            order = self.order_repo.get_for_update(order_id)
+            if not order:
+                return False  # Order not found
+            if order.status == "canceled":
+                return False
+            if order.status == "confirmed":
+                return False
+            # Mark order as canceled
+            previous_status = OrderStatus(order.status).value
+            order.status = "canceled"
+            self.db.add(order)
+
+            # Restore stock
+            restock: Dict[str, int] = {}
+            for item in order.order_items:
+                restock[item.item_id] = restock.get(item.item_id, 0) + item.quantity
+            self.item_repo.increase_quantities(restock)
+            self.report_repo.record_order_canceled(order, previous_status)
+            self.item_repo.queue_threshold_alerts(restock)
 
             self.db.commit()
+            record_order_canceled(sum(restock.values()))
             return True
         except Exception as e:
             self.db.rollback()
@@ -234,7 +480,7 @@ class OrderService:
         items = [
             OrderItemResponse(
                 item_id=item.item_id,
-                name=getattr(item, "item_name", getattr(item, "price", "")),  # if you have item name somewhere
+                name=item.item_name or "Unknown",
                 unit_price=item.price,
                 quantity=item.quantity,
                 line_total=item.price * item.quantity
@@ -258,13 +504,9 @@ class OrderService:
         """
         formatted_items = []
         for item in order_read.order_items:
-            # get item name if item object exists, else fallback
-            item_name = getattr(item, "item_name", None)
-            if not item_name and hasattr(item, "item") and getattr(item.item, "item_name", None):
-                item_name = item.item.item_name
             formatted_items.append({
                 "item_id": item.item_id,
-                "name": item_name or "Unknown",
+                "name": item.item_name or "Unknown",
                 "unit_price": item.price,
                 "quantity": item.quantity,
                 "line_total": item.price * item.quantity
@@ -0,0 +1,43 @@
+from datetime import date
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.domain.report import DailySales, ItemSales, RollupRebuildResponse, StatusTotals
+from inventoryordersapi.repo.report_repo import ReportRepo
+
+
+class ReportService:
+    """Sales reports answered from the daily rollup tables, never from raw orders."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ReportRepo(db)
+
+    def daily_sales(self, from_date: date, to_date: date) -> List[DailySales]:
+        return [DailySales(**day) for day in self.repo.daily_sales(from_date, to_date)]
+
+    def item_sales(self, from_date: date, to_date: date, limit: int = 20) -> List[ItemSales]:
+        return [
+            ItemSales(item_id=str(row.item_id), item_name=row.item_name, units=row.units, revenue=row.revenue)
+            for row in self.repo.item_sales(from_date, to_date, limit)
+        ]
+
+    def status_totals(self, from_date: date, to_date: date) -> List[StatusTotals]:
+        return [
+            StatusTotals(status=row.status, orders=row.orders, amount=row.amount)
+            for row in self.repo.status_totals(from_date, to_date)
+        ]
+
+    def rebuild_rollups(self, from_date: date | None = None, to_date: date | None = None) -> RollupRebuildResponse:
+        """Recompute the rollups for a day range from order/order_item in one transaction."""
+        try:
+            item_rows, status_rows = self.repo.rebuild(from_date, to_date)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return RollupRebuildResponse(
+            item_rows=item_rows, status_rows=status_rows, code=ErrorCode.SUCCESS, msg="Sales rollups rebuilt"
+        )
@@ -0,0 +1,24 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi.responses import Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong (quoted) ETag for a resource version built from parts."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check; it uses the weak comparison, so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """304 without a body; the client reuses its cached representation."""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+import uuid
+from typing import Iterable, List
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_seq = 0
+
+
+def uuid7(unix_ms: int | None = None, random_bits: int | None = None) -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit Unix milliseconds, then
+    a 12-bit counter that keeps ids generated in the same millisecond
+    increasing, then 62 random bits. New keys land at the right edge of the
+    primary key index instead of on random pages.
+    """
+    global _last_ms, _last_seq
+    if unix_ms is None:
+        with _lock:
+            unix_ms = time.time_ns() // 1_000_000
+            if unix_ms <= _last_ms:
+                # Same (or a stepped-back) millisecond: bump the counter, borrowing a ms when it wraps
+                _last_seq += 1
+                if _last_seq > 0xFFF:
+                    _last_ms += 1
+                    _last_seq = 0
+                unix_ms = _last_ms
+            else:
+                _last_ms = unix_ms
+                _last_seq = 0
+            seq = _last_seq
+    else:
+        seq = 0
+    if random_bits is None:
+        random_bits = int.from_bytes(os.urandom(8), "big")
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= (seq & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= random_bits & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """A new primary key in its API form (lowercase, hyphenated)."""
+    return str(uuid7())
+
+
+def parse_id(value: str) -> str | None:
+    """The canonical form of a key, or None if value is not a UUID (so it cannot exist)."""
+    try:
+        return str(uuid.UUID(value))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def parse_ids(values: Iterable[str]) -> List[str]:
+    """Canonical forms of the values that are UUIDs; the rest are dropped."""
+    return [item_id for item_id in map(parse_id, values) if item_id is not None]
@@ -0,0 +1,65 @@
+import csv
+import json
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Open import streams with this error handler: undecodable bytes then reach
+# iter_import_rows as lone surrogates and only their line is rejected.
+IMPORT_DECODE_ERRORS = "surrogateescape"
+
+NOT_UTF8 = "not valid UTF-8"
+
+
+def _undecodable(text: str) -> bool:
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def iter_import_rows(stream: TextIO, fmt: str = "csv") -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Yield (line_number, raw_row, error) triples from a CSV (with header) or
+    JSONL stream, one row at a time. Rows that cannot be read (invalid JSON
+    or UTF-8, CSV syntax errors) come with raw_row None and the reason in
+    error, so the caller can reject them and carry on. A stream that raises
+    on undecodable bytes ends with one such row, as nothing after it can be
+    read.
+    """
+    line_number = 0
+    try:
+        if fmt == "jsonl":
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                if _undecodable(line):
+                    yield line_number, None, NOT_UTF8
+                    continue
+                try:
+                    yield line_number, json.loads(line), None
+                except ValueError:
+                    yield line_number, None, "malformed JSON"
+            return
+
+        reader = csv.DictReader(stream)
+        rows = iter(reader)
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # line_num still points at the last row read successfully
+                line_number = reader.line_num + 1
+                yield line_number, None, f"malformed CSV: {e}"
+                continue
+            line_number = reader.line_num
+            if any(_undecodable(value) for value in row.values() if isinstance(value, str)):
+                yield line_number, None, NOT_UTF8
+                continue
+            # Empty cells mean "not provided" so model defaults apply
+            yield line_number, {key: value for key, value in row.items() if key and value != ""}, None
+    except UnicodeDecodeError:
+        yield line_number + 1, None, NOT_UTF8
@@ -0,0 +1,46 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder produces the same JSON
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson. Routes return it directly, so FastAPI
+    skips response_model validation and jsonable_encoder; the content must
+    already be plain dicts/lists in the API shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200, headers: Dict[str, str] | None = None) -> Response:
+    """Serialize an already validated response model once, in pydantic-core."""
+    return Response(
+        content=model.model_dump_json(), status_code=status_code, headers=headers, media_type="application/json"
+    )
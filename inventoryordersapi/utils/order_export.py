@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+from typing import Any, Dict, List
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# One CSV row per order line; orders without lines get a single row with empty line columns
+CSV_COLUMNS = (
+    "order_id", "customer_name", "customer_email", "status", "total_amount", "created_at",
+    "item_id", "item_name", "quantity", "price"
+)
+
+
+def csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue()
+
+
+def encode_orders(orders: List[Dict[str, Any]], fmt: str = "ndjson") -> str:
+    """Encode a batch of exported orders as one NDJSON or CSV chunk."""
+    if fmt == "ndjson":
+        return "".join(json.dumps(order, separators=(",", ":")) + "\n" for order in orders)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for order in orders:
+        head = [order[column] for column in CSV_COLUMNS[:6]]
+        if not order["items"]:
+            writer.writerow(head + [""] * 4)
+        for line in order["items"]:
+            writer.writerow(head + [line["item_id"], line["item_name"], line["quantity"], line["price"]])
+    return buffer.getvalue()
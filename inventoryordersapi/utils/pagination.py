@@ -1,19 +1,115 @@
-from typing import Any, List, Tuple
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from sqlalchemy import String, literal, tuple_
 from sqlalchemy.orm import Query
+from inventoryordersapi.core.cache import LRUTTLCache
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.core.write_tracking import table_generation
 from inventoryordersapi.domain.common import Pagination
 
-def paginate_query(query: Query, limit: int = 100, offset: int = 0, page: int = 1, page_size: int = 10) -> Tuple[List[Any], Pagination]:
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or its signature does not match."""
+
+
+class CountStrategy(str, Enum):
+    exact = "exact"          # COUNT(*) over the filtered set
+    estimated = "estimated"  # planner row estimate (PostgreSQL), exact elsewhere
+    cached = "cached"        # exact count memoized per filter signature
+    none = "none"            # no total
+
+
+count_cache = LRUTTLCache(max_size=settings.COUNT_CACHE_MAX_SIZE, ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def _estimate_count(query: Query) -> Optional[int]:
+    """Row estimate from EXPLAIN; None when the database has no planner estimate."""
+    bind = query.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+    plan = query.session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_count(query: Query) -> int:
+    """
+    Exact count memoized by SQL text, parameters and the write generation of
+    every table involved, so any committed write to them forces a recount.
+    """
+    statement = query.order_by(None).statement
+    compiled = statement.compile(dialect=query.session.get_bind().dialect)
+    tables = sorted(table.name for table in statement.get_final_froms())
+    key = (
+        str(compiled),
+        tuple(sorted((name, repr(value)) for name, value in compiled.params.items())),
+        tuple((name, table_generation(name)) for name in tables)
+    )
+    total = count_cache.get(key)
+    if total is None:
+        total = query.order_by(None).count()
+        count_cache.set(key, total)
+    return total
+
+
+def count_query(query: Query, strategy: CountStrategy) -> Tuple[Optional[int], bool]:
+    """Return (total, is_exact) for query using the given count strategy."""
+    if strategy == CountStrategy.none:
+        return None, False
+    if strategy == CountStrategy.cached:
+        return _cached_count(query), True
+    if strategy == CountStrategy.estimated:
+        estimate = _estimate_count(query)
+        if estimate is not None:
+            return estimate, False
+    return query.order_by(None).count(), True
+
+
+def paginate_query(
+    query: Query,
+    limit: int = 100,
+    offset: int = 0,
+    page: int = 1,
+    page_size: int = 10,
+    count_strategy: CountStrategy = CountStrategy.exact,
+    sort_columns: Optional[Sequence[Any]] = None,
+    descending: bool = False,
+    row_key: Optional[Callable[[Any], List[Any]]] = None
+) -> Tuple[List[Any], Pagination]:
     """
     Paginate a SQLAlchemy query and return results + pagination info.
+    With sort_columns (the last one unique) the page is ordered on them and
+    next/prev carry signed keyset cursors for its last/first row, so a client
+    can continue from an OFFSET page with cursor=; without them there are
+    no cursors.
     """
-    total_count = query.count()
-    results = query.offset(offset).limit(limit).all()
+    total_count, total_is_exact = count_query(query, count_strategy)
+    if sort_columns:
+        query = query.order_by(*[column.desc() if descending else column.asc() for column in sort_columns])
+    results = query.offset(offset).limit(limit + 1).all()
+    has_more = len(results) > limit
+    results = results[:limit]
 
-    next_cursor = str(offset + limit) if offset + limit < total_count else None
-    prev_cursor = str(max(offset - limit, 0)) if offset > 0 else None
+    next_cursor = None
+    prev_cursor = None
+    if sort_columns and results:
+        if has_more:
+            next_cursor = encode_cursor(_key_of(results[-1], sort_columns, row_key), "next")
+        if offset > 0:
+            prev_cursor = encode_cursor(_key_of(results[0], sort_columns, row_key), "prev")
 
     pagination = Pagination(
         total=total_count,
+        total_is_exact=total_is_exact,
         page=page,
         page_size=page_size,
         next_cursor=next_cursor,
@@ -21,3 +117,133 @@ def paginate_query(query: Query, limit: int = 100, offset: int = 0, page: int =
     )
 
     return results, pagination
+
+
+def _key_of(row: Any, sort_columns: Sequence[Any], row_key: Optional[Callable[[Any], List[Any]]]) -> List[Any]:
+    """The sort key values of a result row, for building its cursor."""
+    if row_key:
+        return row_key(row)
+    return [getattr(row, column.key) for column in sort_columns]
+
+
+def _sign(payload: bytes) -> bytes:
+    secret = (settings.CURSOR_SECRET or settings.API_KEY).encode()
+    return hmac.new(secret, payload, hashlib.sha256).digest()[:16]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_cursor(values: Sequence[Any], direction: str = "next") -> str:
+    """
+    Build an opaque, signed cursor for the sort key values of a boundary row.
+    """
+    payload = json.dumps(
+        {"v": [value.isoformat() if isinstance(value, datetime) else value for value in values], "d": direction},
+        separators=(",", ":")
+    ).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(cursor: str) -> Tuple[List[Any], str]:
+    """
+    Verify a cursor built by encode_cursor and return (values, direction).
+    """
+    try:
+        encoded_payload, encoded_signature = cursor.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        raise InvalidCursorError("Malformed cursor")
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidCursorError("Invalid cursor signature")
+
+    data = json.loads(payload)
+    if data.get("d") not in ("next", "prev") or not isinstance(data.get("v"), list):
+        raise InvalidCursorError("Malformed cursor")
+    return data["v"], data["d"]
+
+
+def _bind_values(query: Query, sort_columns: Sequence[Any], values: Sequence[Any]) -> List[Any]:
+    """Turn decoded cursor values back into bind parameters for the sort columns."""
+    dialect = query.session.get_bind().dialect.name
+    bound = []
+    for column, value in zip(sort_columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+            if dialect == "sqlite":
+                # SQLite keeps timestamps as text; server defaults (CURRENT_TIMESTAMP)
+                # have no fractional part, so compare in the same textual form.
+                timespec = "microseconds" if value.microsecond else "seconds"
+                value = literal(value.isoformat(sep=" ", timespec=timespec), String)
+        elif value is not None:
+            # Bind with the column's type so e.g. Uuid keys get their stored form
+            value = literal(value, column.type)
+        bound.append(value)
+    return bound
+
+
+def paginate_keyset(
+    query: Query,
+    sort_columns: Sequence[Any],
+    cursor: Optional[str] = None,
+    page_size: int = 10,
+    descending: bool = False,
+    count_strategy: CountStrategy = CountStrategy.none,
+    row_key: Optional[Callable[[Any], List[Any]]] = None
+) -> Tuple[List[Any], Pagination]:
+    """
+    Keyset-paginate a query on sort_columns (the last one must be unique).
+    The cursors returned encode the sort key of the first/last row seen, so
+    every page is an index range scan instead of OFFSET. The total is
+    computed per count_strategy (none by default). row_key extracts the sort key from a
+    result row when the columns are not plain attributes of it.
+    """
+    direction = "next"
+    page_query = query
+    if cursor:
+        values, direction = decode_cursor(cursor)
+        if len(values) != len(sort_columns):
+            raise InvalidCursorError("Cursor does not match this listing")
+        key = tuple_(*sort_columns)
+        boundary = tuple_(*_bind_values(query, sort_columns, values))
+        # Walking backwards flips the comparison; rows are re-reversed below
+        if descending == (direction == "next"):
+            page_query = page_query.filter(key < boundary)
+        else:
+            page_query = page_query.filter(key > boundary)
+
+    reverse = descending != (direction == "prev")
+    page_query = page_query.order_by(
+        *[column.desc() if reverse else column.asc() for column in sort_columns]
+    )
+
+    rows = page_query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == "prev":
+        rows.reverse()
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        if direction == "prev" or has_more:
+            next_cursor = encode_cursor(_key_of(rows[-1], sort_columns, row_key), "next")
+        if (direction == "prev" and has_more) or (direction == "next" and cursor):
+            prev_cursor = encode_cursor(_key_of(rows[0], sort_columns, row_key), "prev")
+
+    total, total_is_exact = count_query(query, count_strategy)
+    pagination = Pagination(
+        total=total,
+        total_is_exact=total_is_exact,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
+    return rows, pagination
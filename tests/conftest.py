@@ -1,13 +1,20 @@
 import os
+from contextlib import contextmanager
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from inventoryordersapi.core.cache import item_cache
+from inventoryordersapi.utils.pagination import count_cache
 from inventoryordersapi.core.database import get_db
+from inventoryordersapi.core.query_stats import install_query_stats
+from inventoryordersapi.repo.item_search import item_search_index
 from inventoryordersapi.model.item_record import Base as ItemBase
 from inventoryordersapi.model.order_record import Base as OrderBase
 from inventoryordersapi.main import app
 
+HEADERS = {"X-API-KEY": "rameshapikey"}
+
 # Get test DB URL from environment variable, fallback to default
 SQLALCHEMY_TEST_DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -15,6 +22,18 @@ SQLALCHEMY_TEST_DATABASE_URL = os.getenv(
 )
 
 engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
+
+# pysqlite defers BEGIN until the first write, which breaks the per-test
+# rollback and SAVEPOINTs below; let SQLAlchemy emit BEGIN itself.
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _sqlite_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+install_query_stats(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Initialize database: drop all tables and recreate for a clean state
@@ -35,12 +54,37 @@ def db_engine():
 def db_session(db_engine):
     connection = db_engine.connect()
     transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     yield session
     session.close()
     transaction.rollback()
     connection.close()
 
+# Fails the test when the block runs more than max_queries statements:
+#     with query_budget(3) as statements:
+#         client.get("/orders/", headers=HEADERS)
+@pytest.fixture
+def query_budget(db_engine):
+    @contextmanager
+    def budget(max_queries):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            # The test fixture wraps each session transaction in a savepoint
+            if not statement.startswith(("SAVEPOINT", "RELEASE", "ROLLBACK TO")):
+                statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", before_cursor_execute)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} queries, budget is {max_queries}:\n" + "\n".join(statements)
+        )
+
+    return budget
+
 # Fixture for TestClient with dependency override
 @pytest.fixture(scope="function")
 def client(db_session):
@@ -53,4 +97,50 @@ def client(db_session):
     app.dependency_overrides[get_db] = override_get_db
     yield TestClient(app)
     app.dependency_overrides.clear()
+    # Cached rows would outlive the rolled back test transaction
+    item_cache.clear()
+    count_cache.clear()
+    item_search_index.reset()
+
+
+# Adds an item through the API and returns its id; other item fields go as keywords:
+#     pen_id = create_item("Pen", 5, item_price=2.0)
+@pytest.fixture
+def create_item(client):
+    def create(name, quantity=20, **fields):
+        item = {"item_name": name, "item_price": 10.0, "item_quantity": quantity, "low_stock": False, **fields}
+        response = client.post("/items/add_item", json={"item": item}, headers=HEADERS)
+        assert response.status_code == 200
+        return response.json()["item"]["item_id"]
+
+    return create
+
+# Builds the body of an order from (item_id, quantity) lines:
+#     order_payload([(pen_id, 2), (pad_id, 1)], customer="Alice")
+@pytest.fixture
+def order_payload():
+    def build(lines, customer="Jane Doe"):
+        return {
+            "customer_name": customer,
+            "customer_email": f"{customer.lower().replace(' ', '.')}@example.com",
+            "order_items": [{"item_id": item_id, "quantity": quantity} for item_id, quantity in lines]
+        }
+
+    return build
+
+# Posts an order and returns the response, whatever its status
+@pytest.fixture
+def place_order(client, order_payload):
+    def place(lines, customer="Jane Doe"):
+        return client.post("/orders/", json={"order": order_payload(lines, customer)}, headers=HEADERS)
+
+    return place
+
+# Posts an order that must succeed and returns its id
+@pytest.fixture
+def create_order(client, place_order):
+    def create(lines, customer="Jane Doe"):
+        assert place_order(lines, customer).status_code == 200
+        return client.get("/orders/", headers=HEADERS).json()["orders"][0]["id"]
 
+    return create
@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from inventoryordersapi.api.routes import async_item_routes, async_order_routes
+from inventoryordersapi.core.database import get_async_db
+from inventoryordersapi.model import Base
+from conftest import HEADERS
+
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/async.db", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    AsyncTestingSessionLocal = async_sessionmaker(autoflush=False, bind=engine)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_item_routes.router)
+    app.include_router(async_order_routes.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_item_and_order_flow(async_client):
+    payload = {"item": {"item_name": "Headset", "item_price": 80.0, "item_quantity": 4, "low_stock": False}}
+    item_response = async_client.post("/items/add_item", json=payload, headers=HEADERS)
+    assert item_response.status_code == 200
+    item_id = item_response.json()["item"]["item_id"]
+
+    order_payload = {
+        "order": {
+            "customer_name": "Async Buyer",
+            "customer_email": "async@example.com",
+            "order_items": [{"item_id": item_id, "quantity": 3}]
+        }
+    }
+    assert async_client.post("/orders/", json=order_payload, headers=HEADERS).status_code == 200
+    assert async_client.post("/orders/", json=order_payload, headers=HEADERS).status_code != 200
+
+    orders = async_client.get("/orders/", headers=HEADERS).json()["orders"]
+    assert len(orders) == 1
+    assert orders[0]["items"][0]["name"] == "Headset"
+
+    order = async_client.get(f"/orders/{orders[0]['id']}", headers=HEADERS).json()
+    assert order["total_amount"] == 240.0
+
+    assert async_client.post(f"/orders/{order['id']}/cancel", headers=HEADERS).status_code == 200
+    item = async_client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]
+    assert item["item_quantity"] == 4
+
+
+def test_async_idempotency_keys_use_the_async_session(async_client):
+    payload = {"item": {"item_name": "Dock", "item_price": 50.0, "item_quantity": 4, "low_stock": False}}
+    item_id = async_client.post("/items/add_item", json=payload, headers=HEADERS).json()["item"]["item_id"]
+    order_payload = {
+        "order": {
+            "customer_name": "Async Retry",
+            "customer_email": "async-retry@example.com",
+            "order_items": [{"item_id": item_id, "quantity": 1}]
+        }
+    }
+    headers = {**HEADERS, "Idempotency-Key": "async-order"}
+
+    first = async_client.post("/orders/", json=order_payload, headers=headers)
+    second = async_client.post("/orders/", json=order_payload, headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+
+    order_id = async_client.get("/orders/", headers=HEADERS).json()["orders"][0]["id"]
+    headers = {**HEADERS, "Idempotency-Key": "async-cancel"}
+    assert async_client.post(f"/orders/{order_id}/cancel", headers=headers).status_code == 200
+    assert async_client.post(f"/orders/{order_id}/cancel", headers=headers).headers["Idempotent-Replayed"] == "true"
+    assert async_client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"] == 4
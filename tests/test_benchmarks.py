@@ -0,0 +1,28 @@
+from benchmarks.compare import compare
+from benchmarks.run import percentile, summarize
+from benchmarks.seed import parse_scale
+
+
+def test_summary_uses_nearest_rank_percentiles():
+    latencies = [float(n) for n in range(1, 101)]
+
+    assert percentile(latencies, 50) == 50.0
+    assert percentile(latencies, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+    summary = summarize(latencies, wall_seconds=2.0, errors=1)
+    assert summary["p95_ms"] == 95.0
+    assert summary["throughput_rps"] == 50.0
+    assert summary["errors"] == 1
+    assert parse_scale("100k") == 100_000 and parse_scale("250") == 250
+
+
+def test_compare_flags_p95_regressions():
+    def run(p95):
+        stats = {"p50_ms": 1.0, "p95_ms": p95, "throughput_rps": 100.0}
+        return {"results": {"inprocess": {"orders_list": stats, "item_get": dict(stats, p95_ms=2.0)}}}
+
+    rows, regressions = compare(run(10.0), run(12.0), threshold=0.15)
+    assert len(rows) == 2
+    assert regressions == ["inprocess/orders_list"]
+    assert compare(run(10.0), run(11.0), threshold=0.15)[1] == []
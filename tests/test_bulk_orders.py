@@ -0,0 +1,33 @@
+import json
+from conftest import HEADERS
+
+
+def test_bulk_orders_report_per_order_results(client, create_item, order_payload):
+    item_id = create_item("Cable", 5)
+    orders = [order_payload([(item_id, 3)]), order_payload([(item_id, 3)]), order_payload([("missing", 1)]), order_payload([(item_id, 2)])]
+
+    response = client.post("/orders/bulk?chunk_size=2", json=orders, headers=HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    assert [result["code"] for result in data["results"]] == [200, "INSUFFICIENT_STOCK", 404, 200]
+    assert client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"] == 0
+
+
+def test_bulk_orders_accept_ndjson(client, create_item, order_payload):
+    item_id = create_item("Adapter", 5)
+    body = "\n".join([json.dumps(order_payload([(item_id, 1)])), "{not json", json.dumps(order_payload([(item_id, 1)]))])
+
+    response = client.post(
+        "/orders/bulk",
+        content=body,
+        headers={**HEADERS, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["created"] == 2
+    assert data["results"][1]["error"] is True
+    assert client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"] == 3
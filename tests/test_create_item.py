@@ -1,4 +1,6 @@
-import pytest
+from conftest import HEADERS
+
+
 def test_create_item(client):
     payload = {
         "item": {
@@ -15,3 +17,35 @@ def test_create_item(client):
     assert "item" in data
     assert data["item"]["item_name"] == "Keyboard"
     print(response.json())
+
+
+def test_duplicate_active_name_is_rejected_without_a_lookup(client, query_budget, create_item):
+    create_item("Router", 5)
+
+    duplicate = {"item": {"item_name": "ROUTER", "item_price": 10.0, "item_quantity": 5, "low_stock": False}}
+    with query_budget(2) as statements:
+        response = client.post("/items/add_item", json=duplicate, headers=HEADERS)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "An active item with this name already exists"
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+
+def test_rename_onto_active_name_is_rejected(client, create_item):
+    create_item("Switch", 5)
+    hub_id = create_item("Hub", 5)
+
+    item = {"item_name": "switch", "item_price": 10.0, "item_quantity": 5, "low_stock": False}
+    response = client.put(f"/items/{hub_id}", json={"item_id": hub_id, "item": item}, headers=HEADERS)
+    assert response.status_code == 400
+    assert client.get(f"/items/{hub_id}", headers=HEADERS).json()["item"]["item_name"] == "Hub"
+
+    item["item_name"] = "Hub Pro"
+    renamed = client.put(f"/items/{hub_id}", json={"item_id": hub_id, "item": item}, headers=HEADERS)
+    assert renamed.status_code == 200
+
+
+def test_soft_deleted_name_can_be_reused(client, create_item):
+    item_id = create_item("Modem", 5)
+    client.delete(f"/items/{item_id}", headers=HEADERS)
+
+    create_item("Modem", 5)
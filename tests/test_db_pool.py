@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from inventoryordersapi.core.pool import TimedQueuePool, engine_options, install_idle_pre_ping, pool_stats
+from inventoryordersapi.core.settings import settings
+from conftest import HEADERS
+
+
+def test_engine_options_apply_timeouts_per_driver(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_LOCK_TIMEOUT_MS", 1000)
+
+    sync = engine_options("postgresql+psycopg2://u:p@db/inventory")
+    assert sync["poolclass"] is TimedQueuePool
+    assert sync["connect_args"] == {"options": "-c statement_timeout=5000 -c lock_timeout=1000"}
+
+    asyncpg = engine_options("postgresql+asyncpg://u:p@db/inventory", is_async=True)
+    assert asyncpg["connect_args"] == {"server_settings": {"statement_timeout": "5000", "lock_timeout": "1000"}}
+
+    memory = engine_options("sqlite://")
+    assert "poolclass" not in memory
+    assert memory["connect_args"] == {"timeout": 1.0}
+
+
+def test_timed_pool_records_waits_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url))
+    install_idle_pre_ping(engine, idle_seconds=0)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    # Checked back in, then pinged on the next checkout because idle_seconds=0
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert sum(stats["wait_histogram"].values()) == 2
+    engine.dispose()
+
+
+def test_db_pool_endpoint(client):
+    response = client.get("/internal/db_pool", headers=HEADERS)
+    assert response.status_code == 200
+    assert "size" in response.json()["db_pool"]["sync"]
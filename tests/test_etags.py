@@ -0,0 +1,112 @@
+import datetime
+from sqlalchemy import update
+
+from inventoryordersapi.model.item_record import ItemRecord
+from conftest import HEADERS
+
+
+def _get(client, path, etag=None):
+    headers = {**HEADERS, "If-None-Match": etag} if etag else HEADERS
+    return client.get(path, headers=headers)
+
+
+def test_item_revalidation_reads_only_the_version(client, query_budget, create_item):
+    item_id = create_item("Kettle")
+    first = _get(client, f"/items/{item_id}")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    with query_budget(1):
+        cached = _get(client, f"/items/{item_id}", etag)
+    assert cached.status_code == 304
+    assert cached.content == b"" and cached.headers["etag"] == etag
+
+    assert _get(client, f"/items/{item_id}", f'W/{etag}, "other"').status_code == 304
+    assert _get(client, f"/items/{item_id}", "*").status_code == 304
+    assert _get(client, f"/items/{item_id}", '"stale"').status_code == 200
+
+
+def test_item_etag_changes_with_stock(client, create_item, create_order):
+    item_id = create_item("Toaster")
+    hot_id = create_item("Blender")
+    client.post(f"/items/{hot_id}/shards", json={"shard_count": 2}, headers=HEADERS)
+    etags = {key: _get(client, f"/items/{key}").headers["etag"] for key in (item_id, hot_id)}
+
+    create_order([(item_id, 1)])
+    create_order([(hot_id, 1)])  # shard stock only; item.updated_at is untouched
+
+    for key, etag in etags.items():
+        response = _get(client, f"/items/{key}", etag)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["item"]["item_quantity"] == 19
+
+
+def test_item_revalidation_sees_writes_the_cache_missed(client, db_session, create_item):
+    item_id = create_item("Scale")
+    etag = _get(client, f"/items/{item_id}").headers["etag"]
+
+    # Another process's write: committed to the database, never evicted from this process's cache
+    db_session.execute(
+        update(ItemRecord)
+        .where(ItemRecord.item_id == item_id)
+        .values(item_price=7.0, updated_at=datetime.datetime(2030, 1, 1))
+    )
+    db_session.commit()
+
+    assert _get(client, f"/items/{item_id}", etag).status_code == 200
+
+
+def test_order_etag_follows_status_and_item_names(client, query_budget, create_item, create_order):
+    item_id = create_item("Grinder")
+    order_id = create_order([(item_id, 1)])
+    etag = _get(client, f"/orders/{order_id}").headers["etag"]
+
+    with query_budget(1):
+        assert _get(client, f"/orders/{order_id}", etag).status_code == 304
+
+    update = {"item_id": item_id, "item": {"item_name": "Burr Grinder", "item_price": 6.0, "item_quantity": 19, "low_stock": False}}
+    client.put(f"/items/{item_id}", json=update, headers=HEADERS)
+    renamed = _get(client, f"/orders/{order_id}", etag)
+    assert renamed.status_code == 200 and renamed.json()["items"][0]["name"] == "Burr Grinder"
+
+    etag = renamed.headers["etag"]
+    client.post(f"/orders/{order_id}/cancel", headers=HEADERS)
+    canceled = _get(client, f"/orders/{order_id}", etag)
+    assert canceled.status_code == 200 and canceled.json()["status"] == "canceled"
+
+    assert _get(client, "/orders/not-an-id", etag).status_code == 404
+
+
+def test_order_revalidation_sees_renames_the_cache_missed(client, db_session, create_item, create_order):
+    item_id = create_item("Press")
+    order_id = create_order([(item_id, 1)])
+    etag = _get(client, f"/orders/{order_id}").headers["etag"]
+
+    # Another process renames the item; this process's item cache still holds the old name
+    db_session.execute(update(ItemRecord).where(ItemRecord.item_id == item_id).values(item_name="French Press"))
+    db_session.commit()
+
+    response = _get(client, f"/orders/{order_id}", etag)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["name"] == "French Press"
+    assert _get(client, f"/orders/{order_id}", response.headers["etag"]).status_code == 304
+
+
+def test_item_listing_etag_tracks_the_table(client, query_budget, create_item, create_order):
+    item_id = create_item("Mug")
+    other_id = create_item("Cup")
+    etag = _get(client, "/items/?page_size=5").headers["etag"]
+    with query_budget(1):
+        assert _get(client, "/items/?page_size=5", etag).status_code == 304
+    assert _get(client, "/items/?page_size=6", etag).status_code == 200
+
+    create_order([(item_id, 1)])
+    changed = _get(client, "/items/?page_size=5", etag)
+    assert changed.status_code == 200
+    quantities = {item["item_id"]: item["item_quantity"] for item in changed.json()["items"]}
+    assert quantities[item_id] == 19
+
+    etag = changed.headers["etag"]
+    client.delete(f"/items/{other_id}", headers=HEADERS)
+    assert _get(client, "/items/?page_size=5", etag).status_code == 200
@@ -0,0 +1,121 @@
+import json
+import warnings
+import pytest
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.repo.idempotency_repo import IdempotencyRepo
+from inventoryordersapi.services.order_service import OrderService
+from conftest import HEADERS
+
+
+def _quantity(client, item_id):
+    return client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"]
+
+
+def test_create_order_replays_stored_response(client, create_item, order_payload):
+    item_id = create_item("Kettle", 5)
+    headers = {**HEADERS, "Idempotency-Key": "order-1"}
+
+    first = client.post("/orders/", json={"order": order_payload([(item_id, 2)])}, headers=headers)
+    second = client.post("/orders/", json={"order": order_payload([(item_id, 2)])}, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert _quantity(client, item_id) == 3
+    assert len(client.get("/orders/", headers=HEADERS).json()["orders"]) == 1
+
+    other = client.post("/orders/", json={"order": order_payload([(item_id, 1)])}, headers=headers)
+    assert other.status_code == 422
+
+
+def test_cancel_and_bulk_replay(client, create_item, order_payload):
+    item_id = create_item("Toaster", 10)
+    client.post("/orders/", json={"order": order_payload([(item_id, 4)])}, headers=HEADERS)
+    order_id = client.get("/orders/", headers=HEADERS).json()["orders"][0]["id"]
+
+    headers = {**HEADERS, "Idempotency-Key": "cancel-1"}
+    assert client.post(f"/orders/{order_id}/cancel", headers=headers).status_code == 200
+    replay = client.post(f"/orders/{order_id}/cancel", headers=headers)
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert _quantity(client, item_id) == 10
+
+    headers = {**HEADERS, "Idempotency-Key": "bulk-1"}
+    body = json.dumps([order_payload([(item_id, 1)]), order_payload([(item_id, 2)])])
+    first = client.post("/orders/bulk", content=body, headers=headers)
+    second = client.post("/orders/bulk", content=body, headers=headers)
+    assert first.json()["created"] == 2
+    assert second.json() == first.json()
+    assert _quantity(client, item_id) == 7
+
+
+def test_claim_takes_a_free_key_once(db_session):
+    repo = IdempotencyRepo(db_session)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert repo.claim("orders.create", "once", None, lease_seconds=60)
+        assert not repo.claim("orders.create", "once", None, lease_seconds=60)
+        repo.release("orders.create", "once")
+        assert repo.claim("orders.create", "once", None, lease_seconds=60)
+
+
+def test_duplicate_waits_for_in_flight_request(client, db_session, monkeypatch, create_item, order_payload):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.05)
+    item_id = create_item("Blender", 5)
+    IdempotencyRepo(db_session).claim("orders.create", "busy", None, lease_seconds=60)
+
+    response = client.post("/orders/", json={"order": order_payload([(item_id, 1)])}, headers={**HEADERS, "Idempotency-Key": "busy"})
+    assert response.status_code == 409
+    assert _quantity(client, item_id) == 5
+
+    # An expired lease is taken over
+    IdempotencyRepo(db_session).release("orders.create", "busy")
+    IdempotencyRepo(db_session).claim("orders.create", "busy", None, lease_seconds=-1)
+    response = client.post("/orders/", json={"order": order_payload([(item_id, 1)])}, headers={**HEADERS, "Idempotency-Key": "busy"})
+    assert response.status_code == 200
+    assert _quantity(client, item_id) == 4
+
+
+def test_key_is_kept_once_the_order_committed(client, monkeypatch, create_item, order_payload):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LEASE_SECONDS", -1)  # as if the first request's process died
+    item_id = create_item("Grinder", 5)
+    headers = {**HEADERS, "Idempotency-Key": "stored-late"}
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("response store unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(IdempotencyRepo, "complete", fail)
+        with pytest.raises(RuntimeError):
+            client.post("/orders/", json={"order": order_payload([(item_id, 2)])}, headers=headers)
+
+    # The order committed without a stored response: the retry must not place it again
+    assert client.post("/orders/", json={"order": order_payload([(item_id, 2)])}, headers=headers).status_code == 409
+    assert _quantity(client, item_id) == 3
+    assert len(client.get("/orders/", headers=HEADERS).json()["orders"]) == 1
+
+
+def test_bulk_failure_after_a_committed_chunk_is_not_retried(client, monkeypatch, create_item, order_payload):
+    item_id = create_item("Mixer", 10)
+    headers = {**HEADERS, "Idempotency-Key": "bulk-partial"}
+    body = json.dumps([order_payload([(item_id, 1)]), order_payload([(item_id, 2)])])
+    create_order_chunk = OrderService.create_order_chunk
+    calls = []
+
+    def second_chunk_fails(self, chunk):
+        calls.append(chunk)
+        if len(calls) > 1:
+            raise RuntimeError("connection lost")
+        return create_order_chunk(self, chunk)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(OrderService, "create_order_chunk", second_chunk_fails)
+        with pytest.raises(RuntimeError):
+            client.post("/orders/bulk?chunk_size=1", content=body, headers=headers)
+
+    replay = client.post("/orders/bulk?chunk_size=1", content=body, headers=headers)
+    assert replay.status_code == 500
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert _quantity(client, item_id) == 9
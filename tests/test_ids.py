@@ -0,0 +1,28 @@
+import uuid
+
+from inventoryordersapi.utils.ids import new_id, parse_id, uuid7
+from conftest import HEADERS
+
+
+def test_uuid7_keys_are_time_ordered():
+    ids = [new_id() for _ in range(2000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert uuid.UUID(ids[0]).version == 7
+    assert uuid7(unix_ms=1_700_000_000_000, random_bits=0) < uuid7(unix_ms=1_700_000_000_001, random_bits=0)
+    assert parse_id(ids[0].upper().replace("-", "")) == ids[0]
+    assert parse_id("does-not-exist") is None
+
+
+def test_api_keeps_string_ids_and_rejects_malformed_ones(client, create_item, create_order, place_order):
+    item_id = create_item("Stapler", 2)
+    assert str(uuid.UUID(item_id)) == item_id
+
+    order_id = create_order([(item_id, 1)])
+    assert client.get(f"/orders/{order_id}", headers=HEADERS).json()["items"][0]["item_id"] == item_id
+
+    assert client.get("/items/not-a-uuid", headers=HEADERS).status_code == 404
+    assert client.get("/orders/not-a-uuid", headers=HEADERS).status_code == 404
+    assert client.post("/orders/not-a-uuid/cancel", headers=HEADERS).status_code == 400
+    assert place_order([("not-a-uuid", 1)]).status_code != 200
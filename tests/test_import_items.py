@@ -0,0 +1,93 @@
+import csv
+import json
+from conftest import HEADERS
+
+
+def test_import_items_csv_upserts_by_active_name(client, create_item):
+    item_id = create_item("Desk Lamp", 1, item_price=15.0, low_stock=True)
+
+    body = (
+        "item_name,item_description,item_price,item_quantity\n"
+        "desk lamp,LED lamp,18.5,40\n"
+        "Office Chair,,120,7\n"
+        "Broken Row,,not-a-price,1\n"
+    )
+    response = client.post(
+        "/items/import?batch_size=2",
+        content=body,
+        headers={**HEADERS, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 1, 1)
+    assert data["errors"][0]["line"] == 4
+
+    item = client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]
+    assert item["item_price"] == 18.5
+    assert item["item_quantity"] == 40
+
+
+def test_import_items_jsonl(client):
+    lines = [
+        {"item_name": "Pen", "item_price": 1.5, "item_quantity": 100},
+        {"item_name": "Pencil", "item_price": -1, "item_quantity": 100},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n{broken"
+
+    response = client.post(
+        "/items/import",
+        content=body,
+        headers={**HEADERS, "Content-Type": "application/x-ndjson"}
+    )
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 0, 2)
+
+
+def test_import_items_rejects_unreadable_lines_and_keeps_going(client):
+    body = (
+        b"item_name,item_price,item_quantity\n"
+        b"Hammer,9,3\n"
+        b"\xff\xfe,1,1\n"
+        b"Wrench,7,2\n"
+        b"Sander," + b"9" * 200 + b",1\n"
+        b"Pliers,5,4\n"
+    )
+    limit = csv.field_size_limit(100)
+    try:
+        response = client.post(
+            "/items/import?batch_size=1",
+            content=body,
+            headers={**HEADERS, "Content-Type": "text/csv"}
+        )
+    finally:
+        csv.field_size_limit(limit)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (3, 0, 2)
+    assert [error["line"] for error in data["errors"]] == [3, 5]
+    assert data["errors"][0]["msg"] == "not valid UTF-8"
+    assert data["errors"][1]["msg"].startswith("malformed CSV")
+
+    body = b'{"item_name": "Caliper", "item_price": 3, "item_quantity": 1}\n{"item_name": "\xc3("}\n'
+    response = client.post("/items/import", content=body, headers={**HEADERS, "Content-Type": "application/x-ndjson"})
+    data = response.json()
+    assert (data["inserted"], data["rejected"]) == (1, 1)
+    assert data["errors"] == [{"line": 2, "msg": "not valid UTF-8"}]
+
+
+def test_import_items_sets_or_keeps_low_stock_threshold(client, create_item):
+    drill_id = create_item("Drill", 3, item_price=60.0, low_stock_threshold=2)
+
+    body = (
+        "item_name,item_price,item_quantity,low_stock_threshold\n"
+        "Drill,65,3,\n"
+        "Saw,40,12,15\n"
+        "Hammer,20,12,\n"
+    )
+    response = client.post("/items/import", content=body, headers={**HEADERS, "Content-Type": "text/csv"})
+    assert (response.json()["inserted"], response.json()["updated"]) == (2, 1)
+
+    assert client.get(f"/items/{drill_id}", headers=HEADERS).json()["item"]["low_stock_threshold"] == 2
+    low_stock = client.get("/items/low_stock", headers=HEADERS).json()["items"]
+    assert {item["item_name"]: item["low_stock_threshold"] for item in low_stock} == {"Saw": 15}
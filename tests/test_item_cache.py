@@ -0,0 +1,71 @@
+import pytest
+from inventoryordersapi.core.cache import Cache, LRUTTLCache, evict_items, item_cache
+from conftest import HEADERS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_ttl_cache_evicts_least_recently_used_and_expired():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_size=2, ttl_seconds=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 2, 1, 1)
+
+
+def test_incomplete_backend_fails_on_creation():
+    class GetOnlyCache(Cache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyCache()
+
+
+def test_item_writes_invalidate_cached_item(client, create_item, place_order):
+    item_id = create_item("Speaker", 6, item_price=40.0)
+
+    assert client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"] == 6
+    assert item_cache.get(item_id) is not None
+
+    place_order([(item_id, 2)])
+    assert client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"] == 4
+
+    item = {"item_name": "Speaker", "item_price": 45.0, "item_quantity": 6, "low_stock": False}
+    update = {"item_id": item_id, "item": item}
+    client.put(f"/items/{item_id}", json=update, headers=HEADERS)
+    assert client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_price"] == 45.0
+
+    stats = client.get("/internal/cache", headers=HEADERS).json()["item_cache"]
+    assert stats["hits"] >= 1
+
+
+def test_savepoint_rollback_keeps_pending_evictions(db_session):
+    item_cache.set("kept", object())
+    evict_items(db_session, ["kept"])
+    item_cache.set("kept", object())  # re-cached by a reader before the commit
+
+    with pytest.raises(RuntimeError):
+        with db_session.begin_nested():
+            evict_items(db_session, ["other"])
+            raise RuntimeError("order failed")
+    db_session.commit()
+
+    assert item_cache.get("kept") is None
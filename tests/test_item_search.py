@@ -0,0 +1,89 @@
+import pytest
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.repo.item_search import InvertedIndex, item_search_index
+from conftest import HEADERS
+
+
+def test_search_ranks_name_matches_first(client, create_item):
+    create_item("Notebook", item_description="Pen friendly paper")
+    create_item("Blue Pen", item_description="Gel ink")
+    create_item("Penguin Plush", item_description="Soft toy")
+    create_item("Stapler", item_description="Metal")
+
+    data = client.get("/items/?search=pen", headers=HEADERS).json()
+    assert [item["item_name"] for item in data["items"]] == ["Penguin Plush", "Blue Pen", "Notebook"]
+
+    names = []
+    url = "/items/?search=pen&page_size=1"
+    while url:
+        page = client.get(url, headers=HEADERS).json()
+        names.extend(item["item_name"] for item in page["items"])
+        cursor = page["pagination"]["next_cursor"]
+        url = f"/items/?search=pen&page_size=1&cursor={cursor}" if cursor else None
+    assert names == ["Penguin Plush", "Blue Pen", "Notebook"]
+
+
+def test_search_sees_item_writes(client, create_item):
+    item_id = create_item("Lamp", item_description="Desk light")
+    assert client.get("/items/?search=lamp", headers=HEADERS).json()["items"][0]["item_id"] == item_id
+
+    update = {
+        "item_id": item_id,
+        "item": {"item_name": "Torch", "item_price": 2.0, "item_quantity": 20, "low_stock": False}
+    }
+    client.put(f"/items/{item_id}", json=update, headers=HEADERS)
+
+    assert client.get("/items/?search=lamp", headers=HEADERS).json()["items"] == []
+    assert client.get("/items/?search=orc", headers=HEADERS).json()["items"][0]["item_id"] == item_id
+
+
+def test_search_past_the_candidate_cap_keeps_every_match(client, monkeypatch, create_item):
+    monkeypatch.setattr(settings, "ITEM_SEARCH_MAX_CANDIDATES", 2)
+    for n, price in enumerate((5.0, 15.0, 25.0, 35.0, 45.0)):
+        create_item(f"Cable {n}", item_price=price)
+    create_item("Hub", item_description="USB cable included", item_price=55.0)
+
+    names = []
+    url = "/items/?search=cable&page_size=2&include_total=true"
+    while url:
+        page = client.get(url, headers=HEADERS).json()
+        assert page["pagination"]["total"] in (6, None)
+        names.extend(item["item_name"] for item in page["items"])
+        cursor = page["pagination"]["next_cursor"]
+        url = f"/items/?search=cable&page_size=2&cursor={cursor}" if cursor else None
+    assert names == ["Cable 4", "Cable 3", "Cable 2", "Cable 1", "Cable 0", "Hub"]
+
+    pricey = client.get("/items/?search=cable&min_price=30&include_total=true", headers=HEADERS).json()
+    assert [item["item_name"] for item in pricey["items"]] == ["Cable 4", "Cable 3", "Hub"]
+    assert pricey["pagination"]["total"] == 3
+    within_cap = client.get("/items/?search=cable&min_price=40&max_price=50", headers=HEADERS).json()
+    assert [item["item_name"] for item in within_cap["items"]] == ["Cable 4"]
+
+    short = client.get("/items/?search=b", headers=HEADERS).json()
+    assert {item["item_name"] for item in short["items"]} == {"Cable 0", "Cable 1", "Cable 2", "Cable 3", "Cable 4", "Hub"}
+
+
+def test_search_reads_rows_outside_the_index_lock(client, monkeypatch, create_item):
+    documents_query = InvertedIndex._documents_query
+
+    def unlocked_documents_query(db):
+        assert not item_search_index._lock.locked()
+        return documents_query(db)
+
+    monkeypatch.setattr(InvertedIndex, "_documents_query", staticmethod(unlocked_documents_query))
+    item_id = create_item("Kettle")
+    assert client.get("/items/?search=kett", headers=HEADERS).json()["items"][0]["item_id"] == item_id
+    create_item("Kettle Lid")
+    assert len(client.get("/items/?search=kett", headers=HEADERS).json()["items"]) == 2
+
+
+def test_import_marks_items_dirty_instead_of_rebuilding(client, monkeypatch, create_item):
+    create_item("Anvil")
+    assert client.get("/items/?search=anvil", headers=HEADERS).json()["items"]
+    monkeypatch.setattr(InvertedIndex, "reset", lambda self: pytest.fail("import reset the search index"))
+
+    body = "item_name,item_price,item_quantity\nAnvil Stand,9,4\n"
+    response = client.post("/items/import", content=body, headers={**HEADERS, "Content-Type": "text/csv"})
+    assert response.json()["inserted"] == 1
+    assert len(client.get("/items/?search=anvil", headers=HEADERS).json()["items"]) == 2
@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import event
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.core.stock_alerts import add_stock_alert_listener, remove_stock_alert_listener
+from conftest import HEADERS
+
+
+@pytest.fixture(params=["lock", "atomic"], autouse=True)
+def reservation_mode(request, monkeypatch):
+    monkeypatch.setattr(settings, "STOCK_RESERVATION_MODE", request.param)
+    return request.param
+
+
+@pytest.fixture
+def stock_alerts():
+    alerts = []
+    listener = alerts.extend
+    add_stock_alert_listener(listener)
+    yield alerts
+    remove_stock_alert_listener(listener)
+
+
+def _low_stock_names(client, **params):
+    response = client.get("/items/low_stock", params=params, headers=HEADERS)
+    assert response.status_code == 200
+    return [item["item_name"] for item in response.json()["items"]]
+
+
+def test_low_stock_uses_per_item_thresholds(client, create_item):
+    create_item("Bolts", 8, low_stock_threshold=10)
+    create_item("Nuts", 4)  # settings.LOW_STOCK_THRESHOLD
+    create_item("Washers", 20)
+    screws_id = create_item("Screws", 1)
+    client.delete(f"/items/{screws_id}", headers=HEADERS)
+
+    assert _low_stock_names(client) == ["Bolts", "Nuts"]
+    item = client.get("/items/low_stock", headers=HEADERS).json()["items"][0]
+    assert item["low_stock_threshold"] == 10 and item["low_stock"] is True
+
+    washers = client.get("/items/", params={"search": "Washers"}, headers=HEADERS).json()["items"][0]
+    assert washers["low_stock_threshold"] == settings.LOW_STOCK_THRESHOLD and washers["low_stock"] is False
+
+
+def test_low_stock_pages_and_counts_shards(client, create_item, create_order):
+    for name in ("Alpha", "Bravo", "Charlie"):
+        create_item(name, 1)
+    hot_id = create_item("Delta", 6)
+    client.post(f"/items/{hot_id}/shards", json={"shard_count": 3}, headers=HEADERS)
+    assert "Delta" not in _low_stock_names(client)
+
+    create_order([(hot_id, 2)])
+
+    names = []
+    cursor = None
+    while True:
+        params = {"page_size": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/items/low_stock", params=params, headers=HEADERS).json()
+        names += [item["item_name"] for item in page["items"]]
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert names == ["Alpha", "Bravo", "Charlie", "Delta"]
+
+
+def test_low_stock_reads_only_the_partial_indexes(client, db_session, create_item):
+    create_item("Gasket", 2)
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "low_stock_item" in statement:
+            captured.append((statement, parameters))
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert _low_stock_names(client) == ["Gasket"]
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    if db_session.get_bind().dialect.name != "sqlite":
+        pytest.skip("plan shape checked on SQLite")
+    statement, parameters = captured[0]
+    cursor = db_session.connection().connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        plan = [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    assert "SCAN item" not in plan
+    assert any("idx_item_low_stock" in step for step in plan)
+    assert any("idx_item_sharded" in step for step in plan)
+
+
+def test_orders_and_cancels_fire_threshold_alerts(client, stock_alerts, create_item, create_order):
+    item_id = create_item("Fuses", 12, low_stock_threshold=10)
+
+    create_order([(item_id, 1)])
+    assert stock_alerts == []
+
+    order_id = create_order([(item_id, 3)])
+    assert [(alert.item_name, alert.item_quantity, alert.low_stock) for alert in stock_alerts] == [("Fuses", 8, True)]
+
+    assert client.post(f"/orders/{order_id}/cancel", headers=HEADERS).status_code == 200
+    assert [(alert.item_quantity, alert.low_stock) for alert in stock_alerts[1:]] == [(11, False)]
+
+
+def test_rejected_orders_fire_no_alerts(client, stock_alerts, create_item):
+    item_id = create_item("Relays", 6)
+    payload = {
+        "order": {
+            "customer_name": "Restock Watcher",
+            "customer_email": "watcher@example.com",
+            "order_items": [{"item_id": item_id, "quantity": 2}, {"item_id": item_id, "quantity": 9}]
+        }
+    }
+    assert client.post("/orders/", json=payload, headers=HEADERS).status_code != 200
+    assert stock_alerts == []
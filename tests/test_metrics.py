@@ -0,0 +1,67 @@
+from inventoryordersapi.core.metrics import Counter, Histogram, Registry
+from conftest import HEADERS
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = registry.register(Counter("demo_total", "Demo counter", ("route",)))
+    latency = registry.register(Histogram("demo_seconds", "Demo latency", buckets=(0.1, 1.0)))
+    requests.labels('/a"b').inc(2)
+    latency.observe(0.05)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{route="/a\\"b"} 2' in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1"} 1' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 2' in text
+    assert "demo_seconds_count 2" in text
+
+
+def test_metrics_label_requests_by_route_template(client, create_item):
+    item_id = create_item("Keyboard", 5)
+    before = client.get("/metrics", headers=HEADERS).text
+    route = 'http_requests_total{method="GET",route="/items/{item_id}",status="2xx"}'
+    missing = 'http_errors_total{route="/items/{item_id}",code="NOT_FOUND"}'
+
+    assert client.get(f"/items/{item_id}", headers=HEADERS).status_code == 200
+    assert client.get("/items/does-not-exist", headers=HEADERS).status_code == 404
+
+    assert client.get("/metrics").status_code != 200
+    response = client.get("/metrics", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert _sample(text, route) == _sample(before, route) + 1
+    assert _sample(text, missing) == _sample(before, missing) + 1
+    assert f"/items/{item_id}" not in text
+
+
+def test_metrics_count_order_outcomes(client, create_item, place_order):
+    item_id = create_item("Mouse", 3)
+    before = client.get("/metrics", headers=HEADERS).text
+
+    assert place_order([(item_id, 2)]).status_code == 200
+    assert place_order([(item_id, 5)]).status_code != 200
+    order_id = client.get("/orders/", headers=HEADERS).json()["orders"][0]["id"]
+    assert client.post(f"/orders/{order_id}/cancel", headers=HEADERS).status_code == 200
+
+    text = client.get("/metrics", headers=HEADERS).text
+    for name, delta in (
+        ("orders_created_total", 1),
+        ("stock_units_reserved_total", 2),
+        ('order_rejections_total{code="INSUFFICIENT_STOCK"}', 1),
+        ("orders_canceled_total", 1),
+        ("stock_units_released_total", 2),
+        ('http_errors_total{route="/orders/",code="INSUFFICIENT_STOCK"}', 1),
+        ('http_errors_total{route="/orders/",code="INTERNAL_ERROR"}', 0),
+    ):
+        assert _sample(text, name) == _sample(before, name) + delta, name
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.domain.common import ErrorCode
+from inventoryordersapi.domain.order_req_res import CreateOrderRequest
+from inventoryordersapi.api.routes import order_routes
+from inventoryordersapi.repo.idempotency_repo import IdempotencyRepo
+from inventoryordersapi.services.order_batcher import OrderBatcher
+from conftest import HEADERS
+
+
+@pytest.fixture
+def batcher(db_session):
+    connection = db_session.connection()
+    return OrderBatcher(
+        session_factory=lambda: Session(bind=connection, join_transaction_mode="create_savepoint"),
+        window_ms=200,
+        max_size=3
+    )
+
+
+def test_batch_commits_together_and_isolates_failures(client, batcher, create_item, order_payload):
+    item_id = create_item("Lamp", 5)
+
+    requests = [CreateOrderRequest.model_validate({"order": order_payload([(item_id, quantity)])}) for quantity in (3, 3, 1)]
+    futures = [batcher.submit(request) for request in requests]
+    responses = [future.result(timeout=5) for future in futures]
+
+    assert [response.error for response in responses] == [False, True, False]
+    assert responses[1].code == ErrorCode.INSUFFICIENT_STOCK
+    assert client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"] == 1
+
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["orders"] == 3
+    assert stats["max_batch_size"] == 3
+
+
+def test_create_order_route_uses_batcher_when_enabled(client, batcher, monkeypatch, create_item, order_payload):
+    monkeypatch.setattr(settings, "ORDER_BATCH_ENABLED", True)
+    monkeypatch.setattr(order_routes, "order_batcher", batcher)
+    item_id = create_item("Desk", 2)
+
+    payload = {"order": order_payload([(item_id, 2)])}
+    assert client.post("/orders/", json=payload, headers=HEADERS).status_code == 200
+    assert client.post("/orders/", json=payload, headers=HEADERS).status_code != 200
+    assert batcher.stats()["orders"] == 2
+
+
+def test_batch_marks_idempotency_keys_committed_with_its_orders(db_session, batcher, create_item, order_payload):
+    item_id = create_item("Shelf", 2)
+    repo = IdempotencyRepo(db_session)
+    for key in ("batched-ok", "batched-short"):
+        repo.claim("orders.create", key, None, lease_seconds=60)
+
+    ok, short = (CreateOrderRequest.model_validate({"order": order_payload([(item_id, quantity)])}) for quantity in (2, 1))
+    futures = [
+        batcher.submit(ok, ("orders.create", "batched-ok")),
+        batcher.submit(short, ("orders.create", "batched-short"))
+    ]
+    assert [future.result(timeout=5).error for future in futures] == [False, True]
+
+    assert repo.get("orders.create", "batched-ok").status == "committed"
+    assert repo.get("orders.create", "batched-short").status == "in_progress"
@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+
+from inventoryordersapi.core.settings import settings
+from conftest import HEADERS
+
+
+def test_export_orders_streams_ndjson_in_batches(client, monkeypatch, create_item, create_order):
+    monkeypatch.setattr(settings, "ORDER_EXPORT_BATCH_SIZE", 2)
+    pen = create_item("Pen")
+    pad = create_item("Pad")
+    create_order([(pen, 1), (pad, 2)], "Alice")
+    create_order([(pen, 3)], "Bob")
+    create_order([(pad, 1)], "Alina")
+
+    response = client.get("/orders/export", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    orders = [json.loads(line) for line in response.text.splitlines()]
+
+    listed = client.get("/orders/", headers=HEADERS).json()["orders"]
+    assert sorted(order["order_id"] for order in orders) == sorted(order["id"] for order in listed)
+    assert len(orders) == 3
+    alice = next(order for order in orders if order["customer_name"] == "Alice")
+    assert {(line["item_name"], line["quantity"]) for line in alice["items"]} == {("Pen", 1), ("Pad", 2)}
+
+    filtered = client.get("/orders/export?customer_name=ali", headers=HEADERS)
+    assert sorted(json.loads(line)["customer_name"] for line in filtered.text.splitlines()) == ["Alice", "Alina"]
+
+
+def test_export_orders_csv_has_one_row_per_line(client, create_item, create_order):
+    pen = create_item("Pen")
+    pad = create_item("Pad")
+    create_order([(pen, 1), (pad, 2)], "Carol")
+
+    response = client.get("/orders/export?format=csv", headers=HEADERS)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted((row["customer_name"], row["item_name"], row["quantity"]) for row in rows) == [
+        ("Carol", "Pad", "2"), ("Carol", "Pen", "1")
+    ]
+
+
+def test_export_orders_rejects_bad_input(client):
+    assert client.get("/orders/export?format=xml", headers=HEADERS).status_code == 400
+    assert client.get("/orders/export?from_date=yesterday", headers=HEADERS).status_code == 400
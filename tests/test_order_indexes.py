@@ -0,0 +1,167 @@
+import json
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from inventoryordersapi.model.order_record import OrderRecord
+from inventoryordersapi.utils.ids import new_id
+from conftest import HEADERS
+
+
+CREATED_AT = "idx_order_created_at"
+STATUS = "idx_order_status_created_at"
+CUSTOMER_NAME = "idx_order_customer_name_trgm"
+
+# filter -> (indexes SQLite may use, indexes PostgreSQL may use); an empty tuple skips that database.
+# Every filtered listing must look its rows up through the index, not walk it and filter.
+FILTERS = {
+    "status=confirmed": ((STATUS,), (STATUS,)),
+    "status=unpaid": ((STATUS,), (STATUS,)),
+    "status=canceled": ((STATUS,), (STATUS,)),
+    "from_date=2025-03-01&to_date=2025-04-01": ((CREATED_AT,), (CREATED_AT,)),
+    "status=unpaid&from_date=2025-03-01&to_date=2025-04-01": ((STATUS,), (STATUS,)),
+    # SQLite has no trigram index to serve ILIKE '%term%'
+    "customer_name=Customer%2007": ((), (CUSTOMER_NAME,)),
+    "customer_name=Customer%2007&status=confirmed": ((STATUS,), (CUSTOMER_NAME, STATUS)),
+}
+
+
+@pytest.fixture
+def seeded_orders(db_session):
+    start = datetime(2025, 1, 1)
+    statuses = ("pending", "confirmed", "canceled")
+    rows = [
+        {
+            "order_id": new_id(),
+            "customer_name": f"Customer {n % 50:02d}",
+            "customer_email": f"c{n % 50}@example.com",
+            "total_amount": 10.0,
+            "status": statuses[n % 3],
+            "created_at": start + timedelta(hours=n * 3),
+            "updated_at": start + timedelta(hours=n * 3)
+        }
+        for n in range(2000)
+    ]
+    db_session.execute(insert(OrderRecord.__table__), rows)
+    if db_session.get_bind().dialect.name == "postgresql":
+        # Only built by the db.order-list-indexes-02 changeset, not by metadata.create_all
+        db_session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db_session.execute(text(
+            f'CREATE INDEX IF NOT EXISTS {CUSTOMER_NAME} ON "order" USING GIN (customer_name gin_trgm_ops)'
+        ))
+    db_session.flush()
+    return rows
+
+
+def _page_statement(client, db_session, query):
+    """Run the listing and return the SQL + parameters of its page query."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM "order"' in statement and "LIMIT" in statement:
+            captured.append((statement, parameters))
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(f"/orders/?page_size=20&{query}", headers=HEADERS)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == 200
+    assert captured, query
+    return captured[0], response.json()
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def _explain(db_session, statement, parameters):
+    """PostgreSQL plan nodes (dicts) or SQLite EXPLAIN QUERY PLAN details (strings) of a statement."""
+    cursor = db_session.connection().connection.cursor()
+    try:
+        if db_session.get_bind().dialect.name == "postgresql":
+            # Tiny tables are seq-scanned anyway; make the planner show whether an index can serve the query
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return list(_plan_nodes(plan[0]["Plan"]))
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _index_lookups(db_session, statement, parameters):
+    """
+    The indexes the statement looks order rows up through (with an Index Cond
+    / SEARCH bound), and whether it reads the table unbounded: a sequential
+    scan or a full index walk that filters in memory.
+    """
+    plan = _explain(db_session, statement, parameters)
+    if db_session.get_bind().dialect.name == "postgresql":
+        lookups = {node["Index Name"] for node in plan if "Index Name" in node and "Index Cond" in node}
+        walks = any(
+            node.get("Relation Name") == "order" and "Index Cond" not in node
+            for node in plan if node["Node Type"] in ("Seq Scan", "Index Scan", "Index Only Scan")
+        )
+        return lookups, walks
+    searches = [re.match(r"SEARCH order USING (?:COVERING )?INDEX (\w+) \(", detail) for detail in plan]
+    lookups = {search.group(1) for search in searches if search}
+    return lookups, any(detail.startswith("SCAN order") for detail in plan)
+
+
+def _expected(db_session, query):
+    sqlite_indexes, postgresql_indexes = FILTERS[query]
+    if db_session.get_bind().dialect.name == "postgresql":
+        return postgresql_indexes
+    return sqlite_indexes
+
+
+@pytest.mark.parametrize("query", FILTERS)
+def test_order_listing_filters_use_their_index(client, db_session, seeded_orders, query):
+    expected = _expected(db_session, query)
+    if not expected:
+        pytest.skip("no index for this filter on " + db_session.get_bind().dialect.name)
+    (statement, parameters), _ = _page_statement(client, db_session, query)
+    assert "!=" not in statement
+    lookups, walks = _index_lookups(db_session, statement, parameters)
+    assert lookups & set(expected), statement
+    assert not walks, statement
+
+
+def test_unfiltered_listing_walks_only_the_sort_index(client, db_session, seeded_orders):
+    (statement, parameters), _ = _page_statement(client, db_session, "")
+    plan = _explain(db_session, statement, parameters)
+    if db_session.get_bind().dialect.name == "postgresql":
+        scans = [node.get("Index Name") for node in plan if node.get("Relation Name") == "order"]
+    else:
+        scans = [detail.split(" USING INDEX ")[-1] for detail in plan if detail.startswith(("SCAN order", "SEARCH order"))]
+    # An ordered walk is fine here: the LIMIT stops it after one page
+    assert scans == [CREATED_AT], statement
+
+
+def test_status_filters_match_stored_statuses(client, seeded_orders):
+    def statuses(query):
+        orders = client.get(f"/orders/?page_size=100&{query}", headers=HEADERS).json()["orders"]
+        return {order["status"] for order in orders}
+
+    assert statuses("status=confirmed") == {"confirmed"}
+    assert statuses("status=unpaid") == {"pending", "canceled"}
+    assert statuses("status=canceled") == {"canceled"}
+
+
+def test_keyset_next_page_uses_an_index(client, db_session, seeded_orders):
+    _, page = _page_statement(client, db_session, "status=unpaid")
+    cursor = page["pagination"]["next_cursor"]
+
+    (statement, parameters), _ = _page_statement(client, db_session, f"status=unpaid&cursor={cursor}")
+    lookups, walks = _index_lookups(db_session, statement, parameters)
+    assert STATUS in lookups, statement
+    assert not walks, statement
@@ -0,0 +1,67 @@
+import json
+import logging
+import pytest
+
+from inventoryordersapi.core.settings import settings
+from conftest import HEADERS
+
+
+@pytest.fixture
+def seed_orders(create_item, place_order):
+    def seed(order_count):
+        item_ids = [create_item(name, 500) for name in ("Widget", "Gadget")]
+        for n in range(order_count):
+            assert place_order([(item_id, 1) for item_id in item_ids], f"Customer {n}").status_code == 200
+
+    return seed
+
+
+@pytest.mark.parametrize("order_count", [2, 12])
+def test_list_orders_query_count_is_constant(client, query_budget, order_count, seed_orders):
+    seed_orders(order_count)
+
+    with query_budget(3) as statements:
+        data = client.get("/orders/?page_size=20", headers=HEADERS).json()
+
+    assert len(data["orders"]) == order_count
+    # page query + one batched load of lines + one load of uncached items
+    assert len(statements) == 3
+    names = {line["name"] for order in data["orders"] for line in order["items"]}
+    assert names == {"Widget", "Gadget"}
+
+    with query_budget(2) as statements:
+        client.get("/orders/?page_size=20", headers=HEADERS)
+    # item names now come from the item cache
+    assert len(statements) == 2
+
+
+def test_get_order_loads_lines_with_item_names(client, query_budget, seed_orders):
+    seed_orders(1)
+    order_id = client.get("/orders/", headers=HEADERS).json()["orders"][0]["id"]
+
+    with query_budget(3):
+        data = client.get(f"/orders/{order_id}", headers=HEADERS).json()
+
+    assert sorted(line["name"] for line in data["items"]) == ["Gadget", "Widget"]
+
+
+def test_debug_headers_report_request_queries(client, query_budget, monkeypatch, seed_orders):
+    seed_orders(2)
+    monkeypatch.setattr(settings, "QUERY_STATS_HEADERS", True)
+
+    with query_budget(3) as statements:
+        response = client.get("/orders/?page_size=20", headers=HEADERS)
+
+    assert int(response.headers["x-db-query-count"]) >= len(statements)
+    assert float(response.headers["x-db-time-ms"]) >= float(response.headers["x-db-slowest-ms"]) >= 0
+
+
+def test_slow_queries_are_logged_as_json(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.000001)
+
+    with caplog.at_level(logging.WARNING, logger="inventoryordersapi.slow_query"):
+        client.get("/orders/", headers=HEADERS)
+
+    records = [json.loads(record.getMessage()) for record in caplog.records]
+    assert records and all(record["event"] == "slow_query" for record in records)
+    assert {record["request"] for record in records} == {"GET /orders/"}
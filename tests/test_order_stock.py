@@ -0,0 +1,42 @@
+import pytest
+
+from inventoryordersapi.core.settings import settings
+from conftest import HEADERS
+
+
+@pytest.fixture(params=["lock", "atomic"], autouse=True)
+def reservation_mode(request, monkeypatch):
+    monkeypatch.setattr(settings, "STOCK_RESERVATION_MODE", request.param)
+    return request.param
+
+
+def test_create_order_reserves_all_lines(client, create_item, place_order):
+    mouse_id = create_item("Mouse", 10)
+    monitor_id = create_item("Monitor", 3)
+
+    response = place_order([(mouse_id, 4), (monitor_id, 1), (mouse_id, 3)])
+    assert response.status_code == 200
+
+    assert client.get(f"/items/{mouse_id}", headers=HEADERS).json()["item"]["item_quantity"] == 3
+    assert client.get(f"/items/{monitor_id}", headers=HEADERS).json()["item"]["item_quantity"] == 2
+
+
+def test_create_order_rejects_basket_exceeding_stock(client, create_item, place_order):
+    mouse_id = create_item("Trackball", 5)
+
+    response = place_order([(mouse_id, 3), (mouse_id, 3)])
+    assert response.status_code != 200
+    assert "Insufficient stock" in response.json()["detail"]
+
+    assert client.get(f"/items/{mouse_id}", headers=HEADERS).json()["item"]["item_quantity"] == 5
+
+
+def test_create_order_failed_line_releases_earlier_lines(client, create_item, place_order):
+    cable_id = create_item("Cable", 5)
+    hub_id = create_item("Hub", 1)
+
+    response = place_order([(cable_id, 2), (hub_id, 2)])
+    assert response.status_code != 200
+
+    assert client.get(f"/items/{cable_id}", headers=HEADERS).json()["item"]["item_quantity"] == 5
+    assert client.get(f"/items/{hub_id}", headers=HEADERS).json()["item"]["item_quantity"] == 1
@@ -0,0 +1,122 @@
+from conftest import HEADERS
+
+
+def test_list_items_keyset_cursors_walk_forward_and_back(client, create_item):
+    for name in ["Eraser", "Binder", "Stapler", "Folder", "Clip"]:
+        create_item(name, 50)
+
+    pages = []
+    url = "/items/?page_size=2"
+    while url:
+        data = client.get(url, headers=HEADERS).json()
+        pages.append(data)
+        next_cursor = data["pagination"]["next_cursor"]
+        url = f"/items/?page_size=2&cursor={next_cursor}" if next_cursor else None
+
+    names = [item["item_name"] for page in pages for item in page["items"]]
+    assert names == ["Binder", "Clip", "Eraser", "Folder", "Stapler"]
+    assert pages[0]["pagination"]["total"] is None
+
+    prev_cursor = pages[-1]["pagination"]["prev_cursor"]
+    back = client.get(f"/items/?page_size=2&cursor={prev_cursor}", headers=HEADERS).json()
+    assert [item["item_name"] for item in back["items"]] == ["Eraser", "Folder"]
+
+
+def test_list_items_rejects_tampered_cursor(client, create_item):
+    for name in ["Ruler", "Tape", "Glue"]:
+        create_item(name, 50)
+    cursor = client.get("/items/?page_size=1", headers=HEADERS).json()["pagination"]["next_cursor"]
+
+    response = client.get(f"/items/?page_size=1&cursor=x{cursor}", headers=HEADERS)
+    assert response.status_code == 400
+
+
+def test_list_items_legacy_page_still_counts(client, create_item):
+    for name in ["Notebook", "Marker", "Highlighter"]:
+        create_item(name, 50)
+
+    data = client.get("/items/?page=2&page_size=2", headers=HEADERS).json()
+    assert data["pagination"]["total"] == 3
+    assert [item["item_name"] for item in data["items"]] == ["Notebook"]
+
+
+def test_legacy_page_cursors_continue_as_keyset(client, create_item, create_order):
+    for name in ["Apron", "Bucket", "Candle", "Doormat", "Easel"]:
+        create_item(name, 50)
+
+    page = client.get("/items/?page=2&page_size=2", headers=HEADERS).json()
+    assert [item["item_name"] for item in page["items"]] == ["Candle", "Doormat"]
+
+    following = client.get(f"/items/?page_size=2&cursor={page['pagination']['next_cursor']}", headers=HEADERS)
+    assert following.status_code == 200
+    assert [item["item_name"] for item in following.json()["items"]] == ["Easel"]
+    preceding = client.get(f"/items/?page_size=2&cursor={page['pagination']['prev_cursor']}", headers=HEADERS)
+    assert [item["item_name"] for item in preceding.json()["items"]] == ["Apron", "Bucket"]
+
+    searched = client.get("/items/?search=a&page=1&page_size=2", headers=HEADERS).json()
+    cursor = searched["pagination"]["next_cursor"]
+    assert client.get(f"/items/?search=a&page_size=2&cursor={cursor}", headers=HEADERS).status_code == 200
+
+    item_id = page["items"][0]["item_id"]
+    order_ids = [create_order([(item_id, 1)]) for _ in range(3)]
+    orders = client.get("/orders/?page=1&page_size=2", headers=HEADERS).json()
+    cursor = orders["pagination"]["next_cursor"]
+    rest = client.get(f"/orders/?page_size=2&cursor={cursor}", headers=HEADERS)
+    assert rest.status_code == 200
+    assert [order["id"] for order in rest.json()["orders"]] == [order_ids[0]]
+
+
+def test_list_orders_keyset_pages_are_disjoint(client, create_item):
+    item_id = create_item("Envelope", 50)
+    for n in range(5):
+        order = {
+            "order": {
+                "customer_name": f"Customer {n}",
+                "customer_email": f"c{n}@example.com",
+                "order_items": [{"item_id": item_id, "quantity": 1}]
+            }
+        }
+        assert client.post("/orders/", json=order, headers=HEADERS).status_code == 200
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/orders/?page_size=2&include_total=true" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url, headers=HEADERS).json()
+        assert data["pagination"]["total"] == 5
+        seen.extend(order["id"] for order in data["orders"])
+        cursor = data["pagination"]["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_list_items_cached_count_refreshes_after_write(client, create_item):
+    for name in ["Pen", "Pencil"]:
+        create_item(name, 50)
+
+    first = client.get("/items/?count=cached", headers=HEADERS).json()["pagination"]
+    assert first["total"] == 2
+    assert first["total_is_exact"] is True
+
+    create_item("Marker", 50)
+    second = client.get("/items/?count=cached", headers=HEADERS).json()["pagination"]
+    assert second["total"] == 3
+
+
+def test_list_items_count_strategies(client, create_item):
+    for name in ["Cup", "Plate", "Bowl"]:
+        create_item(name, 50)
+
+    estimated = client.get("/items/?page_size=2&count=estimated", headers=HEADERS).json()["pagination"]
+    assert estimated["total"] == 3  # no planner estimate on SQLite, falls back to exact
+
+    legacy = client.get("/items/?page=1&page_size=2&count=none", headers=HEADERS).json()["pagination"]
+    assert legacy["total"] is None
+    assert legacy["total_is_exact"] is False
+    following = client.get(f"/items/?page_size=2&cursor={legacy['next_cursor']}", headers=HEADERS).json()
+    assert [item["item_name"] for item in following["items"]] == ["Plate"]
+
+    response = client.get("/items/?count=bogus", headers=HEADERS)
+    assert response.status_code == 422
@@ -0,0 +1,56 @@
+import datetime
+
+from inventoryordersapi.services.report_service import ReportService
+from conftest import HEADERS
+
+
+# Rollup days come from the database clock; a wide window keeps the tests timezone-proof
+TODAY = datetime.date.today()
+RANGE = {"from_date": str(TODAY - datetime.timedelta(days=1)), "to_date": str(TODAY + datetime.timedelta(days=1))}
+
+
+def _reports(client):
+    daily = client.get("/reports/sales/daily", params=RANGE, headers=HEADERS).json()["days"]
+    items = client.get("/reports/sales/items", params=RANGE, headers=HEADERS).json()["items"]
+    statuses = client.get("/reports/orders/status", params=RANGE, headers=HEADERS).json()["statuses"]
+    return daily, items, statuses
+
+
+def test_orders_and_cancellations_update_rollups(client, create_item, create_order):
+    pen_id = create_item("Report Pen", 50, item_price=2.0)
+    lamp_id = create_item("Report Lamp", 50, item_price=30.0)
+    create_order([(pen_id, 5), (lamp_id, 1)])
+    canceled_id = create_order([(lamp_id, 2)])
+
+    assert client.post(f"/orders/{canceled_id}/cancel", headers=HEADERS).status_code == 200
+
+    daily, items, statuses = _reports(client)
+    assert [(day["orders"], day["units"], day["revenue"]) for day in daily] == [(1, 6, 40.0)]
+    assert [(item["item_name"], item["units"], item["revenue"]) for item in items] == [
+        ("Report Lamp", 1, 30.0),
+        ("Report Pen", 5, 10.0),
+    ]
+    totals = {status["status"]: (status["orders"], status["amount"]) for status in statuses}
+    assert totals == {"pending": (1, 40.0), "canceled": (1, 60.0)}
+
+
+def test_rebuild_matches_incremental_rollups(client, db_session, create_item, create_order):
+    cup_id = create_item("Report Cup", 50, item_price=4.0)
+    create_order([(cup_id, 3)])
+    canceled_id = create_order([(cup_id, 1)])
+    client.post(f"/orders/{canceled_id}/cancel", headers=HEADERS)
+    incremental = _reports(client)
+
+    summary = ReportService(db_session).rebuild_rollups()
+
+    assert summary.item_rows == 1
+    assert summary.status_rows == 2
+    assert _reports(client) == incremental
+
+
+def test_report_range_is_validated(client):
+    response = client.get(
+        "/reports/sales/daily", params={"from_date": "2025-02-01", "to_date": "2025-01-01"}, headers=HEADERS
+    )
+    assert response.status_code == 400
+    assert client.get("/reports/sales/daily", headers=HEADERS).status_code == 422
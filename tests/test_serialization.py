@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from inventoryordersapi.domain.common import Pagination
+from inventoryordersapi.utils import json_response
+from conftest import HEADERS
+
+
+def test_list_items_returns_only_item_fields(client, create_item):
+    create_item("Pencil", 3, item_price=2.5)
+
+    response = client.get("/items/", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    item = response.json()["items"][0]
+    assert set(item) == {
+        "item_id", "item_name", "item_description", "item_price", "item_quantity", "is_active",
+        "low_stock_threshold", "low_stock"
+    }
+    assert item["item_quantity"] == 3 and item["low_stock"] is True
+
+
+def test_order_list_and_detail_share_one_shape(client, create_item):
+    item_id = create_item("Eraser", 10, item_price=2.5)
+    order = {
+        "order": {
+            "customer_name": "Jane Doe",
+            "customer_email": "jane@example.com",
+            "order_items": [{"item_id": item_id, "quantity": 2}]
+        }
+    }
+    assert client.post("/orders/", json=order, headers=HEADERS).status_code == 200
+
+    listing = client.get("/orders/", headers=HEADERS).json()
+    listed = listing["orders"][0]
+    assert listing["pagination"]["page_size"] == 10
+    assert client.get(f"/orders/{listed['id']}", headers=HEADERS).json() == listed
+    assert listed["items"] == [
+        {"item_id": item_id, "name": "Eraser", "unit_price": 2.5, "quantity": 2, "line_total": 5.0}
+    ]
+
+
+def test_dumps_falls_back_to_stdlib_json(monkeypatch):
+    content = {"at": datetime(2025, 1, 2, 3, 4, 5), "pagination": Pagination(page_size=5)}
+    fast = json_response.dumps(content)
+    monkeypatch.setattr(json_response, "orjson", None)
+    assert json_response.dumps(content) == fast
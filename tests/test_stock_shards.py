@@ -0,0 +1,92 @@
+import pytest
+
+from inventoryordersapi.core.settings import settings
+from inventoryordersapi.repo.item_repo import ItemRepo
+from conftest import HEADERS
+
+
+@pytest.fixture(params=["lock", "atomic"], autouse=True)
+def reservation_mode(request, monkeypatch):
+    monkeypatch.setattr(settings, "STOCK_RESERVATION_MODE", request.param)
+    return request.param
+
+
+def _quantity(client, item_id):
+    return client.get(f"/items/{item_id}", headers=HEADERS).json()["item"]["item_quantity"]
+
+
+def test_sharded_item_reserves_across_shards(client, create_item, place_order):
+    item_id = create_item("Console", 10)
+    response = client.post(f"/items/{item_id}/shards", json={"shard_count": 3}, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["item"]["item_quantity"] == 10
+
+    assert place_order([(item_id, 3)]).status_code == 200
+    assert _quantity(client, item_id) == 7
+
+    # Larger than any single shard, but covered by the shards together
+    assert place_order([(item_id, 6)]).status_code == 200
+    assert _quantity(client, item_id) == 1
+
+    response = place_order([(item_id, 2)])
+    assert response.status_code != 200
+    assert "Insufficient stock" in response.json()["detail"]
+    assert _quantity(client, item_id) == 1
+
+
+def test_sharded_item_update_cancel_and_unshard(client, create_item, place_order):
+    item_id = create_item("Headset", 8)
+    client.post(f"/items/{item_id}/shards", json={"shard_count": 4}, headers=HEADERS)
+
+    payload = {"item_id": item_id, "item": {"item_name": "Headset", "item_price": 20.0, "item_quantity": 20, "low_stock": False}}
+    assert client.put(f"/items/{item_id}", json=payload, headers=HEADERS).json()["item"]["item_quantity"] == 20
+
+    assert place_order([(item_id, 5)]).status_code == 200
+    order_id = client.get("/orders/", headers=HEADERS).json()["orders"][0]["id"]
+    assert client.post(f"/orders/{order_id}/cancel", headers=HEADERS).status_code == 200
+    assert _quantity(client, item_id) == 20
+
+    listed = client.get("/items/?search=Headset", headers=HEADERS).json()["items"]
+    assert listed[0]["item_quantity"] == 20
+
+    response = client.post(f"/items/{item_id}/shards", json={"shard_count": 0}, headers=HEADERS)
+    assert response.json()["item"]["item_quantity"] == 20
+    assert place_order([(item_id, 20)]).status_code == 200
+    assert _quantity(client, item_id) == 0
+
+
+def test_shards_endpoint_validates_input(client, create_item):
+    assert client.post("/items/missing/shards", json={"shard_count": 2}, headers=HEADERS).status_code == 404
+    item_id = create_item("Router", 1)
+    assert client.post(f"/items/{item_id}/shards", json={"shard_count": -1}, headers=HEADERS).status_code == 422
+
+
+def test_bulk_chunk_rejects_only_orders_whose_shards_were_drained(client, monkeypatch, create_item):
+    sharded_id = create_item("Tablet", 4)
+    client.post(f"/items/{sharded_id}/shards", json={"shard_count": 2}, headers=HEADERS)
+    plain_id = create_item("Stylus", 5)
+
+    def order(item_id, quantity):
+        return {
+            "customer_name": "Flash Buyer",
+            "customer_email": "flash@example.com",
+            "order_items": [{"item_id": item_id, "quantity": quantity}]
+        }
+
+    orders = [order(sharded_id, 3), order(sharded_id, 3), order(plain_id, 2)]
+    stock_totals = ItemRepo.stock_totals
+    with monkeypatch.context() as patch:
+        # Concurrent orders drained the shards between the chunk's stock check and its shard updates
+        patch.setattr(
+            ItemRepo, "stock_totals",
+            lambda self, records: {
+                item_id: total + (10 if item_id == sharded_id else 0)
+                for item_id, total in stock_totals(self, records).items()
+            }
+        )
+        results = client.post("/orders/bulk", json=orders, headers=HEADERS).json()["results"]
+
+    assert [result["code"] for result in results] == [200, "INSUFFICIENT_STOCK", 200]
+    assert "Insufficient stock for item Tablet" in results[1]["msg"]
+    assert _quantity(client, sharded_id) == 1
+    assert _quantity(client, plain_id) == 3